@@ -1,26 +1,49 @@
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import requests
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from starlette.routing import Match
 import hashlib
 import os
 import re
+import time
 from html import unescape
 from dotenv import load_dotenv
 from typing import Optional, List
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel
 import json
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Import knowledge graph services
 from services.entity_extractor import EntityExtractor
 from services.rss_fetcher import RSSFetcher
+from services.feed_store import FeedStore
+from services.rate_limiter import HostRateLimiter
 from services.wikipedia_service import WikipediaService
+from services.wikipedia_index import WikipediaIndex
 from services.relevance_filter import RelevanceFilter
+from services.entity_resolver import EntityResolver
+from services.semantic_ranker import ClipTextEncoder, SemanticRanker
+from services.embedding_store import EmbeddingStore
+from services.enrichment_pipeline import EnrichmentPipeline
+from services.cache_store import create_cache
+from services.http_client import get_http_client
+from services.citation_validator import CitationValidator
+from services.article_store import ArticleStore
+from services.ingestion_worker import IngestionWorker
+from services.graph_store import GraphStore, KnowledgeGraphSession
+from services.graph_writer import GraphWriteBehind
+from services.neo4j_service import Neo4jService
+from services.metrics import REGISTRY, REQUEST_SECONDS, REQUESTS_IN_FLIGHT, stage_timer, record_gemini_usage
 from google import genai
 from google.genai import types
 
 # ============ A. ADD MODEL IMPORTS ============
-from model_handler import initialize_model, get_model
+# Lightweight: TensorFlow/torch/CLIP are imported by the background loader thread
+from model_handler import start_model_loading, get_model, get_model_state, shutdown_model, ModelNotReadyError
+from inference_pool import InferenceOverloadedError
 
 # ---------------- ENV ----------------
 
@@ -36,32 +59,283 @@ if not GEMINI_API_KEY:
     raise RuntimeError("GEMINI_API_KEY missing")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
 
+# Knowledge graph enrichment fan-out (per-source concurrency + overall deadline)
+ENRICH_RSS_CONCURRENCY = int(os.getenv("ENRICH_RSS_CONCURRENCY", "3"))
+ENRICH_WIKI_CONCURRENCY = int(os.getenv("ENRICH_WIKI_CONCURRENCY", "3"))
+ENRICH_DEADLINE_SECONDS = float(os.getenv("ENRICH_DEADLINE_SECONDS", "8"))
+
+# Persistent caches (SQLite file shared by all workers, survives restarts)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "./cache/newsapp_cache.sqlite3")
+VERIFICATION_CACHE_TTL = int(os.getenv("VERIFICATION_CACHE_TTL", str(24 * 3600)))
+VERIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("VERIFICATION_CACHE_MAX_ENTRIES", "5000"))
+EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", str(7 * 24 * 3600)))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+EXTRACTION_CACHE_MEMORY_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MEMORY_ENTRIES", "256"))
+WIKIPEDIA_CACHE_TTL = int(os.getenv("WIKIPEDIA_CACHE_TTL", str(7 * 24 * 3600)))
+WIKIPEDIA_CACHE_MAX_ENTRIES = int(os.getenv("WIKIPEDIA_CACHE_MAX_ENTRIES", "20000"))
+# Offline index built by tools/build_wiki_index.py (used when the file exists)
+WIKIPEDIA_INDEX_PATH = os.getenv("WIKIPEDIA_INDEX_PATH", "./cache/wikipedia_index.sqlite3")
+
+# Canonical entity index: "U.S." / "USA" / "United States" become one node, enriched once
+ENTITY_RESOLUTION_ENABLED = os.getenv("ENTITY_RESOLUTION_ENABLED", "true").lower() == "true"
+ENTITY_FUZZY_THRESHOLD = float(os.getenv("ENTITY_FUZZY_THRESHOLD", "0.85"))
+ENTITY_INDEX_MAX_ENTRIES = int(os.getenv("ENTITY_INDEX_MAX_ENTRIES", "50000"))
+
+# Enrichment relevance ranking: keyword (default) or semantic (local CLIP text embeddings)
+RELEVANCE_MODE = os.getenv("RELEVANCE_MODE", "keyword").lower()
+RELEVANCE_MIN_SIMILARITY = float(os.getenv("RELEVANCE_MIN_SIMILARITY", "0.7"))
+TEXT_ENCODER_MODEL = os.getenv("TEXT_ENCODER_MODEL", "openai/clip-vit-base-patch32")
+TEXT_EMBEDDING_STORE_DIR = os.getenv("TEXT_EMBEDDING_STORE_DIR", "./cache/text_embeddings")
+TEXT_EMBEDDING_STORE_MAX_VECTORS = int(os.getenv("TEXT_EMBEDDING_STORE_MAX_VECTORS", "200000"))
+
+# RSS feed store: serve within FEED_CACHE_TTL, then revalidate with conditional GETs
+FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", "900"))
+FEED_STORE_MAX_AGE = int(os.getenv("FEED_STORE_MAX_AGE", str(7 * 24 * 3600)))
+FEED_STORE_MAX_ENTRIES = int(os.getenv("FEED_STORE_MAX_ENTRIES", "5000"))
+RSS_HOST_RATE = float(os.getenv("RSS_HOST_RATE", "5"))
+RSS_HOST_BURST = int(os.getenv("RSS_HOST_BURST", "5"))
+
+# Background ingestion into the local article store (serves the default /news feed)
+ARTICLE_STORE_PATH = os.getenv("ARTICLE_STORE_PATH", "./cache/articles.sqlite3")
+# Opt-in: each run spends INGEST_NEWSAPI_PAGES NewsAPI requests plus Gemini verification calls
+INGEST_ENABLED = os.getenv("INGEST_ENABLED", "false").lower() == "true"
+# NewsAPI free tier allows 100 requests/day: pages x (86400 / interval) must stay under that
+# (default 1 page every 2h = 12/day, leaving the rest for searches and top-ups)
+INGEST_INTERVAL_SECONDS = int(os.getenv("INGEST_INTERVAL_SECONDS", "7200"))
+INGEST_NEWSAPI_PAGES = int(os.getenv("INGEST_NEWSAPI_PAGES", "1"))
+INGEST_RSS_TOPICS = [t.strip() for t in os.getenv(
+    "INGEST_RSS_TOPICS", "science,finance,business,sports,politics,technology,health"
+).split(",") if t.strip()]
+INGEST_VERIFY_LIMIT = int(os.getenv("INGEST_VERIFY_LIMIT", "30"))
+ARTICLE_RETENTION_DAYS = int(os.getenv("ARTICLE_RETENTION_DAYS", "7"))
+
+# /news?q= is answered from the local full-text index; NewsAPI only tops it up
+SEARCH_LOCAL = os.getenv("SEARCH_LOCAL", "true").lower() == "true"
+# Re-query NewsAPI for the same search (and page) at most this often, however few local matches exist
+SEARCH_TOPUP_TTL = int(os.getenv("SEARCH_TOPUP_TTL", "900"))
+
+# Gemini verification is split into chunks that run concurrently
+VERIFY_CHUNK_SIZE = max(1, int(os.getenv("VERIFY_CHUNK_SIZE", "8")))
+VERIFY_CONCURRENCY = max(1, int(os.getenv("VERIFY_CONCURRENCY", "4")))
+
+# Generated knowledge graphs kept server-side for /node-details and /chat (by graph_id)
+GRAPH_STORE_TTL = int(os.getenv("GRAPH_STORE_TTL", "3600"))
+GRAPH_STORE_MAX_ENTRIES = int(os.getenv("GRAPH_STORE_MAX_ENTRIES", "2000"))
+GRAPH_STORE_MEMORY_GRAPHS = int(os.getenv("GRAPH_STORE_MEMORY_GRAPHS", "256"))
+GRAPH_STORE_MEMORY_MB = int(os.getenv("GRAPH_STORE_MEMORY_MB", "64"))
+
+# Neo4j persistence of generated graphs (enabled when NEO4J_PASSWORD is set)
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+NEO4J_WRITE_BATCH_SIZE = int(os.getenv("NEO4J_WRITE_BATCH_SIZE", "50"))
+NEO4J_WRITE_QUEUE_MAX = int(os.getenv("NEO4J_WRITE_QUEUE_MAX", "1000"))
+NEO4J_WRITE_FLUSH_SECONDS = float(os.getenv("NEO4J_WRITE_FLUSH_SECONDS", "1"))
+# Stored graphs older than this are regenerated (0 = never)
+NEO4J_GRAPH_MAX_AGE = int(os.getenv("NEO4J_GRAPH_MAX_AGE", "86400"))
+NEO4J_READ_TIMEOUT = float(os.getenv("NEO4J_READ_TIMEOUT", "2"))
+# After a failed read, /knowledge-graph skips Neo4j for this long
+NEO4J_READ_BACKOFF_SECONDS = float(os.getenv("NEO4J_READ_BACKOFF_SECONDS", "30"))
+
+# Prometheus text metrics at /metrics (request latency middleware + stage timers)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Citation URL probing for /article-summary
+CITATION_CHECK_DEADLINE = float(os.getenv("CITATION_CHECK_DEADLINE", "4"))
+CITATION_CACHE_TTL = int(os.getenv("CITATION_CACHE_TTL", str(6 * 3600)))
+
 # ============ B. ADD MODEL PATH CONFIG ============
 MODEL_PATH = os.getenv("MODEL_PATH", "./models/model_2_attention.h5")
+DETECT_BATCH_MAX_ITEMS = int(os.getenv("DETECT_BATCH_MAX_ITEMS", "32"))
+# Load the model in the background at startup (false = load on first detection request)
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "true").lower() == "true"
+# Run one dummy inference pass after loading so the first real request is fast
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "false").lower() == "true"
+# Dedicated inference worker processes (0 = run detection in the API process)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
 
 # Initialize Gemini client
 gemini_client = genai.Client(api_key=GEMINI_API_KEY)
 
+# Shared pooled HTTP client for all outbound calls
+http_client = get_http_client()
+
+# Shared RSS feed store (Google News searches from /article-summary and the knowledge graph)
+feed_store = FeedStore(
+    http_client,
+    create_cache(
+        backend=CACHE_BACKEND,
+        namespace="feeds",
+        max_entries=FEED_STORE_MAX_ENTRIES,
+        ttl=FEED_STORE_MAX_AGE,
+        path=CACHE_DB_PATH,
+        memory_entries=256
+    ),
+    ttl=FEED_CACHE_TTL,
+    rate_limiter=HostRateLimiter(rate=RSS_HOST_RATE, burst=RSS_HOST_BURST)
+)
+
+# Concurrent citation URL checks with a per-URL result cache
+citation_validator = CitationValidator(
+    http_client,
+    create_cache(
+        backend=CACHE_BACKEND,
+        namespace="citations",
+        max_entries=2000,
+        ttl=CITATION_CACHE_TTL,
+        path=CACHE_DB_PATH
+    ),
+    deadline=CITATION_CHECK_DEADLINE
+)
+
+def shared_detector_clip():
+    """(clip_model, tokenizer, device) of the in-process detector, if it is loaded with the default CLIP"""
+    if INFERENCE_WORKERS > 0 or TEXT_ENCODER_MODEL != "openai/clip-vit-base-patch32":
+        return None
+    try:
+        detector = get_model()
+    except ModelNotReadyError:
+        return None
+    if not hasattr(detector, "clip_model"):
+        return None
+    return detector.clip_model, detector.clip_processor.tokenizer, detector.device
+
 # Initialize knowledge graph services
 entity_extractor = None
 rss_fetcher = None
 wikipedia_service = None
 relevance_filter = None
+enrichment_pipeline = None
+entity_resolver = None
 
 if GEMINI_API_KEY:
     try:
-        entity_extractor = EntityExtractor(GEMINI_API_KEY, GEMINI_MODEL)
-        rss_fetcher = RSSFetcher()
-        wikipedia_service = WikipediaService()
-        relevance_filter = RelevanceFilter(GEMINI_API_KEY, GEMINI_MODEL)
+        entity_extractor = EntityExtractor(
+            GEMINI_API_KEY,
+            GEMINI_MODEL,
+            cache=create_cache(
+                backend=CACHE_BACKEND,
+                namespace="entity_extraction",
+                max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+                ttl=EXTRACTION_CACHE_TTL,
+                path=CACHE_DB_PATH,
+                memory_entries=EXTRACTION_CACHE_MEMORY_ENTRIES
+            )
+        )
+        rss_fetcher = RSSFetcher(http_client, feed_store)
+        wikipedia_index = None
+        if WIKIPEDIA_INDEX_PATH and os.path.exists(WIKIPEDIA_INDEX_PATH):
+            wikipedia_index = WikipediaIndex(WIKIPEDIA_INDEX_PATH)
+            print(f"✅ Offline Wikipedia index loaded ({wikipedia_index.page_count:,} pages)")
+        wikipedia_service = WikipediaService(
+            index=wikipedia_index,
+            cache=create_cache(
+                backend=CACHE_BACKEND,
+                namespace="wikipedia",
+                max_entries=WIKIPEDIA_CACHE_MAX_ENTRIES,
+                ttl=WIKIPEDIA_CACHE_TTL,
+                path=CACHE_DB_PATH,
+                memory_entries=512
+            )
+        )
+        if ENTITY_RESOLUTION_ENABLED:
+            entity_resolver = EntityResolver(
+                cache=create_cache(
+                    backend=CACHE_BACKEND,
+                    namespace="entities",
+                    max_entries=ENTITY_INDEX_MAX_ENTRIES,
+                    path=CACHE_DB_PATH,
+                    memory_entries=1024
+                ),
+                wikipedia_service=wikipedia_service,
+                fuzzy_threshold=ENTITY_FUZZY_THRESHOLD,
+                max_indexed=ENTITY_INDEX_MAX_ENTRIES
+            )
+        semantic_ranker = None
+        if RELEVANCE_MODE == "semantic":
+            semantic_ranker = SemanticRanker(
+                ClipTextEncoder(TEXT_ENCODER_MODEL, shared_clip=shared_detector_clip),
+                store=EmbeddingStore(TEXT_EMBEDDING_STORE_DIR, dim=512, max_vectors=TEXT_EMBEDDING_STORE_MAX_VECTORS)
+            )
+        relevance_filter = RelevanceFilter(
+            GEMINI_API_KEY,
+            GEMINI_MODEL,
+            mode=RELEVANCE_MODE,
+            semantic_ranker=semantic_ranker,
+            min_similarity=RELEVANCE_MIN_SIMILARITY
+        )
+        enrichment_pipeline = EnrichmentPipeline(
+            rss_fetcher,
+            wikipedia_service,
+            relevance_filter,
+            rss_concurrency=ENRICH_RSS_CONCURRENCY,
+            wiki_concurrency=ENRICH_WIKI_CONCURRENCY,
+            deadline=ENRICH_DEADLINE_SECONDS
+        )
         print("✅ Knowledge Graph services initialized (Entity Extraction + RSS + Wikipedia)")
     except Exception as e:
         print(f"⚠️ Could not initialize Knowledge Graph services: {e}")
 else:
     print("⚠️ GEMINI_API_KEY not found - Knowledge Graph disabled")
 
-# Cache for verified articles (prevents re-checking)
-verification_cache = {}
+# Cache for verified articles (prevents re-checking, shared across workers)
+verification_cache = create_cache(
+    backend=CACHE_BACKEND,
+    namespace="verification",
+    max_entries=VERIFICATION_CACHE_MAX_ENTRIES,
+    ttl=VERIFICATION_CACHE_TTL,
+    path=CACHE_DB_PATH
+)
+print(f"✅ Verification cache ready ({CACHE_BACKEND}, {len(verification_cache)} cached articles)")
+
+# Shared pool bounding concurrent Gemini verification calls across requests
+verification_pool = ThreadPoolExecutor(max_workers=VERIFY_CONCURRENCY, thread_name_prefix="verify")
+
+# Pre-fetched, pre-verified articles (started in startup_event when INGEST_ENABLED)
+article_store = ArticleStore(ARTICLE_STORE_PATH)
+ingestion_worker = None
+
+# When each search query was last topped up from NewsAPI
+search_topups = create_cache(
+    backend=CACHE_BACKEND,
+    namespace="search_topups",
+    max_entries=5000,
+    ttl=SEARCH_TOPUP_TTL,
+    path=CACHE_DB_PATH
+)
+
+# Knowledge graphs addressed by graph_id (clients no longer re-upload extraction_data)
+graph_store = GraphStore(
+    create_cache(
+        backend=CACHE_BACKEND,
+        namespace="graphs",
+        max_entries=GRAPH_STORE_MAX_ENTRIES,
+        ttl=GRAPH_STORE_TTL,
+        path=CACHE_DB_PATH
+    ),
+    ttl=GRAPH_STORE_TTL,
+    max_sessions=GRAPH_STORE_MEMORY_GRAPHS,
+    max_bytes=GRAPH_STORE_MEMORY_MB * 1024 * 1024
+)
+
+# Cross-article graph in Neo4j: written behind /knowledge-graph, read back by article ID
+neo4j_service = None
+graph_writer = None
+if NEO4J_PASSWORD:
+    try:
+        neo4j_service = Neo4jService(password=NEO4J_PASSWORD)
+        graph_writer = GraphWriteBehind(
+            neo4j_service,
+            batch_size=NEO4J_WRITE_BATCH_SIZE,
+            max_queue=NEO4J_WRITE_QUEUE_MAX,
+            flush_interval=NEO4J_WRITE_FLUSH_SECONDS,
+            max_age=NEO4J_GRAPH_MAX_AGE
+        )
+        print("✅ Neo4j graph persistence enabled")
+    except Exception as e:
+        neo4j_service = None
+        print(f"⚠️ Could not connect to Neo4j, graphs will not be persisted: {e}")
+else:
+    print("⏸️ NEO4J_PASSWORD not set - knowledge graphs are not persisted")
 
 # ---------------- APP ----------------
 
@@ -74,16 +348,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def route_template(request) -> str:
+    """Route path (e.g. /news) for metric labels, so raw URLs can't blow up label cardinality"""
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_request_metrics(request, call_next):
+        """Per-route latency histogram and in-flight gauge (streams are timed to their first byte)"""
+        route = route_template(request)
+        start = time.perf_counter()
+        status = 500
+        with REQUESTS_IN_FLIGHT.track(route=route):
+            try:
+                response = await call_next(request)
+                status = response.status_code
+                return response
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                        route=route, status=status)
+
 # ============ C. ADD STARTUP EVENT ============
 @app.on_event("startup")
 async def startup_event():
-    """Load model when server starts"""
-    if os.path.exists(MODEL_PATH):
-        print(f"🔄 Initializing model from: {MODEL_PATH}")
-        initialize_model(MODEL_PATH)
+    """Start loading the model in the background; the API serves requests meanwhile"""
+    global ingestion_worker
+    if MODEL_PRELOAD:
+        start_model_loading(MODEL_PATH, warm_up=MODEL_WARMUP, workers=INFERENCE_WORKERS)
     else:
-        print(f"⚠️ Model not found at {MODEL_PATH}")
-        print(f"   Please place your model_2_attention.h5 file in the models/ directory")
+        print("⏸️ Model preload disabled, loading on first detection request")
+    
+    if INGEST_ENABLED:
+        ingestion_worker = IngestionWorker(
+            article_store,
+            build_ingestion_sources(),
+            verify_for_ingestion,
+            interval=INGEST_INTERVAL_SECONDS,
+            verify_limit=INGEST_VERIFY_LIMIT,
+            retention_seconds=ARTICLE_RETENTION_DAYS * 24 * 3600
+        )
+        ingestion_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background worker pools"""
+    if ingestion_worker:
+        ingestion_worker.stop()
+    if graph_writer:
+        graph_writer.stop()
+    if neo4j_service:
+        neo4j_service.close()
+    if enrichment_pipeline:
+        enrichment_pipeline.shutdown()
+    verification_pool.shutdown(wait=False, cancel_futures=True)
+    citation_validator.shutdown()
+    shutdown_model()
+    http_client.close()
 
 # ---------------- TIME ----------------
 
@@ -95,6 +419,18 @@ def to_ist_string(utc_time: Optional[str]) -> str:
     dt = datetime.fromisoformat(utc_time.replace("Z", "+00:00"))
     return dt.astimezone(IST).strftime("%d %b %Y, %I:%M %p IST")
 
+def rss_date_to_iso(rss_time: Optional[str]) -> Optional[str]:
+    """RFC 822 RSS date -> NewsAPI-style ISO UTC string (2024-01-31T12:00:00Z)"""
+    if not rss_time:
+        return None
+    try:
+        dt = parsedate_to_datetime(rss_time)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
 # ---------------- FAKE NEWS SAMPLES ----------------
 
 # Hardcoded fake news dataset for demonstration
@@ -245,22 +581,19 @@ def google_news_search(query: str, max_results: int = 5) -> List[dict]:
         List of news results with title, snippet, and link
     """
     try:
-        from urllib.parse import quote_plus
-        import feedparser
-        
         # Encode query for URL
         encoded_query = quote_plus(query)
         search_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
         
         print(f"🔍 Google News RSS: {query[:60]}... (max={max_results})")
         
-        # Parse RSS feed
-        feed = feedparser.parse(search_url)
+        # Served from the feed store when fresh, otherwise revalidated/fetched
+        entries = feed_store.get_entries(search_url)
         
         results = []
-        for entry in feed.entries[:max_results]:
+        for entry in entries[:max_results]:
             # Extract source from entry if available
-            source = entry.get('source', {}).get('title', 'Unknown') if hasattr(entry, 'source') else 'Unknown'
+            source = entry['source']['title'] or 'Unknown'
             
             results.append({
                 "title": entry.get('title', ''),
@@ -276,55 +609,26 @@ def google_news_search(query: str, max_results: int = 5) -> List[dict]:
         print(f"❌ Google News RSS error: {e}")
         return []
 
-def verify_articles_batch(articles: List[dict], max_retries: int = 3) -> List[dict]:
-    """Verify multiple articles using Gemini with Google Search grounding"""
-    
-    # Check cache first
-    cached_results = []
-    uncached_articles = []
-    uncached_indices = []
-    
-    for i, article in enumerate(articles):
-        if article["id"] in verification_cache:
-            article["verification"] = verification_cache[article["id"]]
-            cached_results.append((i, verification_cache[article["id"]]))
-        else:
-            uncached_articles.append(article)
-            uncached_indices.append(i)
-    
-    # If all cached, process and return properly
-    if not uncached_articles:
-        verified_articles = []
-        fake_articles = []
-        unverified_articles = []
-        
-        for article in articles:
-            conclusion = article.get("verification", {}).get("conclusion", "UNVERIFIABLE")
-            if conclusion == "REAL":
-                verified_articles.append(article)
-            elif conclusion == "FAKE":
-                fake_articles.append(article)
-            else:
-                unverified_articles.append(article)
-        
-        shown_articles = verified_articles + unverified_articles
-        
-        return {
-            "articles": shown_articles,
-            "stats": {
-                "real_count": len(verified_articles),
-                "fake_count": len(fake_articles),
-                "unverified_count": len(unverified_articles),
-                "total_shown": len(shown_articles)
-            },
-            "fake_news_detected": fake_articles[:3]
-        }
-    
-    print(f"📝 Verifying {len(uncached_articles)} articles...")
-    print(f"🔑 Using Gemini: {GEMINI_MODEL}")
+def _strip_json_fence(text: str) -> str:
+    """Remove ```json fences Gemini sometimes wraps around JSON replies"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+def verify_chunk(chunk: List[dict]) -> List[dict]:
+    """
+    Verify one chunk of articles with a single Gemini call.
     
+    Returns one verification dict per article (same order as `chunk`).
+    Raises on a failed call or malformed reply so the caller can retry just this chunk.
+    """
     # Optimized prompt - minimal tokens, maximum accuracy
-    claims = "\n".join([f"{i+1}. {a['title']}" for i, a in enumerate(uncached_articles)])
+    claims = "\n".join([f"{i+1}. {a['title']}" for i, a in enumerate(chunk)])
     prompt = f"""Verify news claims from: CNN, BBC, NYT, Reuters, Guardian, Hindu, Indian Express, Al Jazeera, Bloomberg.
 
 {claims}
@@ -332,109 +636,140 @@ def verify_articles_batch(articles: List[dict], max_retries: int = 3) -> List[di
 For each: REAL (verified ≥1 source), FAKE (contradicted), UNVERIFIABLE (not found).
 JSON: {{"results":[{{"article_index":1,"conclusion":"REAL|FAKE|UNVERIFIABLE","answer":"reason","citations":["source"]}}]}}"""
     
-    for attempt in range(max_retries):
-        try:
-            # Use FREE Google News RSS instead of expensive Gemini search
-            # Perform Google News search once for batch of articles
-            search_query = " OR ".join([f'"{a["title"][:50]}"' for a in uncached_articles[:3]])
-            web_results = google_news_search(search_query, max_results=10)
-            
-            # Build context from search results
-            web_context = "\n".join([
-                f"- {r['title']} ({r.get('source', 'Unknown')}): {r['snippet']}"
-                for r in web_results
-            ]) if web_results else "No web search results available."
-            
-            # Enhanced prompt with web context
-            enhanced_prompt = f"""{prompt}
+    # Use FREE Google News RSS instead of expensive Gemini search
+    # Perform Google News search once for this chunk of articles
+    search_query = " OR ".join([f'"{a["title"][:50]}"' for a in chunk[:3]])
+    web_results = google_news_search(search_query, max_results=10)
+    
+    # Build context from search results
+    web_context = "\n".join([
+        f"- {r['title']} ({r.get('source', 'Unknown')}): {r['snippet']}"
+        for r in web_results
+    ]) if web_results else "No web search results available."
+    
+    # Enhanced prompt with web context
+    enhanced_prompt = f"""{prompt}
 
 WEB SEARCH RESULTS FROM TRUSTED NEWS SOURCES (Google News RSS):
 {web_context}
 
 Use the above search results to verify each claim."""
-            
-            config = types.GenerateContentConfig(temperature=0.1)
-            
-            response = gemini_client.models.generate_content(
-                model=GEMINI_MODEL,
-                contents=enhanced_prompt,
-                config=config
-            )
-            
-            # Access response text correctly for new SDK
-            result_text = response.candidates[0].content.parts[0].text if hasattr(response, 'candidates') else response.text
-            result_text = result_text.strip()
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            elif result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            result_text = result_text.strip()
-            
-            data = json.loads(result_text)
-            results = data.get("results", [])
-            
-            if isinstance(results, list) and len(results) > 0:
-                # Pad or truncate
-                while len(results) < len(uncached_articles):
-                    results.append({
-                        "article_index": len(results) + 1,
+    
+    config = types.GenerateContentConfig(temperature=0.1)
+    
+    with stage_timer("gemini_verify"):
+        response = gemini_client.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=enhanced_prompt,
+            config=config
+        )
+    record_gemini_usage("verify", response)
+    
+    # Access response text correctly for new SDK
+    result_text = response.candidates[0].content.parts[0].text if hasattr(response, 'candidates') else response.text
+    data = json.loads(_strip_json_fence(result_text))
+    results = data.get("results", [])
+    
+    if not isinstance(results, list) or len(results) == 0:
+        raise ValueError("Invalid response")
+    
+    # Match results back by article_index, falling back to position
+    by_index = {}
+    for position, result in enumerate(results):
+        if not isinstance(result, dict):
+            continue
+        index = result.get("article_index")
+        if not isinstance(index, int) or not 1 <= index <= len(chunk) or index in by_index:
+            index = position + 1
+        by_index.setdefault(index, result)
+    
+    verifications = []
+    for i in range(len(chunk)):
+        result = by_index.get(i + 1, {"conclusion": "UNVERIFIABLE", "answer": "Incomplete verification"})
+        conclusion = result.get("conclusion", "UNVERIFIABLE")
+        if conclusion not in ("REAL", "FAKE", "UNVERIFIABLE"):
+            conclusion = "UNVERIFIABLE"
+        verifications.append({
+            "conclusion": conclusion,
+            "answer": result.get("answer", ""),
+            "verified": conclusion in ["REAL", "UNVERIFIABLE"]
+        })
+    
+    return verifications
+
+def iter_verification_chunks(articles: List[dict], max_retries: int = 3):
+    """
+    Verify articles in concurrent chunks, yielding (chunk, verifications) as each chunk resolves.
+    
+    Chunks run on the shared `verification_pool`, which bounds concurrent Gemini calls
+    across all requests. A failed chunk is retried on its own; after `max_retries`
+    attempts its articles are reported UNVERIFIABLE (and not cached).
+    
+    Yields:
+        (chunk, verifications, ok) where ok is False for the UNVERIFIABLE placeholders
+        of a chunk that failed every attempt
+    """
+    chunks = [articles[i:i + VERIFY_CHUNK_SIZE] for i in range(0, len(articles), VERIFY_CHUNK_SIZE)]
+    if not chunks:
+        return
+    
+    print(f"📝 Verifying {len(articles)} articles in {len(chunks)} chunks (size={VERIFY_CHUNK_SIZE}, concurrency={VERIFY_CONCURRENCY})...")
+    print(f"🔑 Using Gemini: {GEMINI_MODEL}")
+    
+    pending = {verification_pool.submit(verify_chunk, chunk): (chunk, 1) for chunk in chunks}
+    
+    try:
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk, attempt = pending.pop(future)
+                try:
+                    verifications = future.result()
+                except Exception as e:
+                    print(f"❌ Chunk of {len(chunk)} failed (attempt {attempt}): {str(e)[:100]}")
+                    if attempt < max_retries:
+                        pending[verification_pool.submit(verify_chunk, chunk)] = (chunk, attempt + 1)
+                        continue
+                    # Final failure: mark this chunk unverifiable
+                    verifications = [{
                         "conclusion": "UNVERIFIABLE",
-                        "answer": "Incomplete verification",
-                        "citations": []
-                    })
-                results = results[:len(uncached_articles)]
+                        "answer": f"Error: {str(e)[:50]}",
+                        "verified": True
+                    } for _ in chunk]
+                    yield chunk, verifications, False
+                    continue
                 
-                # Cache results
-                for i, result in enumerate(results):
-                    article = uncached_articles[i]
-                    verification_cache[article["id"]] = {
-                        "conclusion": result.get("conclusion", "UNVERIFIABLE"),
-                        "answer": result.get("answer", ""),
-                        "verified": result.get("conclusion", "UNVERIFIABLE") in ["REAL", "UNVERIFIABLE"]
-                    }
-                
-                print(f"✅ Verification complete!")
-                break
-            else:
-                raise ValueError("Invalid response")
+                # Cache results (and keep stored copies of these articles verified)
+                for article, verification in zip(chunk, verifications):
+                    verification_cache.set(article["id"], verification)
+                article_store.set_verifications({
+                    article["id"]: verification for article, verification in zip(chunk, verifications)
+                })
                 
-        except Exception as e:
-            print(f"❌ Attempt {attempt + 1} failed: {str(e)[:100]}")
-            if attempt < max_retries - 1:
-                continue
-            # Final failure: mark all unverifiable
-            for article in uncached_articles:
-                verification_cache[article["id"]] = {
-                    "conclusion": "UNVERIFIABLE",
-                    "answer": f"Error: {str(e)[:50]}",
-                    "verified": True
-                }
-    
-    # Apply all results (cached + new)
+                yield chunk, verifications, True
+    finally:
+        # Consumer went away (e.g. /news/stream client disconnected): drop chunks not started yet
+        for future in pending:
+            future.cancel()
+
+def summarize_verification(articles: List[dict]) -> dict:
+    """Split verified articles into shown (REAL + UNVERIFIABLE) and fake lists"""
     verified_articles = []
     fake_articles = []
     unverified_articles = []
     
     for article in articles:
-        if article["id"] in verification_cache:
-            article["verification"] = verification_cache[article["id"]]
-            conclusion = article["verification"]["conclusion"]
-            
-            if conclusion == "REAL":
-                verified_articles.append(article)
-            elif conclusion == "FAKE":
-                fake_articles.append(article)
-            else:
-                unverified_articles.append(article)
+        conclusion = article.get("verification", {}).get("conclusion", "UNVERIFIABLE")
+        if conclusion == "REAL":
+            verified_articles.append(article)
+        elif conclusion == "FAKE":
+            fake_articles.append(article)
+        else:
+            unverified_articles.append(article)
     
     # Show REAL + UNVERIFIED (hide only FAKE)
     shown_articles = verified_articles + unverified_articles
     
-    print(f"✅ REAL: {len(verified_articles)} | ❌ FAKE: {len(fake_articles)} | ? UNVERIFIED: {len(unverified_articles)}")
-    print(f"📰 Showing: {len(shown_articles)} articles")
-    
     return {
         "articles": shown_articles,
         "stats": {
@@ -446,6 +781,32 @@ Use the above search results to verify each claim."""
         "fake_news_detected": fake_articles[:3]  # Show up to 3 fake articles for demo
     }
 
+def verify_articles_batch(articles: List[dict], max_retries: int = 3) -> dict:
+    """Verify multiple articles using Gemini with Google News RSS context"""
+    
+    # Check cache first
+    uncached_articles = []
+    
+    for article in articles:
+        cached = verification_cache.get(article["id"])
+        if cached is not None:
+            article["verification"] = cached
+        else:
+            uncached_articles.append(article)
+    
+    for chunk, verifications, _ in iter_verification_chunks(uncached_articles, max_retries):
+        for article, verification in zip(chunk, verifications):
+            article["verification"] = verification
+    
+    result = summarize_verification(articles)
+    
+    if uncached_articles:
+        stats = result["stats"]
+        print(f"✅ REAL: {stats['real_count']} | ❌ FAKE: {stats['fake_count']} | ? UNVERIFIED: {stats['unverified_count']}")
+        print(f"📰 Showing: {stats['total_shown']} articles")
+    
+    return result
+
 # ---------------- UTILS ----------------
 
 def make_id(url: str) -> str:
@@ -493,16 +854,8 @@ def relevance_score(article: dict, query: str) -> int:
 
 # ---------------- API ----------------
 
-@app.get("/news")
-def get_news(
-    page: int = Query(1, ge=1),
-    q: Optional[str] = Query(None),
-    verify: bool = Query(True)
-):
-    """
-    Get REAL news from NewsAPI with verification
-    Returns only REAL and UNVERIFIABLE articles (FAKE articles are filtered out)
-    """
+def fetch_news_articles(page: int, q: Optional[str]) -> List[dict]:
+    """Fetch, clean and (for searches) re-rank NewsAPI articles"""
     
     if q and q.strip():
         # User search query
@@ -523,7 +876,8 @@ def get_news(
 
     url = "https://newsapi.org/v2/everything"
 
-    response = requests.get(url, params=params)
+    with stage_timer("newsapi_fetch"):
+        response = http_client.get(url, params=params)
 
     if response.status_code != 200:
         raise HTTPException(status_code=500, detail=response.text)
@@ -568,36 +922,239 @@ def get_news(
             key=lambda a: relevance_score(a, query),
             reverse=True
         )
+    
+    return articles
+
+# ---------------- INGESTION ----------------
+
+def fetch_rss_topic_articles(topic: str) -> List[dict]:
+    """Normalize one Google News RSS topic search into article dicts (RSS items carry no image)"""
+    search_url = f"https://news.google.com/rss/search?q={quote_plus(topic)}&hl=en-US&gl=US&ceid=US:en"
+    articles = []
+    for entry in feed_store.get_entries(search_url):
+        link = entry.get("link")
+        if not link:
+            continue
+        title = clean_text(entry.get("title"))
+        description = clean_text(entry.get("summary"))
+        if not is_valid_article(title, description):
+            continue
+        published_utc = rss_date_to_iso(entry.get("published"))
+        articles.append({
+            "id": make_id(link),
+            "title": title,
+            "description": description,
+            "content": description,
+            "url": link,
+            "image": None,
+            "source": entry["source"]["title"] or None,
+            "publishedAt": published_utc,
+            "publishedAtIST": to_ist_string(published_utc),
+        })
+    return articles
+
+def build_ingestion_sources() -> list:
+    """(name, origin, fetch_fn) sources polled by the ingestion worker"""
+    sources = [
+        (f"newsapi:page{page}", "newsapi", lambda page=page: fetch_news_articles(page, None))
+        for page in range(1, INGEST_NEWSAPI_PAGES + 1)
+    ]
+    sources += [
+        (f"rss:{topic}", "rss", lambda topic=topic: fetch_rss_topic_articles(topic))
+        for topic in INGEST_RSS_TOPICS
+    ]
+    return sources
+
+def verify_for_ingestion(articles: List[dict]) -> dict:
+    """Verify articles for the ingestion worker; chunks that fail are left for its next run"""
+    results = {}
+    uncached_articles = []
+    for article in articles:
+        cached = verification_cache.get(article["id"])
+        if cached is not None:
+            results[article["id"]] = cached
+        else:
+            uncached_articles.append(article)
+    
+    for chunk, verifications, ok in iter_verification_chunks(uncached_articles):
+        if ok:
+            for article, verification in zip(chunk, verifications):
+                results[article["id"]] = verification
+    return results
+
+def stored_news_feed(page: int, q: Optional[str], verify: bool) -> Optional[dict]:
+    """Default /news payload from the article store, or None if it can't serve this request yet"""
+    if q and q.strip():
+        return None
+    if ingestion_worker is None or not article_store.has_feed():
+        return None
+    return article_store.feed(page, verified_only=verify)
+
+def search_news_articles(page: int, q: str) -> List[dict]:
+    """
+    Answer a /news search from the local full-text index (BM25 ranked)
+    
+    NewsAPI is only called to top the index up, at most once per query/page
+    per SEARCH_TOPUP_TTL (rare queries and last pages included).
+    """
+    query = q.strip()
+    articles = article_store.search(query, page=page, page_size=30)
+    if articles is None:
+        # No FTS5 in this SQLite build
+        return fetch_news_articles(page, q)
+    
+    topup_key = f"{page}:{' '.join(query.lower().split())}"
+    if topup_key not in search_topups:
+        try:
+            fresh = fetch_news_articles(page, q)
+            added = article_store.upsert_many(fresh, origin="newsapi", topic=f"search:{query}")
+            search_topups.set(topup_key, time.time())
+            print(f"🔎 Search top-up for '{query[:60]}': {added} new articles from NewsAPI")
+            articles = article_store.search(query, page=page, page_size=30)
+        except HTTPException as e:
+            if not articles:
+                raise
+            print(f"⚠️ NewsAPI top-up failed, serving local results: {str(e.detail)[:100]}")
+    
+    return articles
+
+def get_news_articles(page: int, q: Optional[str]) -> List[dict]:
+    """Articles for /news and /news/stream: local search for queries, NewsAPI for the default feed"""
+    if q and q.strip() and SEARCH_LOCAL:
+        return search_news_articles(page, q)
+    articles = fetch_news_articles(page, q)
+    article_store.upsert_many(articles, origin="newsapi", topic=f"search:{q.strip()}" if q and q.strip() else "default")
+    return articles
+
+def build_news_response(verified_result: dict) -> dict:
+    """Shape a verify_articles_batch result into the /news payload"""
+    # Result already contains filtered articles and stats
+    verified_articles = verified_result["articles"]
+    fake_articles = verified_result.get("fake_news_detected", [])
+    
+    # Separate by conclusion
+    real_articles = [a for a in verified_articles if a.get("verification", {}).get("conclusion") == "REAL"]
+    unverified_articles = [a for a in verified_articles if a.get("verification", {}).get("conclusion") == "UNVERIFIABLE"]
+    
+    # Combine REAL + UNVERIFIED for display (hide only FAKE)
+    shown_articles = (real_articles + unverified_articles)[:10]
+    
+    # Return top 10 (REAL + UNVERIFIED) + all FAKE (for blocking display)
+    return {
+        "articles": shown_articles,
+        "stats": {
+            "real_count": len([a for a in shown_articles if a.get("verification", {}).get("conclusion") == "REAL"]),
+            "fake_count": len(fake_articles),
+            "unverified_count": len([a for a in shown_articles if a.get("verification", {}).get("conclusion") == "UNVERIFIABLE"])
+        },
+        "fake_news_detected": fake_articles  # All fake news for display
+    }
+
+@app.get("/news")
+def get_news(
+    page: int = Query(1, ge=1),
+    q: Optional[str] = Query(None),
+    verify: bool = Query(True)
+):
+    """
+    Get REAL news from NewsAPI with verification
+    Returns only REAL and UNVERIFIABLE articles (FAKE articles are filtered out)
+    
+    The default feed (no query) is served from the pre-verified article store
+    once the ingestion worker has filled it.
+    """
+    stored = stored_news_feed(page, q, verify)
+    if stored is not None:
+        return stored
+    
+    articles = get_news_articles(page, q)
 
     # ---------- FAKE NEWS VERIFICATION ----------
     if verify and articles:
         # Verify more articles (up to 30) to ensure we get at least 10 REAL ones
         articles_to_verify = articles[:30]
         result = verify_articles_batch(articles_to_verify)
+        return build_news_response(result)
+    
+    return {"articles": articles, "stats": {"real_count": len(articles), "fake_count": 0, "unverified_count": 0}, "fake_news_detected": []}
+
+
+@app.get("/news/stream")
+def stream_news(
+    page: int = Query(1, ge=1),
+    q: Optional[str] = Query(None),
+    verify: bool = Query(True)
+):
+    """
+    Streaming variant of /news (NDJSON, one JSON event per line)
+    
+    Events, in order:
+        {"type": "articles", "articles": [...]}         cleaned articles, sent right after NewsAPI;
+                                                        unverified ones carry "pending": true
+        {"type": "verification", "updates": [...]}      {"id", "verification"} patches, one event per resolved chunk
+        {"type": "done", "articles", "stats", "fake_news_detected"}   same payload as /news
+    
+    Clients should hold back or mark pending articles and drop those whose
+    verdict comes back FAKE. Verification chunks that haven't started are
+    cancelled if the client disconnects.
+    """
+    stored = stored_news_feed(page, q, verify)
+    if stored is not None:
+        # Already verified: one articles event and done
+        def stored_events():
+            yield json.dumps({"type": "articles", "articles": stored["articles"]}) + "\n"
+            yield json.dumps({"type": "done", **stored}) + "\n"
+        return StreamingResponse(stored_events(), media_type="application/x-ndjson")
+    
+    articles = get_news_articles(page, q)
+    
+    def events():
+        if not verify or not articles:
+            yield json.dumps({"type": "articles", "articles": articles}) + "\n"
+            yield json.dumps({
+                "type": "done",
+                "articles": articles,
+                "stats": {"real_count": len(articles), "fake_count": 0, "unverified_count": 0},
+                "fake_news_detected": []
+            }) + "\n"
+            return
         
-        # Result already contains filtered articles and stats
-        verified_articles = result["articles"]
-        fake_articles = result.get("fake_news_detected", [])
+        # Verify more articles (up to 30) to ensure we get at least 10 REAL ones
+        articles_to_verify = articles[:30]
         
-        # Separate by conclusion
-        real_articles = [a for a in verified_articles if a.get("verification", {}).get("conclusion") == "REAL"]
-        unverified_articles = [a for a in verified_articles if a.get("verification", {}).get("conclusion") == "UNVERIFIABLE"]
+        # Cached verdicts are applied before the first event; only the rest are pending
+        uncached_articles = []
+        for article in articles_to_verify:
+            cached = verification_cache.get(article["id"])
+            if cached is not None:
+                article["verification"] = cached
+            else:
+                uncached_articles.append(article)
+        pending_ids = {article["id"] for article in uncached_articles}
+        yield json.dumps({
+            "type": "articles",
+            "articles": [
+                {**article, "pending": True} if article["id"] in pending_ids else article
+                for article in articles_to_verify
+                if article.get("verification", {}).get("conclusion") != "FAKE"
+            ]
+        }) + "\n"
         
-        # Combine REAL + UNVERIFIED for display (hide only FAKE)
-        shown_articles = (real_articles + unverified_articles)[:10]
+        chunks = iter_verification_chunks(uncached_articles)
+        try:
+            for chunk, verifications, _ in chunks:
+                updates = []
+                for article, verification in zip(chunk, verifications):
+                    article["verification"] = verification
+                    updates.append({"id": article["id"], "verification": verification})
+                yield json.dumps({"type": "verification", "updates": updates}) + "\n"
+        finally:
+            chunks.close()
         
-        # Return top 10 (REAL + UNVERIFIED) + all FAKE (for blocking display)
-        return {
-            "articles": shown_articles,
-            "stats": {
-                "real_count": len([a for a in shown_articles if a.get("verification", {}).get("conclusion") == "REAL"]),
-                "fake_count": len(fake_articles),
-                "unverified_count": len([a for a in shown_articles if a.get("verification", {}).get("conclusion") == "UNVERIFIABLE"])
-            },
-            "fake_news_detected": fake_articles  # All fake news for display
-        }
+        final = build_news_response(summarize_verification(articles_to_verify))
+        yield json.dumps({"type": "done", **final}) + "\n"
     
-    return {"articles": articles, "stats": {"real_count": len(articles), "fake_count": 0, "unverified_count": 0}, "fake_news_detected": []}
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 
 @app.get("/fake-news-samples")
@@ -637,16 +1194,124 @@ def get_fake_news_samples():
 @app.get("/verification-status")
 def get_verification_status():
     """Get cache statistics"""
+    stats = verification_cache.stats()
+    return {
+        "cached_articles": stats["size"],
+        "cache_enabled": True,
+        "cache": stats
+    }
+
+@app.get("/cache-stats")
+def get_cache_stats():
+    """Hit/miss/eviction counters for every backend cache"""
     return {
-        "cached_articles": len(verification_cache),
-        "cache_enabled": True
+        "verification": verification_cache.stats(),
+        "entity_extraction": entity_extractor.cache_stats() if entity_extractor else {"enabled": False},
+        "citations": citation_validator.cache.stats(),
+        "wikipedia": wikipedia_service.cache_stats() if wikipedia_service else {"enabled": False},
+        "wikipedia_index": wikipedia_service.index_stats() if wikipedia_service else {"enabled": False},
+        "feeds": feed_store.stats(),
+        "relevance": relevance_filter.stats() if relevance_filter else {"enabled": False},
+        "entities": entity_resolver.stats() if entity_resolver else {"enabled": False},
+        "graphs": graph_store.stats(),
+        "neo4j_writes": graph_writer.stats() if graph_writer else {"enabled": False}
+    }
+
+@app.get("/http-stats")
+def get_http_stats():
+    """Per-host latency for outbound HTTP calls made through the shared client"""
+    return {"hosts": http_client.host_stats()}
+
+def collect_cache_metrics():
+    """Hit/miss/eviction counters and hit ratio for every backend cache"""
+    caches = {
+        "verification": verification_cache,
+        "citations": citation_validator.cache,
+        "feeds": feed_store.cache,
+        "search_topups": search_topups,
+        "graphs": graph_store.cache
+    }
+    if entity_extractor and entity_extractor.cache is not None:
+        caches["entity_extraction"] = entity_extractor.cache
+    if wikipedia_service and wikipedia_service.cache is not None:
+        caches["wikipedia"] = wikipedia_service.cache
+    if entity_resolver and entity_resolver.cache is not None:
+        caches["entities"] = entity_resolver.cache
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    
+    def samples(field):
+        return [({"cache": name}, s[field]) for name, s in stats.items()]
+    
+    yield "cache_hits_total", "counter", "Cache lookups that hit (this process)", samples("hits")
+    yield "cache_misses_total", "counter", "Cache lookups that missed (this process)", samples("misses")
+    yield "cache_evictions_total", "counter", "Entries evicted to respect max_entries", samples("evictions")
+    yield "cache_hit_ratio", "gauge", "hits / (hits + misses) since start", samples("hit_ratio")
+    yield "cache_entries", "gauge", "Entries currently stored", samples("size")
+
+def collect_service_metrics():
+    """Outbound HTTP, feed store, ingestion and model counters from the existing stats() helpers"""
+    hosts = http_client.host_stats()
+    yield "outbound_requests_total", "counter", "Outbound HTTP requests by host", \
+        [({"host": host}, s["requests"]) for host, s in hosts.items()]
+    yield "outbound_errors_total", "counter", "Outbound HTTP requests that failed or returned >= 400", \
+        [({"host": host}, s["errors"]) for host, s in hosts.items()]
+    yield "outbound_latency_p95_seconds", "gauge", "p95 outbound latency over the recent sample window", \
+        [({"host": host}, s["p95_ms"] / 1000) for host, s in hosts.items()]
+    
+    feeds = feed_store.stats()
+    yield "feed_requests_total", "counter", "Feed store lookups by outcome", \
+        [({"result": k}, v) for k, v in feeds.items() if isinstance(v, int)]
+    
+    store = article_store.stats()
+    yield "stored_articles", "gauge", "Articles in the local store by verification conclusion", \
+        [({"conclusion": k}, v) for k, v in store["by_conclusion"].items()]
+    if ingestion_worker:
+        worker = ingestion_worker.stats()
+        yield "ingestion_runs_total", "counter", "Completed ingestion runs", [({}, worker["runs"])]
+        yield "ingestion_articles_total", "counter", "Articles ingested / verified by the worker", \
+            [({"kind": "ingested"}, worker["ingested"]), ({"kind": "verified"}, worker["verified"])]
+        yield "ingestion_errors_total", "counter", "Ingestion source/verification failures", [({}, worker["errors"])]
+    
+    state = get_model_state()
+    yield "model_ready", "gauge", "1 when the fake news detector is loaded", [({}, 1 if state["model_loaded"] else 0)]
+    if state["model_loaded"]:
+        model = get_model()
+        if INFERENCE_WORKERS > 0:
+            pool = model.pool_stats()
+            yield "inference_pending", "gauge", "Detection requests queued or running in the worker pool", \
+                [({}, pool["pending"])]
+            yield "inference_rejected_total", "counter", "Detection requests rejected while the pool was full", \
+                [({}, pool["rejected"])]
+            yield "inference_restarts_total", "counter", "Times the worker pool was rebuilt after a worker died", \
+                [({}, pool["restarts"])]
+        else:
+            batchers = (model.image_batcher.stats(), model.predict_batcher.stats())
+            yield "batcher_queue_depth", "gauge", "Items waiting in an inference micro-batcher", \
+                [({"batcher": b["name"]}, b["queue_depth"]) for b in batchers]
+
+REGISTRY.register_collector(collect_cache_metrics)
+REGISTRY.register_collector(collect_service_metrics)
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text exposition: request/stage latency histograms, Gemini tokens, caches, in-flight gauges"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/ingestion-status")
+def get_ingestion_status():
+    """Background ingestion worker counters and article store contents"""
+    return {
+        "enabled": ingestion_worker is not None,
+        "worker": ingestion_worker.stats() if ingestion_worker else None,
+        "store": article_store.stats()
     }
 
 @app.post("/clear-cache")
 def clear_verification_cache():
-    """Clear the verification cache"""
+    """Clear the verification cache and the verdicts stored with ingested articles"""
     verification_cache.clear()
-    return {"message": "Cache cleared", "cached_articles": 0}
+    reset = article_store.clear_verifications()
+    return {"message": "Cache cleared", "cached_articles": len(verification_cache), "stored_verdicts_reset": reset}
 
 @app.post("/article-summary")
 def get_article_summary(request: dict):
@@ -699,11 +1364,13 @@ Use the above search results to write your summary and citations. If the search
         
         config = types.GenerateContentConfig(temperature=0.2)
         
-        response = gemini_client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=enhanced_prompt,
-            config=config
-        )
+        with stage_timer("gemini_summary"):
+            response = gemini_client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=enhanced_prompt,
+                config=config
+            )
+        record_gemini_usage("summary", response)
 
         # Access response text correctly for new SDK
         if hasattr(response, 'candidates') and response.candidates:
@@ -749,58 +1416,8 @@ Use the above search results to write your summary and citations. If the search
                 "citations": []
             }
 
-        # Validate and verify URLs (with timeout and error handling)
-        valid_citations = []
-        citations = result_data.get("citations", [])
-        
-        if not isinstance(citations, list):
-            citations = []
-        
-        for citation in citations[:10]:  # Limit to 10 citations max
-            if not isinstance(citation, dict):
-                continue
-                
-            url = citation.get("url", "")
-            if not url or not isinstance(url, str):
-                continue
-            
-            # Basic URL validation
-            if not url.startswith(("http://", "https://")):
-                continue
-            
-            try:
-                # Quick HEAD request with short timeout
-                url_check = requests.head(
-                    url, 
-                    timeout=3,  # Reduced timeout
-                    allow_redirects=True,
-                    headers={'User-Agent': 'Mozilla/5.0'}  # Some sites require user agent
-                )
-                
-                if url_check.status_code in [200, 301, 302, 307, 308]:
-                    valid_citations.append({
-                        "source_name": str(citation.get("source_name", "Unknown"))[:100],
-                        "title": str(citation.get("title", ""))[:200],
-                        "url": url
-                    })
-                    
-                    # Stop after 5 valid citations
-                    if len(valid_citations) >= 5:
-                        break
-                        
-            except requests.exceptions.Timeout:
-                print(f"Citation URL timeout: {url[:50]}")
-                # Add citation anyway if timeout (might be slow server)
-                valid_citations.append({
-                    "source_name": str(citation.get("source_name", "Unknown"))[:100],
-                    "title": str(citation.get("title", ""))[:200],
-                    "url": url
-                })
-                if len(valid_citations) >= 5:
-                    break
-            except Exception as url_err:
-                print(f"Citation URL check failed: {url_err}")
-                continue
+        # Validate and verify URLs concurrently (cached per URL, overall deadline)
+        valid_citations = citation_validator.validate(result_data.get("citations", []))
 
         # Ensure we have valid data
         summary = result_data.get("summary", "")
@@ -830,16 +1447,136 @@ Use the above search results to write your summary and citations. If the search
         }
 
 
+def graph_article_id(url: str, topic: str) -> str:
+    """Article ID a graph is stored under (same as the /news article id when a URL is given)"""
+    return make_id(url) if url else make_id(f"topic:{topic}")
+
+def build_graph_view(topic: str, entities: List[dict], relations: List[dict]):
+    """Visualization nodes/edges: main topic node, up to 15 entity nodes and their relations"""
+    nodes = []
+    edges = []
+    
+    # Add main topic node
+    main_label = topic.split('.')[0][:40]
+    nodes.append({
+        "id": "main",
+        "label": main_label,
+        "type": "main"
+    })
+    
+    # Add entity nodes
+    entity_map = {"main": "main"}
+    for i, entity in enumerate(entities[:15]):  # Limit to 15 for clarity
+        entity_id = f"node_{i+1}"
+        entity_name = entity.get("name", "")
+        entity_map[entity_name] = entity_id
+        
+        nodes.append({
+            "id": entity_id,
+            "label": entity_name[:25],
+            "type": entity.get("type", "OTHER"),
+            "context": entity.get("context", "")
+        })
+        
+        # Connect to main topic
+        edges.append({
+            "source": "main",
+            "target": entity_id,
+            "label": "mentions"
+        })
+    
+    # Add relationship edges
+    for relation in relations:
+        source = relation.get("source", "")
+        target = relation.get("target", "")
+        source_id = entity_map.get(source)
+        target_id = entity_map.get(target)
+        
+        if source_id and target_id and source_id != target_id and source_id != "main" and target_id != "main":
+            edges.append({
+                "source": source_id,
+                "target": target_id,
+                "label": relation.get("relationship", "related")[:15]
+            })
+    
+    return main_label, nodes, edges
+
+def graph_response(topic: str, article_id: str, extraction_data: dict, stored: bool, include_extraction_data: bool) -> dict:
+    """
+    /knowledge-graph response: the visualization and a graph_id for /node-details,
+    /chat and /detect-fake; the full extraction_data only when the client asks for it
+    """
+    main_label, nodes, edges = build_graph_view(topic, extraction_data["entities"], extraction_data["relations"])
+    response = {
+        "topic": main_label,
+        "nodes": nodes,
+        "edges": edges,
+        "article_id": article_id,
+        "stored": stored,
+        "graph_id": graph_store.put(extraction_data),
+        "entity_count": len(extraction_data["entities"]),
+        "relation_count": len(extraction_data["relations"])
+    }
+    if include_extraction_data:
+        response["extraction_data"] = extraction_data
+    return response
+
+# time.monotonic() before which stored graph reads are skipped (Neo4j failing)
+neo4j_read_retry_at = 0.0
+
+def load_stored_graph(article_id: str) -> Optional[dict]:
+    """
+    Extraction data previously persisted to Neo4j for this article, or None
+    
+    None as well when the stored graph is older than NEO4J_GRAPH_MAX_AGE (it
+    is regenerated and rewritten), or when Neo4j failed recently.
+    """
+    global neo4j_read_retry_at
+    if neo4j_service is None or time.monotonic() < neo4j_read_retry_at:
+        return None
+    try:
+        with stage_timer("neo4j_read"):
+            stored = neo4j_service.get_article_extraction(article_id, timeout=NEO4J_READ_TIMEOUT)
+    except Exception as e:
+        neo4j_read_retry_at = time.monotonic() + NEO4J_READ_BACKOFF_SECONDS
+        print(f"⚠️ Neo4j read failed for {article_id}, skipping reads for {NEO4J_READ_BACKOFF_SECONDS:.0f}s: {str(e)[:100]}")
+        return None
+    if not stored or not stored["entities"]:
+        return None
+    if NEO4J_GRAPH_MAX_AGE and (stored["processed_at"] is None or time.time() - stored["processed_at"] > NEO4J_GRAPH_MAX_AGE):
+        return None
+    return {
+        "entities": stored["entities"],
+        "relations": stored["relations"],
+        "rss_articles": stored["rss_articles"],
+        "wikipedia_data": stored["wikipedia_data"]
+    }
+
 @app.post("/knowledge-graph")
 def get_knowledge_graph(request: dict):
-    """Generate enriched knowledge graph with RSS and Wikipedia data (NO Neo4j storage)"""
+    """
+    Generate enriched knowledge graph with RSS and Wikipedia data
+    
+    Graphs already persisted to Neo4j for this article are served from there;
+    new ones are queued for persistence without delaying the response. The
+    full extraction_data is only returned with "include_extraction_data": true
+    (clients re-request it when a graph_id has expired).
+    """
     topic = request.get("topic", "")
     description = request.get("description", "")
     url = request.get("url", "")
+    include_extraction_data = bool(request.get("include_extraction_data"))
     
     if not topic:
         raise HTTPException(status_code=400, detail="Topic is required")
     
+    # Derived here, never taken from the client: it names the shared Neo4j record
+    article_id = graph_article_id(url, topic)
+    stored = load_stored_graph(article_id)
+    if stored is not None:
+        print(f"\n📦 Serving stored knowledge graph {article_id} for: {topic[:60]}")
+        return graph_response(topic, article_id, stored, True, include_extraction_data)
+    
     if not entity_extractor:
         raise HTTPException(status_code=503, detail="Knowledge Graph service not available. Please configure GEMINI_API_KEY in .env")
     
@@ -855,6 +1592,12 @@ def get_knowledge_graph(request: dict):
         
         print(f"   ✅ Extracted {len(base_entities)} base entities, {len(base_relations)} relations")
         
+        # Merge surface forms of the same entity so it is enriched (and cached) once, by canonical name
+        if entity_resolver:
+            with stage_timer("entity_resolution"):
+                base_entities, base_relations = entity_resolver.resolve_graph(base_entities, base_relations)
+            print(f"   🔗 Resolved to {len(base_entities)} canonical entities")
+        
         # Step 2: Enrich with RSS and Wikipedia (Guided by AI context)
         enriched_entities = list(base_entities)  
         enriched_relations = list(base_relations)
@@ -865,124 +1608,29 @@ def get_knowledge_graph(request: dict):
         relevance_ctx = extraction_result.get("relevance_context", {})
         ai_keywords = relevance_ctx.get("keywords", [])
         
-        if rss_fetcher and wikipedia_service and relevance_filter:
+        if enrichment_pipeline:
             top_entities = [e for e in base_entities if e.get("type") in ["PERSON", "ORGANIZATION", "LOCATION"]][:3]
+            entity_names = [e.get("name", "") for e in top_entities if e.get("name")]
             
-            for entity in top_entities:
-                entity_name = entity.get("name", "")
-                if not entity_name: continue
-                
-                print(f"   🔎 AI-Guided enrichment for: {entity_name}")
-                
-                # Smart RSS Filtering (Code-based using AI keywords)
-                try:
-                    raw_rss = rss_fetcher.fetch_news_by_query(entity_name, max_results=10)
-                    rss_titles = [r.get("title", "") for r in raw_rss]
-                    
-                    filter_res = relevance_filter.batch_filter_enrichment(
-                        article_context={"title": topic, "summary": description},
-                        entity_name=entity_name,
-                        rss_articles=rss_titles,
-                        wikipedia_entities=[],
-                        ai_keywords=ai_keywords
-                    )
-                    
-                    relevant_titles = filter_res.get("relevant_rss", [])
-                    for title in relevant_titles:
-                        # Match back to original RSS object for the link
-                        orig = next((r for r in raw_rss if r.get("title") == title), {})
-                        rss_articles_data.append({
-                            "entity": entity_name,
-                            "title": title,
-                            "link": orig.get("link", "")
-                        })
-                    print(f"      📰 Integrated {len(relevant_titles)} relevant RSS articles")
-                except Exception as e:
-                    print(f"      ⚠️ RSS error: {e}")
-                
-                # Smart Wikipedia Filtering
-                try:
-                    wiki_info = wikipedia_service.get_enriched_entity_info(entity_name)
-                    if wiki_info.get("exists"):
-                        wiki_data[entity_name] = {
-                            "summary": wiki_info.get("summary", "")[:300],
-                            "url": wiki_info.get("url", "")
-                        }
-                        
-                        raw_wiki_ents = [w["name"] for w in wiki_info.get("related_entities", [])]
-                        filter_res = relevance_filter.batch_filter_enrichment(
-                            article_context={"title": topic, "summary": description},
-                            entity_name=entity_name,
-                            rss_articles=[],
-                            wikipedia_entities=raw_wiki_ents,
-                            max_wiki_results=3,
-                            ai_keywords=ai_keywords
-                        )
-                        
-                        for wiki_ent_name in filter_res.get("relevant_wikipedia", []):
-                            enriched_entities.append({
-                                "name": wiki_ent_name,
-                                "type": "OTHER",
-                                "context": f"AI-validated relation to {entity_name}"
-                            })
-                            enriched_relations.append({
-                                "source": entity_name,
-                                "target": wiki_ent_name,
-                                "relationship": "related_to",
-                                "context": "Semantic Match"
-                            })
-                        print(f"      📖 Integrated {len(filter_res.get('relevant_wikipedia', []))} relevant Wiki connections")
-                except Exception as e:
-                    print(f"      ⚠️ Wiki error: {e}")
-        
-        print(f"   ✅ Final: {len(enriched_entities)} entities, {len(enriched_relations)} relations")
-        
-        # Step 3: Build visualization graph
-        nodes = []
-        edges = []
-        
-        # Add main topic node
-        main_label = topic.split('.')[0][:40]
-        nodes.append({
-            "id": "main",
-            "label": main_label,
-            "type": "main"
-        })
-        
-        # Add entity nodes
-        entity_map = {"main": "main"}
-        for i, entity in enumerate(enriched_entities[:15]):  # Limit to 15 for clarity
-            entity_id = f"node_{i+1}"
-            entity_name = entity.get("name", "")
-            entity_map[entity_name] = entity_id
+            print(f"   🔎 AI-Guided enrichment for: {', '.join(entity_names)}")
             
-            nodes.append({
-                "id": entity_id,
-                "label": entity_name[:25],
-                "type": entity.get("type", "OTHER"),
-                "context": entity.get("context", "")
-            })
+            # RSS + Wikipedia for every entity run concurrently under one deadline
+            enrichment = enrichment_pipeline.enrich(
+                article_context={"title": topic, "summary": description},
+                entity_names=entity_names,
+                ai_keywords=ai_keywords
+            )
             
-            # Connect to main topic
-            edges.append({
-                "source": "main",
-                "target": entity_id,
-                "label": "mentions"
-            })
-        
-        # Add relationship edges
-        for relation in enriched_relations:
-            source = relation.get("source", "")
-            target = relation.get("target", "")
-            source_id = entity_map.get(source)
-            target_id = entity_map.get(target)
+            enriched_entities.extend(enrichment["entities"])
+            enriched_relations.extend(enrichment["relations"])
+            rss_articles_data = enrichment["rss_articles"]
+            wiki_data = enrichment["wikipedia_data"]
             
-            if source_id and target_id and source_id != target_id and source_id != "main" and target_id != "main":
-                edges.append({
-                    "source": source_id,
-                    "target": target_id,
-                    "label": relation.get("relationship", "related")[:15]
-                })
+            # Wikipedia-linked entities may name something the article already mentions
+            if entity_resolver and enrichment["entities"]:
+                enriched_entities, enriched_relations = entity_resolver.resolve_graph(enriched_entities, enriched_relations)
+        
+        print(f"   ✅ Final: {len(enriched_entities)} entities, {len(enriched_relations)} relations")
         
         # Format complete extraction result for chatbot
         complete_extraction = {
@@ -992,12 +1640,12 @@ def get_knowledge_graph(request: dict):
             "wikipedia_data": wiki_data
         }
         
-        return {
-            "topic": main_label,
-            "nodes": nodes,
-            "edges": edges,
-            "extraction_data": complete_extraction  # Full data for chatbot
-        }
+        # Persist in the background (next request for this article is one Neo4j read)
+        if graph_writer and enriched_entities:
+            graph_writer.enqueue(article_id, complete_extraction, topic, url)
+        
+        # Step 3: Visualization graph + graph_id
+        return graph_response(topic, article_id, complete_extraction, False, include_extraction_data)
     
     except Exception as e:
         print(f"Error generating knowledge graph: {str(e)}")
@@ -1006,12 +1654,37 @@ def get_knowledge_graph(request: dict):
         raise HTTPException(status_code=500, detail=f"Failed to generate knowledge graph: {str(e)}")
 
 
+def resolve_graph_session(request: dict) -> Optional[KnowledgeGraphSession]:
+    """
+    Knowledge graph for a /node-details or /chat request
+    
+    Uses the stored graph for `graph_id`; falls back to indexing an uploaded
+    `extraction_data` blob (older clients, or a graph that has expired).
+    Returns None if the request carries neither.
+    """
+    graph_id = request.get("graph_id")
+    extraction_data = request.get("extraction_data")
+    if graph_id:
+        session = graph_store.get(graph_id)
+        if session is not None:
+            return session
+        if not extraction_data:
+            raise HTTPException(status_code=404, detail="Knowledge graph expired or unknown; regenerate it or send extraction_data")
+    if extraction_data:
+        return KnowledgeGraphSession(extraction_data)
+    return None
+
 @app.post("/node-details")
 def get_node_details(request: dict):
     """
     Return details for a node in the knowledge graph.
 
     Expected request example:
+    {
+        "node_label": "Fundera Network",
+        "graph_id": "<graph_id from /knowledge-graph>"
+    }
+    or, without a stored graph:
     {
         "node_label": "Fundera Network",
         "extraction_data": {
@@ -1023,36 +1696,15 @@ def get_node_details(request: dict):
     }
     """
     node_label = request.get("node_label", "")
-    extraction_data = request.get("extraction_data", {})
 
     if not node_label:
         raise HTTPException(status_code=400, detail="node_label is required")
 
-    entities = extraction_data.get("entities", [])
-    relations = extraction_data.get("relations", [])
-    rss_articles = extraction_data.get("rss_articles", [])
-    wikipedia_data = extraction_data.get("wikipedia_data", {})
-
-    # Find matching entity (simple name match)
-    entity_info = next(
-        (e for e in entities if e.get("name") == node_label),
-        None
-    )
-
-    # Relations where this node is involved
-    related_relations = [
-        r for r in relations
-        if r.get("source") == node_label or r.get("target") == node_label
-    ]
-
-    # RSS articles related to this node
-    related_rss = [
-        r for r in rss_articles
-        if r.get("entity") == node_label
-    ]
+    graph = resolve_graph_session(request) or KnowledgeGraphSession({})
 
-    # Wikipedia info (if available)
-    wiki_info = wikipedia_data.get(node_label, {})
+    # Entity, relations it is part of, RSS articles and Wikipedia info (indexed lookups)
+    node_label = graph.canonical_name(node_label)
+    entity_info, related_relations, related_rss, wiki_info = graph.node(node_label)
 
     if not entity_info and not related_relations and not related_rss and not wiki_info:
         # Still return a basic object instead of 404 so UI can handle it
@@ -1101,6 +1753,7 @@ def get_node_details(request: dict):
     return {
         "name": entity_info.get("name", node_label) if entity_info else node_label,
         "type": entity_info.get("type", "UNKNOWN") if entity_info else "UNKNOWN",
+        "aliases": (entity_info.get("aliases") or []) if entity_info else [],
         "context": entity_info.get("context", "") if entity_info else "",
         "description": entity_info.get("context", f"Entity: {node_label}") if entity_info else f"Entity: {node_label}",
         "relations": related_relations,
@@ -1117,6 +1770,26 @@ def get_node_details(request: dict):
     }
 
 
+def add_prediction_analysis(result: dict) -> dict:
+    """Add descriptive analysis if not present"""
+    if not result.get("analysis"):
+        conf = result.get("confidence", 0) * 100
+        pred = result.get("prediction", "REAL")
+        if pred == "REAL":
+            result["analysis"] = f"The neural model indicates {conf:.1f}% confidence in this article's authenticity. This result is derived from matching the image features with the extracted knowledge graph entities and their verified relationships."
+        else:
+            result["analysis"] = f"Caution: The model has flagged this content as potentially manipulated with {conf:.1f}% confidence. Relational inconsistencies were detected between the visual context and the reported entities."
+    return result
+
+def require_model():
+    """Return the loaded detector, or a 503 (starting a lazy load if needed) while it isn't ready"""
+    try:
+        return get_model()
+    except ModelNotReadyError as e:
+        if e.state == "not_loaded" and start_model_loading(MODEL_PATH, warm_up=MODEL_WARMUP, workers=INFERENCE_WORKERS):
+            raise HTTPException(status_code=503, detail="Model is loading, please retry shortly.")
+        raise HTTPException(status_code=503, detail=str(e))
+
 # ============ D. ADD DETECT-FAKE ENDPOINT ============
 @app.post("/detect-fake")
 def detect_fake_news(request: dict):
@@ -1129,6 +1802,8 @@ def detect_fake_news(request: dict):
         "entities": [{"name": "...", "type": "...", "context": "..."}],
         "relations": [{"source": "...", "target": "...", "relationship": "...", "context": "..."}]
     }
+    or, for a graph from /knowledge-graph, "graph_id" (or "extraction_data")
+    instead of entities/relations.
     
     Response:
     {
@@ -1147,6 +1822,11 @@ def detect_fake_news(request: dict):
     if not image_url:
         raise HTTPException(status_code=400, detail="image_url is required")
     
+    if not entities and not relations:
+        graph = resolve_graph_session(request)
+        if graph is not None:
+            entities, relations = graph.entities, graph.relations
+    
     if not entities or not relations:
         raise HTTPException(
             status_code=400, 
@@ -1162,20 +1842,15 @@ def detect_fake_news(request: dict):
         print(f"Relations: {len(relations)}")
         
         # Get model prediction
-        model = get_model()
+        model = require_model()
         result = model.predict(image_url, entities, relations)
         
-        # Add descriptive analysis if not present
-        if not result.get("analysis"):
-            conf = result.get("confidence", 0) * 100
-            pred = result.get("prediction", "REAL")
-            if pred == "REAL":
-                result["analysis"] = f"The neural model indicates {conf:.1f}% confidence in this article's authenticity. This result is derived from matching the image features with the extracted knowledge graph entities and their verified relationships."
-            else:
-                result["analysis"] = f"Caution: The model has flagged this content as potentially manipulated with {conf:.1f}% confidence. Relational inconsistencies were detected between the visual context and the reported entities."
-        
-        return result
+        return add_prediction_analysis(result)
     
+    except HTTPException:
+        raise
+    except InferenceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         print(f"❌ Detection error: {str(e)}")
         import traceback
@@ -1183,37 +1858,134 @@ def detect_fake_news(request: dict):
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)[:200]}")
 
 
+@app.post("/detect-fake-batch")
+def detect_fake_news_batch(request: dict):
+    """
+    Score many articles in one call (e.g. pre-scoring a feed page in the background)
+    
+    Request:
+    {
+        "items": [
+            {"id": "optional client id", "image_url": "https://...", "entities": [...], "relations": [...]}
+        ]
+    }
+    
+    Response:
+    {
+        "results": [{"id": ..., "prediction": ..., "confidence": ..., "timing": {...}} or {"id": ..., "error": "..."}],
+        "timing": {"embedding_ms": ..., "predict_ms": ..., "total_ms": ...}
+    }
+    """
+    items = request.get("items", [])
+    
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="items is required")
+    
+    if len(items) > DETECT_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {DETECT_BATCH_MAX_ITEMS} items per batch")
+    
+    # Reject malformed items individually instead of failing the whole batch
+    results = [None] * len(items)
+    valid_indices = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("image_url"):
+            results[i] = {"error": "image_url is required"}
+        elif not item.get("entities") or not item.get("relations"):
+            results[i] = {"error": "entities and relations required. Generate Knowledge Graph first."}
+        else:
+            valid_indices.append(i)
+    
+    timing = {"embedding_ms": 0.0, "predict_ms": 0.0, "total_ms": 0.0}
+    
+    try:
+        if valid_indices:
+            model = require_model()
+            batch = model.predict_batch([items[i] for i in valid_indices])
+            timing = batch["timing"]
+            for i, result in zip(valid_indices, batch["results"]):
+                results[i] = result if "error" in result else add_prediction_analysis(result)
+    
+    except HTTPException:
+        raise
+    except InferenceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print(f"❌ Batch detection error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Batch detection failed: {str(e)[:200]}")
+    
+    for i, item in enumerate(items):
+        if isinstance(item, dict) and "id" in item:
+            results[i] = {"id": item["id"], **results[i]}
+    
+    return {"results": results, "timing": timing}
+
+
 # ============ F. ADD MODEL STATUS ENDPOINT ============
 @app.get("/model-status")
 def get_model_status():
-    """Check if model is loaded and ready"""
-    try:
-        model = get_model()
-        return {
-            "status": "ready",
-            "model_type": "Keras (TensorFlow)",
-            "image_model": "CLIP (openai/clip-vit-base-patch32)",
-            "graph_model": "Node2Vec",
-            "embedding_dim": 512,
-            "model_loaded": True
-        }
-    except Exception as e:
-        return {
-            "status": "not_loaded",
-            "error": str(e),
-            "model_loaded": False
-        }
+    """Report model loading state: not_loaded / missing / loading / warming / ready / failed"""
+    state = get_model_state()
+    if state["status"] != "ready":
+        return state
+    
+    model = get_model()
+    return {
+        **state,
+        "model_type": "Keras (TensorFlow)",
+        "image_model": "CLIP (openai/clip-vit-base-patch32)",
+        "graph_model": model.graph_embedder.name,
+        "embedding_dim": 512,
+        "inference": model.get_stats()
+    }
 
 
+def build_chat_context(graph: KnowledgeGraphSession) -> str:
+    """Knowledge graph section of the chat prompt (built once per stored graph)"""
+    context = ""
+    
+    if graph.entities:
+        context += "Entities extracted from the article:\n"
+        for entity in graph.entities[:25]:  # Limit to 25
+            context += f"- {entity['name']} ({entity.get('type', 'OTHER')})"
+            if entity.get('context'):
+                context += f": {entity['context']}"
+            context += "\n"
+        context += "\n"
+    
+    if graph.relations:
+        context += "Relationships identified:\n"
+        for rel in graph.relations[:20]:  # Limit to 20
+            context += f"- {rel.get('source', '')} → {rel.get('relationship', 'related')} → {rel.get('target', '')}"
+            if rel.get('context'):
+                context += f" ({rel['context']})"
+            context += "\n"
+        context += "\n"
+    
+    if graph.rss_articles:
+        context += "Related news articles found:\n"
+        for rss in graph.rss_articles[:10]:
+            context += f"- {rss.get('title', '')} (about {rss.get('entity', '')})\n"
+        context += "\n"
+    
+    if graph.wikipedia_data:
+        context += "Wikipedia information:\n"
+        for entity_name, wiki_info in list(graph.wikipedia_data.items())[:5]:
+            context += f"- {entity_name}: {wiki_info.get('summary', '')[:150]}...\n"
+        context += "\n"
+    
+    return context
+
 @app.post("/chat")
 def chat_with_article(request: dict):
-    """Chat with an article using its in-memory knowledge graph data"""
-    extraction_data = request.get("extraction_data", {})
+    """Chat with an article using its stored knowledge graph (graph_id) or uploaded extraction_data"""
     question = request.get("question", "")
     article_title = request.get("article_title", "")
     
-    if not extraction_data:
-        raise HTTPException(status_code=400, detail="extraction_data is required")
+    graph = resolve_graph_session(request)
+    if graph is None:
+        raise HTTPException(status_code=400, detail="graph_id or extraction_data is required")
     
     if not question:
         raise HTTPException(status_code=400, detail="question is required")
@@ -1223,42 +1995,7 @@ def chat_with_article(request: dict):
     
     try:
         # Build context from knowledge graph data
-        context = f"Article: {article_title}\n\n"
-        
-        entities = extraction_data.get('entities', [])
-        relations = extraction_data.get('relations', [])
-        rss_articles = extraction_data.get('rss_articles', [])
-        wikipedia_data = extraction_data.get('wikipedia_data', {})
-        
-        if entities:
-            context += "Entities extracted from the article:\n"
-            for entity in entities[:25]:  # Limit to 25
-                context += f"- {entity['name']} ({entity.get('type', 'OTHER')})"
-                if entity.get('context'):
-                    context += f": {entity['context']}"
-                context += "\n"
-            context += "\n"
-        
-        if relations:
-            context += "Relationships identified:\n"
-            for rel in relations[:20]:  # Limit to 20
-                context += f"- {rel.get('source', '')} → {rel.get('relationship', 'related')} → {rel.get('target', '')}"
-                if rel.get('context'):
-                    context += f" ({rel['context']})"
-                context += "\n"
-            context += "\n"
-        
-        if rss_articles:
-            context += "Related news articles found:\n"
-            for rss in rss_articles[:10]:
-                context += f"- {rss.get('title', '')} (about {rss.get('entity', '')})\n"
-            context += "\n"
-        
-        if wikipedia_data:
-            context += "Wikipedia information:\n"
-            for entity_name, wiki_info in list(wikipedia_data.items())[:5]:
-                context += f"- {entity_name}: {wiki_info.get('summary', '')[:150]}...\n"
-            context += "\n"
+        context = f"Article: {article_title}\n\n" + graph.cached("chat_context", build_chat_context)
         
         # Create prompt for Gemini
         prompt = f"""You are an AI assistant for analyzing news articles using enriched knowledge graph data.
@@ -1280,10 +2017,12 @@ USER QUESTION: {question}
 Please provide a clear, concise answer based on the knowledge graph above."""
         
         # Get response from Gemini
-        response = gemini_client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt
-        )
+        with stage_timer("gemini_chat"):
+            response = gemini_client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt
+            )
+        record_gemini_usage("chat", response)
         
         # Access response text correctly for new SDK
         answer = response.candidates[0].content.parts[0].text if hasattr(response, 'candidates') else (response.text if hasattr(response, 'text') else str(response))
@@ -1303,8 +2042,21 @@ Please provide a clear, concise answer based on the knowledge graph above."""
 
 
 @app.get("/articles")
-def get_all_articles():
-    """Get all articles stored in Neo4j"""
-    # Note: This endpoint references neo4j_service which is not initialized in your code
-    # You may want to remove this or add the neo4j_service initialization
-    raise HTTPException(status_code=501, detail="Neo4j integration not implemented")
+def get_all_articles(page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=100)):
+    """Articles whose knowledge graphs are stored in Neo4j, newest first"""
+    if neo4j_service is None:
+        raise HTTPException(status_code=503, detail="Neo4j not configured. Set NEO4J_PASSWORD (and NEO4J_URI) in .env")
+    
+    try:
+        with stage_timer("neo4j_read"):
+            result = neo4j_service.get_articles_page(page, page_size)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Neo4j query failed: {str(e)[:200]}")
+    
+    return {
+        "articles": result["articles"],
+        "page": page,
+        "page_size": page_size,
+        "total": result["total"],
+        "has_more": page * page_size < result["total"]
+    }
@@ -0,0 +1,121 @@
+"""
+Benchmark graph embedding engines: latency and downstream model agreement.
+
+Usage (from backend/):
+    python benchmarks/bench_graph_embedding.py --graphs 30
+    python benchmarks/bench_graph_embedding.py --model ./models/model_2_attention.h5
+    python benchmarks/bench_graph_embedding.py --samples graphs.json --model ./models/model_2_attention.h5
+
+`--samples` takes a JSON list of {"entities": [...], "relations": [...]}
+objects (e.g. saved /knowledge-graph extraction_data). Without it, random
+news-sized graphs (~15 nodes) are generated.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.graph_embedding import create_graph_embedder
+
+ENTITY_TYPES = ["PERSON", "ORGANIZATION", "LOCATION", "EVENT", "DATE", "OTHER"]
+
+
+def synthetic_graphs(count, nodes=15, edges=15, seed=7):
+    rng = random.Random(seed)
+    graphs = []
+    for g in range(count):
+        names = [f"Entity {g}-{i}" for i in range(nodes)]
+        entities = [{"name": n, "type": rng.choice(ENTITY_TYPES)} for n in names]
+        relations = []
+        for _ in range(edges):
+            source, target = rng.sample(names, 2)
+            relations.append({"source": source, "target": target, "relationship": "related_to"})
+        graphs.append({"entities": entities, "relations": relations})
+    return graphs
+
+
+def time_embedder(embedder, graphs):
+    vectors = []
+    latencies = []
+    for graph in graphs:
+        start = time.perf_counter()
+        vector = embedder.embed(graph["entities"], graph["relations"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        vectors.append(vector if vector is not None else np.zeros(embedder.dim, dtype=np.float32))
+    return np.stack(vectors), np.array(latencies)
+
+
+def summarize_latency(name, latencies):
+    print(f"{name:<22} mean={latencies.mean():9.2f}ms  p50={np.percentile(latencies, 50):9.2f}ms  "
+          f"p95={np.percentile(latencies, 95):9.2f}ms  max={latencies.max():9.2f}ms")
+
+
+def predict(model, graph_vectors, image_vectors):
+    return model.predict([graph_vectors, image_vectors], verbose=0)[:, 0]
+
+
+def agreement(name, reference, candidate):
+    same_label = np.mean((reference > 0.5) == (candidate > 0.5))
+    print(f"{name:<34} label agreement={same_label:6.1%}  mean |Δp|={np.mean(np.abs(reference - candidate)):.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graphs", type=int, default=20, help="Number of synthetic graphs")
+    parser.add_argument("--samples", help="JSON file with real {entities, relations} graphs")
+    parser.add_argument("--model", help="Keras .h5 model for prediction agreement")
+    parser.add_argument("--skip-node2vec", action="store_true", help="Only time the fast engine")
+    args = parser.parse_args()
+
+    if args.samples:
+        with open(args.samples, encoding="utf-8") as f:
+            graphs = json.load(f)
+    else:
+        graphs = synthetic_graphs(args.graphs)
+    print(f"Benchmarking {len(graphs)} graphs\n")
+
+    fast = create_graph_embedder("fast")
+    fast_vectors, fast_latency = time_embedder(fast, graphs)
+    summarize_latency("fast", fast_latency)
+
+    if args.skip_node2vec:
+        return
+
+    node2vec = create_graph_embedder("node2vec")
+    n2v_vectors, n2v_latency = time_embedder(node2vec, graphs)
+    n2v_vectors_rerun, _ = time_embedder(node2vec, graphs)
+    summarize_latency("node2vec", n2v_latency)
+    print(f"\nspeedup: {n2v_latency.mean() / max(fast_latency.mean(), 1e-6):.0f}x")
+
+    fast_norm = np.linalg.norm(fast_vectors, axis=1).mean()
+    n2v_norm = np.linalg.norm(n2v_vectors, axis=1).mean()
+    print(f"mean vector norm: node2vec={n2v_norm:.4f} fast={fast_norm:.4f} "
+          f"-> suggested GRAPH_EMBEDDING_FAST_SCALE={n2v_norm / max(fast_norm, 1e-9):.4f}")
+
+    if not args.model:
+        return
+
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(args.model)
+    rng = np.random.default_rng(0)
+    image_vectors = rng.normal(size=(len(graphs), 512)).astype(np.float32)
+    image_vectors /= np.linalg.norm(image_vectors, axis=1, keepdims=True)
+
+    reference = predict(model, n2v_vectors, image_vectors)
+    print()
+    # Node2Vec is itself stochastic: its run-to-run agreement is the bar to beat
+    agreement("node2vec vs node2vec (rerun)", reference, predict(model, n2v_vectors_rerun, image_vectors))
+    agreement("fast vs node2vec", reference, predict(model, fast_vectors, image_vectors))
+    scale = n2v_norm / max(fast_norm, 1e-9)
+    agreement(f"fast (scale={scale:.3f}) vs node2vec", reference, predict(model, fast_vectors * scale, image_vectors))
+
+
+if __name__ == "__main__":
+    main()
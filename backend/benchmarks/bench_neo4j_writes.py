@@ -0,0 +1,123 @@
+"""
+Benchmark Neo4j knowledge graph writes: per-item transactions vs UNWIND batches.
+
+Usage (from backend/), against a throwaway local container:
+    docker run -d --name neo4j-bench -p 7687:7687 -e NEO4J_AUTH=neo4j/benchpassword neo4j:5
+    NEO4J_URI=bolt://localhost:7687 NEO4J_PASSWORD=benchpassword python benchmarks/bench_neo4j_writes.py
+    python benchmarks/bench_neo4j_writes.py --articles 200 --entities 15 --relations 15 --batch-sizes 1 10 50
+
+Modes:
+    legacy   one transaction per article, entity and relation (the old create_knowledge_graph)
+    article  create_knowledge_graph: one transaction per article
+    bulk     create_knowledge_graphs: --batch-sizes articles per transaction
+
+Every article written gets a "bench-" ID and is deleted (with its entities)
+after the run, so the benchmark can point at a database with real data.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.neo4j_service import Neo4jService
+
+TYPES = ["PERSON", "ORGANIZATION", "LOCATION", "EVENT", "OTHER"]
+RELATIONSHIPS = ["leads", "located_in", "member_of", "announced", "opposes", "related_to"]
+
+
+def make_extraction(rng, entity_count, relation_count):
+    names = [f"Entity {rng.randrange(10 ** 6)}" for _ in range(entity_count)]
+    return {
+        "entities": [
+            {"name": name, "type": rng.choice(TYPES), "context": f"Context sentence about {name}."}
+            for name in names
+        ],
+        "relations": [
+            {
+                "source": rng.choice(names),
+                "target": rng.choice(names),
+                "relationship": rng.choice(RELATIONSHIPS),
+                "context": "Synthetic relation."
+            }
+            for _ in range(relation_count)
+        ]
+    }
+
+
+def legacy_write(service, payload):
+    """Same statements, one row per transaction, like the pre-UNWIND implementation"""
+    def run(query, **params):
+        return lambda tx: tx.run(query, **params).consume()
+
+    with service.driver.session() as session:
+        session.execute_write(run(service.ARTICLES_QUERY, articles=[payload["article"]]))
+        for row in payload["entities"]:
+            session.execute_write(run(service.ENTITIES_QUERY, entities=[row]))
+        for row in payload["relations"]:
+            session.execute_write(run(service.RELATIONS_QUERY, relations=[row]))
+
+
+def cleanup(service, prefix):
+    with service.driver.session() as session:
+        session.run(
+            "MATCH (n) WHERE (n:Article OR n:Entity) AND n.id STARTS WITH $prefix DETACH DELETE n",
+            prefix=prefix
+        ).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--entities", type=int, default=15, help="Entities per article")
+    parser.add_argument("--relations", type=int, default=15, help="Relations per article")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    items = [
+        {"extraction_result": make_extraction(rng, args.entities, args.relations), "title": f"Article {i}", "url": ""}
+        for i in range(args.articles)
+    ]
+    service = Neo4jService()
+
+    baseline = {}
+
+    def run_mode(label, write):
+        prefix = f"bench-{label}-"
+        for i, item in enumerate(items):
+            item["article_id"] = f"{prefix}{i}"
+        cleanup(service, prefix)
+        start = time.perf_counter()
+        try:
+            write()
+            elapsed = time.perf_counter() - start
+        finally:
+            cleanup(service, prefix)
+        baseline.setdefault("elapsed", elapsed)
+        print(f"{label:>12} | {elapsed * 1000:>10.1f} | {elapsed * 1000 / args.articles:>10.2f} | "
+              f"{args.articles / elapsed:>10.1f} | {baseline['elapsed'] / elapsed:>6.1f}x")
+
+    print(f"{args.articles} articles x ({args.entities} entities + {args.relations} relations) at {service.uri}\n")
+    print(f"{'mode':>12} | {'total ms':>10} | {'ms/article':>10} | {'articles/s':>10} | {'speedup':>7}")
+    print("-" * 63)
+    try:
+        run_mode("legacy", lambda: [
+            legacy_write(service, service._article_rows(item["article_id"], item["title"], item["url"], item["extraction_result"]))
+            for item in items
+        ])
+        run_mode("article", lambda: [
+            service.create_knowledge_graph(item["extraction_result"], item["title"], item["url"], item["article_id"])
+            for item in items
+        ])
+        for batch_size in args.batch_sizes:
+            run_mode(f"bulk x{batch_size}", lambda: service.create_knowledge_graphs(items, batch_size=batch_size))
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark RelevanceFilter.batch_filter_enrichment against the old per-keyword loop.
+
+Usage (from backend/):
+    python benchmarks/bench_relevance_filter.py
+    python benchmarks/bench_relevance_filter.py --candidates 100 1000 10000 --keywords 40
+
+Candidates are synthetic headline-like titles. The default "realistic"
+workload mixes a large filler vocabulary with the entity name (in ~60% of
+titles) and an occasional AI keyword (~30%). `--workload dense` builds every
+title from the keyword vocabulary itself, the worst case for the matcher.
+Each size is checked for identical output between the two implementations
+before timing (AI keywords are lowercase, where both weight them the same).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.relevance_filter import RelevanceFilter
+
+WORDS = (
+    "government election minister parliament market shares inflation economy court ruling "
+    "climate summit energy prices company earnings technology startup football league "
+    "president senate tariffs trade exports police investigation hospital vaccine study "
+    "research university storm flooding wildfire border security defense talks agreement"
+).split()
+
+
+def legacy_filter(article_context, entity_name, rss_articles, wikipedia_entities, max_wiki_results=5, ai_keywords=None):
+    """The pre-matcher implementation: keywords x candidates substring loop"""
+    if ai_keywords:
+        keywords = {k.lower() for k in ai_keywords}
+    else:
+        context_text = f"{article_context.get('title', '').lower()} {article_context.get('summary', '').lower()}"
+        keywords = {word.lower() for word in context_text.split() if len(word) > 4}
+    for word in entity_name.lower().split():
+        if len(word) > 3:
+            keywords.add(word)
+
+    relevant_rss = []
+    for rss_title in rss_articles:
+        rss_lower = rss_title.lower()
+        score = sum(2 if (ai_keywords and k in ai_keywords) else 1 for k in keywords if k in rss_lower)
+        if score > 0:
+            relevant_rss.append((rss_title, score))
+    relevant_rss.sort(key=lambda x: x[1], reverse=True)
+
+    relevant_wikipedia = []
+    for wiki_entity in wikipedia_entities:
+        wiki_lower = wiki_entity.lower()
+        score = sum(1 for keyword in keywords if keyword in wiki_lower)
+        if score > 0:
+            relevant_wikipedia.append((wiki_entity, score))
+    relevant_wikipedia.sort(key=lambda x: x[1], reverse=True)
+
+    return {
+        'relevant_rss': [t for t, _ in relevant_rss[:5]],
+        'relevant_wikipedia': [e for e, _ in relevant_wikipedia[:max_wiki_results]]
+    }
+
+
+def dense_titles(count, rng, ai_keywords):
+    return [" ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(6, 12))) for _ in range(count)]
+
+
+def realistic_titles(count, rng, ai_keywords):
+    filler = [
+        "".join(rng.choice("bcdfghjklmnprstvwz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+        for _ in range(3000)
+    ]
+    titles = []
+    for _ in range(count):
+        words = [rng.choice(filler) for _ in range(rng.randint(6, 11))]
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(len(words)), "Senate")
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(ai_keywords))
+        titles.append(" ".join(w.capitalize() for w in words))
+    return titles
+
+
+WORKLOADS = {"realistic": realistic_titles, "dense": dense_titles}
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 100, 1000, 5000, 20000])
+    parser.add_argument("--keywords", type=int, default=25, help="AI keywords per article")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="realistic")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ai_keywords = rng.sample(WORDS, min(args.keywords, len(WORDS)))
+    context = {"title": "Senate passes tariffs agreement", "summary": "Lawmakers debated trade and exports."}
+    entity = "United States Senate"
+    relevance_filter = RelevanceFilter()
+
+    make_titles = WORKLOADS[args.workload]
+    print(f"{args.workload} workload, {len(ai_keywords)} AI keywords, "
+          f"RSS + Wikipedia candidates each, best of {args.repeats} runs\n")
+    print(f"{'candidates':>10} | {'legacy ms':>10} | {'matcher ms':>10} | {'speedup':>7}")
+    print("-" * 48)
+    for count in args.candidates:
+        rss = make_titles(count, rng, ai_keywords)
+        wiki = make_titles(count, rng, ai_keywords)
+
+        def run_legacy():
+            return legacy_filter(context, entity, rss, wiki, 3, ai_keywords)
+
+        def run_matcher():
+            return relevance_filter.batch_filter_enrichment(context, entity, rss, wiki, 3, ai_keywords)
+
+        expected, actual = run_legacy(), run_matcher()
+        if (expected["relevant_rss"], expected["relevant_wikipedia"]) != (actual["relevant_rss"], actual["relevant_wikipedia"]):
+            print(f"❌ Results differ at {count} candidates")
+            sys.exit(1)
+
+        legacy_ms = timed(run_legacy, args.repeats)
+        matcher_ms = timed(run_matcher, args.repeats)
+        print(f"{count:>10} | {legacy_ms:>10.2f} | {matcher_ms:>10.2f} | {legacy_ms / matcher_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+# backend/fake_news_detector.py
+# Heavy ML imports live here; model_handler imports this module lazily.
+
+import tensorflow as tf
+import numpy as np
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from io import BytesIO
+import torch
+from transformers import CLIPProcessor, CLIPModel
+from typing import Dict, List
+from services.http_client import get_http_client
+from services.embedding_store import EmbeddingStore
+from services.micro_batcher import MicroBatcher
+from services.graph_embedding import create_graph_embedder
+from services.latency import LatencyWindow
+from services.metrics import STAGE_SECONDS, STAGES_IN_FLIGHT, stage_timer
+
+
+# Hashes with fewer set (or unset) bits than this come from flat or low-detail images
+# (placeholders, solid banners) that would all collide on a handful of values
+DHASH_MIN_BITS = 8
+
+
+def _dhash(image: Image.Image, hash_size: int = 8):
+    """
+    Difference hash: 64-bit perceptual fingerprint that survives resizing/re-encoding
+
+    Returns:
+        Hex string, or None for a degenerate hash that doesn't identify the image
+    """
+    gray = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = np.asarray(gray, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    set_bits = int(bits.sum())
+    if set_bits < DHASH_MIN_BITS or bits.size - set_bits < DHASH_MIN_BITS:
+        return None
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+
+class FakeNewsDetector:
+    def __init__(self, model_path: str, embedding_store_dir: str = None,
+                 clip_batch_size: int = None, clip_batch_wait_ms: int = None,
+                 graph_embedding_mode: str = None):
+        """
+        Initialize the fake news detection model
+        
+        Args:
+            model_path: Path to your trained Keras model (.h5 file)
+            embedding_store_dir: Directory of the persistent image embedding store
+            clip_batch_size: Max images per CLIP forward pass
+            clip_batch_wait_ms: How long to wait for more images before running a batch
+            graph_embedding_mode: "node2vec" (trained per request) or "fast" (deterministic projection)
+        """
+        print(f"🔄 Loading Keras model from {model_path}...")
+        self.model = tf.keras.models.load_model(model_path)
+        print("✅ Keras model loaded successfully!")
+        
+        # Compiled forward pass: skips Keras predict()'s per-call setup, any batch size
+        embedding_spec = tf.TensorSpec(shape=[None, 512], dtype=tf.float32)
+        self._forward = tf.function(
+            lambda graph, image: self.model([graph, image], training=False),
+            input_signature=[embedding_spec, embedding_spec]
+        )
+        
+        # Initialize CLIP for image embeddings
+        print("🔄 Loading CLIP model...")
+        self.clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
+        self.clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        self.clip_model.eval()
+        
+        # Move CLIP to GPU if available
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.clip_model = self.clip_model.to(self.device)
+        print(f"✅ CLIP model loaded on {self.device}")
+        
+        self.embedding_dim = 512
+        
+        # Persistent image embedding store (memory-mapped vectors + key index)
+        store_dir = embedding_store_dir or os.getenv("EMBEDDING_STORE_DIR", "./cache/embeddings")
+        self.embedding_store = EmbeddingStore(
+            store_dir,
+            dim=self.embedding_dim,
+            max_vectors=int(os.getenv("EMBEDDING_STORE_MAX_VECTORS", "200000"))
+        )
+        self.use_perceptual_hash = os.getenv("IMAGE_EMBED_PHASH", "true").lower() == "true"
+        print(f"✅ Image embedding store ready: {self.embedding_store.stats()}")
+        
+        # Coalesce concurrent image embedding requests into CLIP micro-batches
+        self.image_batcher = MicroBatcher(
+            self._embed_image_batch,
+            max_batch_size=clip_batch_size or int(os.getenv("CLIP_BATCH_SIZE", "16")),
+            max_wait_ms=clip_batch_wait_ms if clip_batch_wait_ms is not None else int(os.getenv("CLIP_BATCH_WAIT_MS", "15")),
+            name="clip"
+        )
+        
+        # Graph embedding engine (Node2Vec by default, "fast" for millisecond latency)
+        mode = graph_embedding_mode or os.getenv("GRAPH_EMBEDDING_MODE", "node2vec")
+        extra = {}
+        if mode == "fast":
+            extra["scale"] = float(os.getenv("GRAPH_EMBEDDING_FAST_SCALE", "1.0"))
+        self.graph_embedder = create_graph_embedder(mode, dim=self.embedding_dim, **extra)
+        print(f"✅ Graph embedding engine: {self.graph_embedder.name}")
+        
+        # Coalesce concurrent detection requests into one batched Keras forward pass
+        self.predict_batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=int(os.getenv("KERAS_BATCH_SIZE", "32")),
+            max_wait_ms=int(os.getenv("KERAS_BATCH_WAIT_MS", "5")),
+            name="keras"
+        )
+        
+        # Concurrent image downloads / graph embeddings for predict_batch
+        self._batch_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("DETECT_BATCH_WORKERS", "8")),
+            thread_name_prefix="detect-batch"
+        )
+        self.stage_latency = {
+            "graph_embedding": LatencyWindow(),
+            "image_embedding": LatencyWindow(),
+            "model_predict": LatencyWindow()
+        }
+    
+    def _embed_image_batch(self, images: List[Image.Image]) -> List[np.ndarray]:
+        """Run CLIP on a list of RGB images in one forward pass (micro-batcher callback)"""
+        with torch.no_grad():
+            inputs = self.clip_processor(images=images, return_tensors="pt").to(self.device)
+            embeddings = self.clip_model.get_image_features(**inputs)
+            # Normalize embeddings
+            embeddings = embeddings / embeddings.norm(p=2, dim=-1, keepdim=True)
+        
+        return list(embeddings.cpu().numpy().astype(np.float32))
+    
+    def get_image_embedding(self, image_url: str) -> np.ndarray:
+        """
+        Get CLIP image embedding (512 dimensions)
+        
+        Looks the image up in the persistent embedding store by URL, then by
+        content hash and perceptual hash, and only runs CLIP (micro-batched
+        with concurrent requests) on a real miss.
+        
+        Args:
+            image_url: URL of the image
+            
+        Returns:
+            numpy array of shape (512,)
+        """
+        try:
+            url_key = f"url:{hashlib.sha1(image_url.encode()).hexdigest()}"
+            cached = self.embedding_store.get(url_key)
+            if cached is not None:
+                print(f"⚡ Image embedding cache hit (url): {image_url[:50]}")
+                return cached
+            
+            print(f"📸 Downloading image from: {image_url[:50]}...")
+            
+            # Download image (pooled keep-alive session)
+            response = get_http_client().get(image_url, timeout=10)
+            response.raise_for_status()
+            
+            content_key = f"sha256:{hashlib.sha256(response.content).hexdigest()}"
+            
+            # Open and convert to RGB
+            image = Image.open(BytesIO(response.content))
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            dhash = _dhash(image) if self.use_perceptual_hash else None
+            phash_key = f"dhash:{dhash}" if dhash else None
+            
+            hit_key, cached = self.embedding_store.get_any([content_key, phash_key])
+            if cached is not None:
+                print(f"⚡ Image embedding cache hit ({hit_key.split(':')[0]}): {image_url[:50]}")
+                self.embedding_store.alias(hit_key, [url_key, content_key, phash_key])
+                return cached
+            
+            print("✅ Image downloaded, generating embedding...")
+            
+            # Get CLIP embeddings (batched with other concurrent requests)
+            embedding = self.image_batcher(image, timeout=60)
+            self.embedding_store.put([url_key, content_key, phash_key], embedding)
+            print(f"✅ Image embedding generated: shape {embedding.shape}")
+            
+            return embedding
+            
+        except Exception as e:
+            print(f"❌ Image embedding error: {str(e)}")
+            # Return zero vector if image fails
+            return np.zeros(self.embedding_dim, dtype=np.float32)
+    
+    def generate_graph_embedding(self, entities: List[Dict], relations: List[Dict]) -> np.ndarray:
+        """
+        Generate graph embedding with the configured engine (512 dimensions)
+        
+        Args:
+            entities: List of entities from knowledge graph
+                [{"name": "...", "type": "...", "context": "..."}]
+            relations: List of relations from knowledge graph
+                [{"source": "...", "target": "...", "relationship": "...", "context": "..."}]
+        
+        Returns:
+            numpy array of shape (512,)
+        """
+        try:
+            print(f"🕸️ Generating graph embedding ({self.graph_embedder.name}) from {len(entities)} entities, {len(relations)} relations...")
+            
+            # If no entities/relations, return zero vector
+            if not entities and not relations:
+                print("⚠️ No entities/relations found, returning zero vector")
+                return np.zeros(self.embedding_dim, dtype=np.float32)
+            
+            # Engine-specific timer (e.g. stage="node2vec"), separate from the graph_embedding total
+            with stage_timer(self.graph_embedder.name):
+                graph_embedding = self.graph_embedder.embed(entities, relations)
+            
+            if graph_embedding is None:
+                print("⚠️ Graph too small or no node embeddings, using simple embedding")
+                return self._simple_embedding(entities, relations)
+            
+            print(f"✅ Graph embedding generated: shape {graph_embedding.shape}")
+            return graph_embedding
+                
+        except Exception as e:
+            print(f"❌ Graph embedding error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return self._simple_embedding(entities, relations)
+    
+    def _simple_embedding(self, entities: List[Dict], relations: List[Dict]) -> np.ndarray:
+        """
+        Fallback simple embedding when Node2Vec fails
+        Creates a basic feature vector from entity/relation counts
+        """
+        print("📝 Using simple embedding fallback")
+        
+        # Count entity types
+        entity_types = {}
+        for entity in entities:
+            etype = entity.get('type', 'UNKNOWN')
+            entity_types[etype] = entity_types.get(etype, 0) + 1
+        
+        # Create feature vector
+        features = [
+            len(entities),
+            len(relations),
+            entity_types.get('PERSON', 0),
+            entity_types.get('ORGANIZATION', 0),
+            entity_types.get('LOCATION', 0),
+            entity_types.get('EVENT', 0),
+            entity_types.get('DATE', 0),
+        ]
+        
+        # Pad to 512 dimensions
+        embedding = np.zeros(self.embedding_dim, dtype=np.float32)
+        embedding[:len(features)] = features
+        
+        return embedding
+    
+    def _predict_batch(self, items: List[tuple]) -> List[float]:
+        """Run one batched forward pass over (graph_embedding, image_embedding) pairs (micro-batcher callback)"""
+        graph_batch = np.stack([graph for graph, _ in items]).astype(np.float32)
+        image_batch = np.stack([image for _, image in items]).astype(np.float32)
+        
+        # Your model expects: [graph_input, image_input]
+        probabilities = self._forward(tf.constant(graph_batch), tf.constant(image_batch)).numpy()
+        
+        # Extract probability (assuming output shape is (n, 1))
+        return [float(p[0]) for p in probabilities]
+    
+    @staticmethod
+    def _format_result(fake_prob: float) -> Dict:
+        real_prob = 1.0 - fake_prob
+        
+        # Threshold at 0.5
+        prediction = "FAKE" if fake_prob > 0.5 else "REAL"
+        confidence = max(fake_prob, real_prob)
+        
+        return {
+            'prediction': prediction,
+            'confidence': round(confidence, 4),
+            'real_probability': round(real_prob, 4),
+            'fake_probability': round(fake_prob, 4),
+            'raw_score': round(fake_prob, 4)
+        }
+    
+    def _record_stage(self, stage: str, seconds: float):
+        self.stage_latency[stage].record(seconds)
+        STAGE_SECONDS.observe(seconds, stage=stage)
+    
+    def _timed(self, stage: str, fn, *args):
+        STAGES_IN_FLIGHT.inc(stage=stage)
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._record_stage(stage, time.perf_counter() - start)
+            STAGES_IN_FLIGHT.dec(stage=stage)
+    
+    def predict(self, image_url: str, entities: List[Dict], relations: List[Dict]) -> Dict:
+        """
+        Make prediction using your trained model
+        
+        Args:
+            image_url: URL of the article image
+            entities: List of entities from knowledge graph
+            relations: List of relations from knowledge graph
+        
+        Returns:
+            {
+                'prediction': 'REAL' or 'FAKE',
+                'confidence': 0.0-1.0,
+                'real_probability': 0.0-1.0,
+                'fake_probability': 0.0-1.0,
+                'raw_score': float (model output before thresholding)
+            }
+        """
+        try:
+            print("\n" + "="*60)
+            print("🔍 STARTING FAKE NEWS DETECTION")
+            print("="*60)
+            
+            # Generate embeddings
+            graph_embedding = self._timed("graph_embedding", self.generate_graph_embedding, entities, relations)
+            image_embedding = self._timed("image_embedding", self.get_image_embedding, image_url)
+            
+            print(f"\n📊 Embedding shapes:")
+            print(f"   Graph: {graph_embedding.shape}")
+            print(f"   Image: {image_embedding.shape}")
+            
+            print(f"\n🤖 Running model prediction...")
+            
+            # Coalesced with concurrent requests into one batched forward pass
+            fake_prob = self._timed("model_predict", self.predict_batcher, (graph_embedding, image_embedding))
+            result = self._format_result(fake_prob)
+            
+            print(f"\n✅ PREDICTION COMPLETE")
+            print(f"   Result: {result['prediction']}")
+            print(f"   Confidence: {result['confidence']:.2%}")
+            print(f"   Real probability: {result['real_probability']:.2%}")
+            print(f"   Fake probability: {result['fake_probability']:.2%}")
+            print("="*60 + "\n")
+            
+            return result
+        
+        except Exception as e:
+            print(f"\n❌ PREDICTION FAILED")
+            print(f"   Error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            raise Exception(f"Prediction failed: {str(e)}")
+    
+    def predict_batch(self, items: List[Dict]) -> Dict:
+        """
+        Score many articles at once
+        
+        Images are downloaded/embedded concurrently (CLIP requests coalesce in the
+        image micro-batcher), graphs are embedded in parallel, and all pairs go
+        through a single batched model forward pass.
+        
+        Args:
+            items: [{"image_url": "...", "entities": [...], "relations": [...]}, ...]
+        
+        Returns:
+            {
+                'results': [prediction dict (see predict) + per-item timing, or {'error': ...}],
+                'timing': {'embedding_ms', 'predict_ms', 'total_ms'}
+            }
+        """
+        start = time.perf_counter()
+        print(f"\n🔍 BATCH DETECTION: {len(items)} items")
+        
+        def embed_image(item):
+            t = time.perf_counter()
+            embedding = self.get_image_embedding(item["image_url"])
+            elapsed = time.perf_counter() - t
+            self._record_stage("image_embedding", elapsed)
+            return embedding, elapsed * 1000
+        
+        def embed_graph(item):
+            t = time.perf_counter()
+            embedding = self.generate_graph_embedding(item.get("entities", []), item.get("relations", []))
+            elapsed = time.perf_counter() - t
+            self._record_stage("graph_embedding", elapsed)
+            return embedding, elapsed * 1000
+        
+        valid = [i for i, item in enumerate(items) if item.get("image_url")]
+        image_futures = {i: self._batch_pool.submit(embed_image, items[i]) for i in valid}
+        graph_futures = {i: self._batch_pool.submit(embed_graph, items[i]) for i in valid}
+        
+        embeddings = {}
+        item_timing = {}
+        errors = {i: "image_url is required" for i in range(len(items)) if i not in image_futures}
+        
+        for i in valid:
+            try:
+                image_embedding, image_ms = image_futures[i].result()
+                graph_embedding, graph_ms = graph_futures[i].result()
+            except Exception as e:
+                errors[i] = f"Embedding failed: {str(e)[:200]}"
+                continue
+            embeddings[i] = (graph_embedding, image_embedding)
+            item_timing[i] = {"image_ms": round(image_ms, 1), "graph_ms": round(graph_ms, 1)}
+        embeddings_done = time.perf_counter()
+        
+        # One batched forward pass for every item that embedded successfully
+        ordered = sorted(embeddings)
+        probabilities = []
+        if ordered:
+            probabilities = self._timed("model_predict", self._predict_batch, [embeddings[i] for i in ordered])
+        predicted = time.perf_counter()
+        
+        results = [None] * len(items)
+        for i, fake_prob in zip(ordered, probabilities):
+            results[i] = {**self._format_result(fake_prob), "timing": item_timing[i]}
+        for i, error in errors.items():
+            results[i] = {"error": error}
+        
+        timing = {
+            "embedding_ms": round((embeddings_done - start) * 1000, 1),
+            "predict_ms": round((predicted - embeddings_done) * 1000, 1),
+            "total_ms": round((predicted - start) * 1000, 1)
+        }
+        print(f"✅ BATCH DETECTION COMPLETE: {len(ordered)}/{len(items)} scored in {timing['total_ms']}ms")
+        
+        return {"results": results, "timing": timing}
+    
+    def get_stats(self) -> Dict:
+        """Inference metrics: per-stage latency, batcher queue/batch stats, embedding store size"""
+        return {
+            "stages": {stage: window.summary() for stage, window in self.stage_latency.items()},
+            "batchers": {
+                "clip": self.image_batcher.stats(),
+                "keras": self.predict_batcher.stats()
+            },
+            "embedding_store": self.embedding_store.stats()
+        }
+    
+    def warm_up(self):
+        """Run one dummy pass through CLIP, the graph embedder and the Keras model to trigger lazy init/tracing"""
+        print("🔥 Warming up models...")
+        start = time.perf_counter()
+        
+        blank = Image.new("RGB", (224, 224), color=(127, 127, 127))
+        image_embedding = self.image_batcher(blank, timeout=120)
+        
+        graph_embedding = self.generate_graph_embedding(
+            [{"name": "warmup_a", "type": "OTHER"}, {"name": "warmup_b", "type": "OTHER"}],
+            [{"source": "warmup_a", "target": "warmup_b", "relationship": "related_to"}]
+        )
+        
+        self.predict_batcher((graph_embedding, image_embedding), timeout=120)
+        print(f"✅ Warm-up done in {time.perf_counter() - start:.2f}s")
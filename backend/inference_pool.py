@@ -0,0 +1,211 @@
+# backend/inference_pool.py
+# Hosts FakeNewsDetector in dedicated worker processes so TensorFlow / CLIP /
+# Node2Vec work never competes with the API threads for the GIL.
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+
+class InferenceOverloadedError(Exception):
+    """Raised when the pool already has its maximum number of pending requests"""
+
+
+# ---------------- WORKER PROCESS SIDE ----------------
+
+_worker_model = None
+
+
+def _init_worker(model_path: str, intra_op_threads: int, warm_up: bool, ready_queue=None):
+    """Process initializer: pin thread pools, then load the detector once per worker"""
+    global _worker_model
+
+    # Must be set before TensorFlow / torch spin up their thread pools
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS",
+                "TF_NUM_INTRAOP_THREADS"):
+        os.environ[var] = str(intra_op_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+
+    import tensorflow as tf
+    import torch
+
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    torch.set_num_threads(intra_op_threads)
+
+    from fake_news_detector import FakeNewsDetector
+
+    _worker_model = FakeNewsDetector(model_path)
+    if warm_up:
+        try:
+            _worker_model.warm_up()
+        except Exception as e:
+            print(f"⚠️ Worker {os.getpid()} warm-up failed (model still usable): {e}")
+    print(f"✅ Inference worker {os.getpid()} ready ({intra_op_threads} intra-op threads)")
+    if ready_queue is not None:
+        ready_queue.put(os.getpid())
+
+
+def _worker_ping():
+    return {"pid": os.getpid(), "graph_model": _worker_model.graph_embedder.name}
+
+
+def _worker_predict(image_url, entities, relations):
+    return _worker_model.predict(image_url, entities, relations)
+
+
+def _worker_predict_batch(items):
+    return _worker_model.predict_batch(items)
+
+
+def _worker_stats():
+    return {"pid": os.getpid(), **_worker_model.get_stats()}
+
+
+# ---------------- API PROCESS SIDE ----------------
+
+class _GraphEmbedderInfo:
+    def __init__(self, name):
+        self.name = name
+
+
+class InferencePool:
+    """
+    Process-pool proxy with the same predict/predict_batch/get_stats interface as FakeNewsDetector.
+
+    Each worker loads its own detector (with pinned intra-op threads). At most
+    `max_pending` requests may be queued or running at once; beyond that,
+    calls fail fast with InferenceOverloadedError instead of piling up.
+    """
+
+    def __init__(self, model_path: str, workers: int = 1, intra_op_threads: int = None,
+                 max_pending: int = None, timeout: float = 120, warm_up: bool = False,
+                 start_timeout: float = 600):
+        self.workers = max(1, workers)
+        self.intra_op_threads = intra_op_threads or max(1, (os.cpu_count() or 2) // self.workers)
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.model_path = model_path
+        self.warm_up = warm_up
+
+        # spawn: never fork a process that already has TF/torch/HTTP threads running
+        self._mp_context = multiprocessing.get_context("spawn")
+        # Each worker reports its pid here once its model is loaded
+        self._ready_queue = self._mp_context.Queue()
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._rejected = 0
+        self._restarts = 0
+        self._last_error = None
+        self.graph_embedder = _GraphEmbedderInfo("unknown")
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self.model_path, self.intra_op_threads, self.warm_up, self._ready_queue)
+        )
+
+    def start(self):
+        """Block until every worker has loaded its model (each reports its pid once ready)"""
+        print(f"🔄 Starting {self.workers} inference workers ({self.intra_op_threads} intra-op threads each)...")
+        start = time.perf_counter()
+        # One task per worker makes the executor spawn all of them
+        futures = [self._executor.submit(_worker_ping) for _ in range(self.workers)]
+        ready = set()
+        deadline = time.monotonic() + self.start_timeout
+        while len(ready) < self.workers:
+            for future in futures:
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+            try:
+                ready.add(self._ready_queue.get(timeout=1))
+            except queue.Empty:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Only {len(ready)}/{self.workers} inference workers loaded in {self.start_timeout}s")
+        info = futures[0].result(timeout=self.timeout)
+        self.graph_embedder = _GraphEmbedderInfo(info["graph_model"])
+        print(f"✅ Inference pool ready in {time.perf_counter() - start:.1f}s (workers {sorted(ready)})")
+
+    def _release_slot(self, _future=None):
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _restart(self, broken_executor, error):
+        """Replace a pool whose worker died; new workers load their models on first use"""
+        with self._executor_lock:
+            if self._executor is not broken_executor:
+                return  # another request already restarted it
+            print(f"⚠️ Inference worker died ({error}), restarting the pool")
+            self._executor = self._new_executor()
+            self._restarts += 1
+            self._last_error = str(error)[:200]
+        broken_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._pending_lock:
+                self._rejected += 1
+            raise InferenceOverloadedError(
+                f"Inference pool busy ({self.max_pending} requests pending), please retry shortly."
+            )
+        with self._pending_lock:
+            self._pending += 1
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._release_slot()
+            self._restart(executor, e)
+            raise
+        except Exception:
+            self._release_slot()
+            raise
+        # The slot is held until the job actually finishes in the worker, even if we stop waiting
+        future.add_done_callback(self._release_slot)
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool as e:
+            self._restart(executor, e)
+            raise
+
+    def predict(self, image_url, entities, relations):
+        return self._call(_worker_predict, image_url, entities, relations)
+
+    def predict_batch(self, items):
+        return self._call(_worker_predict_batch, items)
+
+    def pool_stats(self):
+        """Queue counters kept in this process (no worker round-trip)"""
+        with self._pending_lock:
+            return {
+                "workers": self.workers,
+                "intra_op_threads": self.intra_op_threads,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+                "last_error": self._last_error
+            }
+
+    def get_stats(self):
+        pool = self.pool_stats()
+        try:
+            # Stats from whichever worker picks this up (each worker has its own counters)
+            worker = self._executor.submit(_worker_stats).result(timeout=5)
+        except Exception as e:
+            worker = {"error": str(e)}
+        return {"pool": pool, "worker": worker}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,341 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+class ArticleStore:
+    """
+    Local SQLite store of ingested, normalized news articles.
+
+    Filled by the background IngestionWorker (NewsAPI + RSS topics), keyed by
+    the same `make_id(url)` ids the API uses, so re-ingesting an article is a
+    no-op that keeps its verification. The default /news feed is read from
+    here instead of calling NewsAPI and Gemini on the request path. The file
+    can be shared by several uvicorn workers (WAL mode).
+
+    An FTS5 index over title/description/content (kept in sync by triggers)
+    answers /news searches locally with BM25 ranking.
+    """
+
+    # BM25 column weights: title, description, content (same priorities as the old relevance_score)
+    SEARCH_WEIGHTS = (5.0, 3.0, 1.0)
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                content TEXT,
+                url TEXT NOT NULL,
+                image TEXT,
+                source TEXT,
+                published_at TEXT,
+                published_at_ist TEXT,
+                origin TEXT,
+                topic TEXT,
+                verification TEXT,
+                conclusion TEXT,
+                ingested_at REAL NOT NULL,
+                verified_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_feed ON articles (conclusion, published_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_articles_ingested ON articles (ingested_at);
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self.fts_enabled = self._create_fts()
+
+    def _create_fts(self):
+        """External-content FTS5 table mirroring articles; False if this SQLite build lacks FTS5"""
+        try:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+            ).fetchone()
+            self._conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, description, content,
+                    content='articles', content_rowid='rowid',
+                    tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, title, description, content)
+                    VALUES (new.rowid, new.title, new.description, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, description, content)
+                    VALUES ('delete', old.rowid, old.title, old.description, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_fts_update
+                AFTER UPDATE OF title, description, content ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, description, content)
+                    VALUES ('delete', old.rowid, old.title, old.description, old.content);
+                    INSERT INTO articles_fts (rowid, title, description, content)
+                    VALUES (new.rowid, new.title, new.description, new.content);
+                END;
+            """)
+            if not exists:
+                # Index articles stored before the FTS table existed
+                self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ SQLite FTS5 unavailable, local article search disabled: {e}")
+            return False
+
+    # ---------- writes ----------
+
+    def upsert_many(self, articles, origin, topic=None):
+        """
+        Insert new articles; refresh the text of known ones without touching their verification
+
+        Returns:
+            Number of articles that were not in the store before
+        """
+        now = time.time()
+        rows = [(
+            a["id"], a["title"], a.get("description", ""), a.get("content", ""), a["url"], a.get("image"),
+            a.get("source"), a.get("publishedAt"), a.get("publishedAtIST"), origin, topic, now
+        ) for a in articles]
+        if not rows:
+            return 0
+
+        with self._lock:
+            before = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("""
+                    INSERT INTO articles (id, title, description, content, url, image, source,
+                                          published_at, published_at_ist, origin, topic, ingested_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        description = excluded.description,
+                        content = CASE WHEN length(excluded.content) > length(articles.content)
+                                       THEN excluded.content ELSE articles.content END,
+                        image = COALESCE(articles.image, excluded.image)
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            after = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return after - before
+
+    def set_verifications(self, verifications):
+        """Store {article_id: verification} results"""
+        now = time.time()
+        rows = [
+            (json.dumps(v), v.get("conclusion", "UNVERIFIABLE"), now, article_id)
+            for article_id, v in verifications.items()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE articles SET verification = ?, conclusion = ?, verified_at = ? WHERE id = ?", rows
+            )
+
+    def clear_verifications(self):
+        """Forget every stored verdict (e.g. after /clear-cache); the ingestion worker re-verifies"""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE articles SET verification = NULL, conclusion = NULL, verified_at = NULL "
+                "WHERE conclusion IS NOT NULL"
+            ).rowcount
+
+    def prune(self, max_age_seconds):
+        """Drop articles ingested more than `max_age_seconds` ago"""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM articles WHERE ingested_at < ?", (time.time() - max_age_seconds,)
+            ).rowcount
+
+    def try_acquire_lease(self, name, owner, ttl):
+        """
+        Cross-process lease so only one worker process runs a job at a time
+
+        Returns:
+            True if `owner` holds the lease for the next `ttl` seconds
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now)
+            )
+            row = self._conn.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row["owner"] == owner
+
+    # ---------- reads ----------
+
+    def _to_article(self, row):
+        article = {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"] or "",
+            "content": row["content"] or "",
+            "url": row["url"],
+            "image": row["image"],
+            "source": row["source"],
+            "publishedAt": row["published_at"],
+            "publishedAtIST": row["published_at_ist"] or ""
+        }
+        if row["verification"]:
+            article["verification"] = json.loads(row["verification"])
+        return article
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def unverified(self, limit=30):
+        """Newest articles that have no verification yet"""
+        return self._query(
+            "SELECT * FROM articles WHERE conclusion IS NULL AND image IS NOT NULL "
+            "ORDER BY published_at DESC LIMIT ?",
+            (limit,)
+        )
+
+    def feed(self, page=1, page_size=10, verified_only=True):
+        """
+        Build one page of the default /news payload from stored articles
+
+        Args:
+            page: 1-based page number
+            page_size: Shown articles per page
+            verified_only: Only REAL/UNVERIFIABLE articles (FAKE ones go to fake_news_detected)
+        """
+        offset = (page - 1) * page_size
+        if not verified_only:
+            articles = self._query(
+                "SELECT * FROM articles WHERE image IS NOT NULL ORDER BY published_at DESC LIMIT ? OFFSET ?",
+                (page_size, offset)
+            )
+            return {
+                "articles": articles,
+                "stats": {"real_count": len(articles), "fake_count": 0, "unverified_count": 0},
+                "fake_news_detected": []
+            }
+
+        # One extra row on each side: the neighbouring pages' articles bound this page's time window
+        window = self._query(
+            "SELECT * FROM articles WHERE conclusion IN ('REAL', 'UNVERIFIABLE') AND image IS NOT NULL "
+            "ORDER BY published_at DESC LIMIT ? OFFSET ?",
+            (page_size + 2 if offset else page_size + 1, offset - 1 if offset else 0)
+        )
+        previous = window.pop(0) if offset and window else None
+        articles = window[:page_size]
+        has_next = len(window) > page_size
+
+        # Fake articles published in the same window as the shown ones (the first page gets
+        # everything newer, the last page everything older), so each FAKE shows on exactly one page
+        conditions = ["conclusion = 'FAKE'"]
+        params = []
+        if previous is not None:
+            conditions.append("COALESCE(published_at, '') < ?")
+            params.append(previous["publishedAt"] or "")
+        if has_next:
+            conditions.append("COALESCE(published_at, '') >= ?")
+            params.append(articles[-1]["publishedAt"] or "")
+        if offset and not articles:
+            fake_articles = []
+        else:
+            fake_articles = self._query(
+                f"SELECT * FROM articles WHERE {' AND '.join(conditions)} ORDER BY published_at DESC LIMIT ?",
+                (*params, page_size)
+            )
+        return {
+            "articles": articles,
+            "stats": {
+                "real_count": sum(1 for a in articles if a["verification"].get("conclusion") == "REAL"),
+                "fake_count": len(fake_articles),
+                "unverified_count": sum(1 for a in articles if a["verification"].get("conclusion") == "UNVERIFIABLE")
+            },
+            "fake_news_detected": fake_articles
+        }
+
+    @staticmethod
+    def _match_expression(query, operator):
+        """Turn free text into an FTS5 query of quoted terms (no user-controlled syntax)"""
+        terms = re.findall(r"\w+", query.lower())
+        return f" {operator} ".join(f'"{term}"' for term in terms)
+
+    def search(self, query, page=1, page_size=30):
+        """
+        Full-text search over stored articles (with images), best BM25 match first
+
+        All terms must match; if no stored article matches them all, any term
+        may match. The mode is chosen per query, not per page, so paging never
+        switches between the two result lists.
+
+        Returns:
+            List of article dicts, or None if full-text search is unavailable
+        """
+        if not self.fts_enabled:
+            return None
+        offset = (page - 1) * page_size
+        weights = ", ".join(str(w) for w in self.SEARCH_WEIGHTS)
+        sql = (
+            "SELECT a.* FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+            "WHERE articles_fts MATCH ? AND a.image IS NOT NULL "
+            f"ORDER BY bm25(articles_fts, {weights}), a.published_at DESC LIMIT ? OFFSET ?"
+        )
+        expression = self._match_expression(query, "AND")
+        if not expression:
+            return []
+        with self._lock:
+            any_all_terms = self._conn.execute(
+                "SELECT 1 FROM articles_fts JOIN articles a ON a.rowid = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? AND a.image IS NOT NULL LIMIT 1",
+                (expression,)
+            ).fetchone()
+        if any_all_terms is None:
+            expression = self._match_expression(query, "OR")
+        return self._query(sql, (expression, page_size, offset))
+
+    def has_feed(self):
+        """True once at least one verified article with an image is stored"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM articles WHERE conclusion IS NOT NULL AND image IS NOT NULL LIMIT 1"
+            ).fetchone()
+        return row is not None
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT COALESCE(conclusion, 'PENDING') AS conclusion, COUNT(*) AS n FROM articles GROUP BY 1"
+            ).fetchall()
+            origins = self._conn.execute(
+                "SELECT COALESCE(origin, 'unknown') AS origin, COUNT(*) AS n FROM articles GROUP BY 1"
+            ).fetchall()
+            newest = self._conn.execute("SELECT MAX(ingested_at) FROM articles").fetchone()[0]
+        by_conclusion = {row["conclusion"]: row["n"] for row in rows}
+        return {
+            "path": self.path,
+            "total": sum(by_conclusion.values()),
+            "by_conclusion": by_conclusion,
+            "by_origin": {row["origin"]: row["n"] for row in origins},
+            "last_ingested_at": newest
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
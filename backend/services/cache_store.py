@@ -0,0 +1,484 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheBackend(ABC):
+    """
+    Minimal key/value cache interface with LRU + TTL semantics.
+
+    Values must be JSON-serializable so every backend can store them.
+    """
+
+    def __init__(self, namespace="default", max_entries=5000, ttl=None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key, default=None, _count=True):
+        ...
+
+    @abstractmethod
+    def set(self, key, value):
+        ...
+
+    @abstractmethod
+    def delete(self, key):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, _count=False) is not _MISSING
+
+    def set_many(self, items):
+        """Store several (key, value) pairs; persistent backends write them in one transaction"""
+        for key, value in items:
+            self.set(key, value)
+
+    def get_entry(self, key, _count=True):
+        """(value, expires_at epoch or None) for a live entry, or None on a miss"""
+        value = self.get(key, _MISSING, _count=_count)
+        if value is _MISSING:
+            return None
+        return value, (time.time() + self.ttl if self.ttl else None)
+
+    def generation(self):
+        """Counter bumped by clear() where the store is shared; lets front tiers notice"""
+        return 0
+
+    def _record(self, hits=0, misses=0, evictions=0):
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def stats(self):
+        """Counters are per process; size reflects the (possibly shared) store"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend_name,
+            "namespace": self.namespace,
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_MISSING = object()
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with optional TTL (not shared between workers)"""
+
+    backend_name = "memory"
+
+    def __init__(self, namespace="default", max_entries=5000, ttl=None):
+        super().__init__(namespace, max_entries, ttl)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None, _count=True):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._data[key]
+                    entry = None
+                    if _count:
+                        self._record(evictions=1)
+                else:
+                    self._data.move_to_end(key)
+
+        if entry is None:
+            if _count:
+                self._record(misses=1)
+            return default
+
+        if _count:
+            self._record(hits=1)
+        return value
+
+    def set(self, key, value):
+        self.set_entry(key, value, time.time() + self.ttl if self.ttl else None)
+
+    def set_entry(self, key, value, expires_at):
+        """Store with an explicit expiry (epoch seconds, None = never)"""
+        evicted = 0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while self.max_entries and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._record(evictions=evicted)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk LRU + TTL cache backed by SQLite.
+
+    The database file can be shared by several uvicorn workers (WAL mode) and
+    survives restarts. Several caches can live in one file, separated by
+    namespace.
+
+    Reads stay read-only: the LRU timestamp of a hit is only rewritten when
+    it is older than `touch_interval` seconds. Size-based eviction runs every
+    few writes rather than on each one, so a namespace may briefly exceed
+    max_entries by up to that many rows per worker.
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(self, path, namespace="default", max_entries=5000, ttl=None, touch_interval=60):
+        super().__init__(namespace, max_entries, ttl)
+        self.path = path
+        self.touch_interval = touch_interval
+        # Small caches stay exact; large ones tolerate ~1% overshoot between eviction passes
+        self._evict_every = max(1, min(64, max_entries // 100)) if max_entries else 64
+        self._writes_since_evict = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries (namespace, last_access)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_generations (namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+
+    def get(self, key, default=None, _count=True):
+        entry = self.get_entry(key, _count=_count)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key, _count=True):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, last_access FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+                row = None
+                if _count:
+                    self._record(evictions=1)
+            elif row is not None and now - row[2] >= self.touch_interval:
+                self._conn.execute(
+                    "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key)
+                )
+
+        if row is None:
+            if _count:
+                self._record(misses=1)
+            return None
+
+        if _count:
+            self._record(hits=1)
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at, now)
+            )
+            evicted = self._maybe_evict(now, 1)
+        if evicted:
+            self._record(evictions=evicted)
+
+    def set_many(self, items):
+        """Store several (key, value) pairs in a single transaction"""
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        rows = [(self.namespace, key, json.dumps(value), expires_at, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                evicted = self._maybe_evict(now, len(rows))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if evicted:
+            self._record(evictions=evicted)
+
+    def _maybe_evict(self, now, writes):
+        """Run _evict once every `_evict_every` writes (the COUNT(*) isn't free on big namespaces)"""
+        self._writes_since_evict += writes
+        if self._writes_since_evict < self._evict_every:
+            return 0
+        self._writes_since_evict = 0
+        return self._evict(now)
+
+    def _evict(self, now):
+        """Drop expired rows, then least-recently-used rows above max_entries"""
+        evicted = self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.namespace, now)
+        ).rowcount
+
+        if self.max_entries:
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                evicted += self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                    "  SELECT key FROM cache_entries WHERE namespace = ? ORDER BY last_access ASC LIMIT ?"
+                    ")",
+                    (self.namespace, self.namespace, overflow)
+                ).rowcount
+
+        return max(evicted, 0)
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                self._conn.execute(
+                    "INSERT INTO cache_generations (namespace, generation) VALUES (?, 1) "
+                    "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+                    (self.namespace,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def generation(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation FROM cache_generations WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (self.namespace, time.time())
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_cache(backend="sqlite", namespace="default", max_entries=5000, ttl=None, path=None, memory_entries=0):
+    """
+    Build a cache backend by name
+
+    Args:
+        backend: "sqlite" (persistent, shared across workers) or "memory"
+        namespace: Logical cache name, lets several caches share one SQLite file
+        max_entries: LRU bound (0 disables the bound)
+        ttl: Seconds before an entry expires (None keeps entries forever)
+        path: SQLite file path (required for the sqlite backend)
+        memory_entries: If > 0, put an in-process LRU of this size in front of the sqlite backend
+    """
+    if backend == "memory":
+        return MemoryCache(namespace=namespace, max_entries=max_entries, ttl=ttl)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("SQLite cache requires a path")
+        cache = SQLiteCache(path, namespace=namespace, max_entries=max_entries, ttl=ttl)
+        if memory_entries:
+            cache = TieredCache(MemoryCache(namespace=namespace, max_entries=memory_entries, ttl=ttl), cache)
+        return cache
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+class TieredCache(CacheBackend):
+    """
+    Two-level cache: a small in-process LRU in front of a larger (usually persistent) backend.
+
+    Hits in the second tier are promoted into the first with the expiry of
+    the persistent row, so a promoted copy never outlives it. clear() in any
+    worker bumps the persistent tier's generation; every worker checks it at
+    most once per `generation_check_interval` seconds and drops its memory
+    tier when it changed (so other workers may serve cleared entries for up
+    to that long).
+    """
+
+    backend_name = "tiered"
+
+    def __init__(self, memory_tier, persistent_tier, generation_check_interval=1.0):
+        super().__init__(persistent_tier.namespace, persistent_tier.max_entries, persistent_tier.ttl)
+        self.memory_tier = memory_tier
+        self.persistent_tier = persistent_tier
+        self.generation_check_interval = generation_check_interval
+        self._generation = persistent_tier.generation()
+        self._generation_checked_at = time.monotonic()
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.generation_check_interval:
+            return
+        self._generation_checked_at = now
+        generation = self.persistent_tier.generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.memory_tier.clear()
+
+    def get(self, key, default=None, _count=True):
+        self._check_generation()
+        value = self.memory_tier.get(key, _MISSING, _count=_count)
+        if value is _MISSING:
+            entry = self.persistent_tier.get_entry(key, _count=_count)
+            if entry is not None:
+                value, expires_at = entry
+                self.memory_tier.set_entry(key, value, expires_at)
+
+        if value is _MISSING:
+            if _count:
+                self._record(misses=1)
+            return default
+
+        if _count:
+            self._record(hits=1)
+        return value
+
+    def set(self, key, value):
+        self.memory_tier.set(key, value)
+        self.persistent_tier.set(key, value)
+
+    def set_many(self, items):
+        items = list(items)
+        self.memory_tier.set_many(items)
+        self.persistent_tier.set_many(items)
+
+    def delete(self, key):
+        self.memory_tier.delete(key)
+        self.persistent_tier.delete(key)
+
+    def clear(self):
+        self.memory_tier.clear()
+        self.persistent_tier.clear()
+        self._generation = self.persistent_tier.generation()
+
+    def __len__(self):
+        return len(self.persistent_tier)
+
+    def stats(self):
+        stats = super().stats()
+        stats["tiers"] = {
+            "memory": self.memory_tier.stats(),
+            "persistent": self.persistent_tier.stats()
+        }
+        return stats
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller runs `fn`; callers arriving while it is in flight wait
+    for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {"event": threading.Event(), "result": None, "error": None}
+                self._calls[key] = call
+            else:
+                self.shared += 1
+
+        if not leader:
+            call["event"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["event"].set()
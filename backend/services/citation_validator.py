@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict
+import time
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+VALID_STATUS_CODES = {200, 301, 302, 307, 308}
+
+
+class CitationValidator:
+    """
+    Concurrent HEAD-probing of citation URLs returned by Gemini.
+
+    Probes run in parallel under one overall deadline and stop as soon as
+    enough valid citations are found. Probe outcomes are cached per URL so
+    repeated summaries don't hit the same hosts again.
+    """
+
+    def __init__(self, http_client, cache, max_workers=8, deadline=4.0, probe_timeout=3):
+        self.http_client = http_client
+        self.cache = cache
+        self.deadline = deadline
+        self.probe_timeout = probe_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="citation")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def validate(self, citations: List, max_candidates: int = 10, max_valid: int = 5) -> List[Dict]:
+        """
+        Return up to `max_valid` reachable citations, in Gemini's original order
+
+        Citations still unchecked at the deadline are kept, as slow hosts are
+        on a probe timeout.
+
+        Args:
+            citations: Raw citation list from the Gemini reply
+            max_candidates: How many citations to consider at most
+            max_valid: Stop probing once this many valid citations are found
+        """
+        if not isinstance(citations, list):
+            return []
+
+        candidates = []
+        for citation in citations[:max_candidates]:
+            if not isinstance(citation, dict):
+                continue
+            url = citation.get("url", "")
+            if not url or not isinstance(url, str):
+                continue
+            # Basic URL validation
+            if not url.startswith(("http://", "https://")):
+                continue
+            candidates.append(citation)
+
+        valid = {}
+        pending = {}
+        for index, citation in enumerate(candidates):
+            cached = self.cache.get(citation["url"])
+            if cached is not None:
+                if cached.get("ok"):
+                    valid[index] = citation
+            else:
+                pending[self._pool.submit(self._probe, citation["url"])] = index
+
+        deadline_at = time.monotonic() + self.deadline
+        while pending and len(valid) < max_valid:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                # Unanswered like a probe timeout: accepted, not cached
+                print(f"Citation check deadline hit, accepting {len(pending)} unchecked URLs")
+                for index in pending.values():
+                    valid[index] = candidates[index]
+                break
+            done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    if future.result():
+                        valid[index] = candidates[index]
+                except Exception as url_err:
+                    print(f"Citation URL check failed: {url_err}")
+
+        for future in pending:
+            future.cancel()
+
+        return [
+            {
+                "source_name": str(candidates[i].get("source_name", "Unknown"))[:100],
+                "title": str(candidates[i].get("title", ""))[:200],
+                "url": candidates[i]["url"]
+            }
+            for i in sorted(valid)[:max_valid]
+        ]
+
+    def _probe(self, url: str) -> bool:
+        """HEAD-check one URL (single attempt, no retries), caching definite answers"""
+        try:
+            url_check = self.http_client.head(url, retry=False, timeout=self.probe_timeout, allow_redirects=True)
+        except requests.exceptions.Timeout:
+            print(f"Citation URL timeout: {url[:50]}")
+            # Accept anyway (might be slow server), but don't cache it
+            return True
+        except requests.exceptions.ConnectionError as e:
+            # A read timeout after exhausted retries is wrapped in ConnectionError: still just slow
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            if isinstance(reason, ReadTimeoutError):
+                print(f"Citation URL timeout: {url[:50]}")
+                return True
+            self.cache.set(url, {"ok": False})
+            return False
+        except requests.exceptions.RequestException:
+            self.cache.set(url, {"ok": False})
+            return False
+
+        ok = url_check.status_code in VALID_STATUS_CODES
+        self.cache.set(url, {"ok": ok})
+        return ok
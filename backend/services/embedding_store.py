@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    Persistent fixed-width vector store.
+
+    Vectors live in a memory-mapped float32 file (one row per vector) and a
+    SQLite index maps any number of string keys (URL, content hash, perceptual
+    hash, ...) to a row. Row allocation happens inside a SQLite transaction, so
+    several worker processes can share one store directory.
+
+    Re-storing a key overwrites its row in place; rows no longer referenced by
+    any key go on a free list and are reused. With `max_vectors` set, the file
+    stops growing at that many rows and the oldest-written row is recycled.
+    """
+
+    def __init__(self, directory, dim=512, initial_capacity=1024, max_vectors=0):
+        """
+        Args:
+            directory: Store directory (created if missing)
+            dim: Vector width
+            initial_capacity: Rows allocated when the vector file is created
+            max_vectors: Max rows in the vector file (0 = unbounded)
+        """
+        self.directory = directory
+        self.dim = dim
+        self.max_vectors = max_vectors
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self.vectors_path = os.path.join(directory, f"vectors_{dim}.f32")
+        self.index_path = os.path.join(directory, f"index_{dim}.sqlite3")
+        self._row_bytes = dim * 4
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embedding_keys (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embedding_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO embedding_meta (name, value) VALUES ('next_row', 0)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embedding_rows (row INTEGER PRIMARY KEY, written_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embedding_rows_written ON embedding_rows (written_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embedding_free (row INTEGER PRIMARY KEY)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embedding_keys_row ON embedding_keys (row)")
+        self._reclaim()
+
+        if not os.path.exists(self.vectors_path):
+            with open(self.vectors_path, "wb") as f:
+                f.truncate(initial_capacity * self._row_bytes)
+
+        self._mm = None
+        self._capacity = 0
+        self._remap()
+
+    def _reclaim(self):
+        """Compaction for stores written before row reuse: track live rows, free leaked ones"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO embedding_rows (row, written_at) SELECT DISTINCT row, 0 FROM embedding_keys"
+            )
+            next_row = self._conn.execute("SELECT value FROM embedding_meta WHERE name = 'next_row'").fetchone()[0]
+            live = {r[0] for r in self._conn.execute("SELECT row FROM embedding_rows")}
+            free = {r[0] for r in self._conn.execute("SELECT row FROM embedding_free")}
+            leaked = [(row,) for row in range(next_row) if row not in live and row not in free]
+            self._conn.executemany("INSERT OR IGNORE INTO embedding_free (row) VALUES (?)", leaked)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _remap(self):
+        """(Re)open the memory map at the current file size"""
+        if self._mm is not None:
+            self._mm.flush()
+            del self._mm
+        size = os.path.getsize(self.vectors_path)
+        self._capacity = size // self._row_bytes
+        self._mm = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+
+    def _ensure_capacity(self, row):
+        if row < self._capacity:
+            return
+        # Another process may already have grown the file
+        if os.path.getsize(self.vectors_path) // self._row_bytes <= row:
+            new_capacity = max(self._capacity * 2, row + 1)
+            if self.max_vectors:
+                new_capacity = max(min(new_capacity, self.max_vectors), row + 1)
+            with open(self.vectors_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < new_capacity * self._row_bytes:
+                    f.truncate(new_capacity * self._row_bytes)
+        self._remap()
+
+    def get(self, key):
+        """Return a copy of the vector stored under `key`, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT row FROM embedding_keys WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._ensure_capacity(row[0])
+            return np.array(self._mm[row[0]])
+
+    def get_any(self, keys):
+        """Return (key, vector) for the first key that is stored, or (None, None)"""
+        for key in keys:
+            if not key:
+                continue
+            vector = self.get(key)
+            if vector is not None:
+                return key, vector
+        return None, None
+
+    def put(self, keys, vector):
+        """Store `vector` once and point every key in `keys` at it"""
+        self.put_many([(keys, vector)])
+
+    def put_many(self, entries):
+        """Store several (keys, vector) entries in one transaction and one flush"""
+        prepared = []
+        for keys, vector in entries:
+            keys = [k for k in keys if k]
+            if not keys:
+                continue
+            vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+            if vector.shape[0] != self.dim:
+                raise ValueError(f"Expected vector of size {self.dim}, got {vector.shape[0]}")
+            prepared.append((keys, vector))
+        if not prepared:
+            return
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                for keys, vector in prepared:
+                    old_rows = self._rows_of(keys)
+                    # Re-embedding a known key overwrites its row instead of leaking a new one
+                    row = next((old_rows[key] for key in keys if key in old_rows), None)
+                    if row is None:
+                        row = self._allocate_row()
+                    self._ensure_capacity(row)
+                    self._mm[row] = vector
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO embedding_rows (row, written_at) VALUES (?, ?)", (row, now)
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_keys (key, row) VALUES (?, ?)",
+                        [(key, row) for key in keys]
+                    )
+                    self._release_orphans(set(old_rows.values()) - {row})
+                self._mm.flush()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _rows_of(self, keys):
+        """{key: row} for the keys that are already stored (inside the caller's transaction)"""
+        placeholders = ",".join("?" * len(keys))
+        return dict(self._conn.execute(
+            f"SELECT key, row FROM embedding_keys WHERE key IN ({placeholders})", keys
+        ).fetchall())
+
+    def _allocate_row(self):
+        """Free row, else a new row, else (at max_vectors) the oldest-written row with its keys dropped"""
+        free = self._conn.execute("SELECT MIN(row) FROM embedding_free").fetchone()[0]
+        if free is not None:
+            self._conn.execute("DELETE FROM embedding_free WHERE row = ?", (free,))
+            return free
+
+        row = self._conn.execute("SELECT value FROM embedding_meta WHERE name = 'next_row'").fetchone()[0]
+        if not self.max_vectors or row < self.max_vectors:
+            self._conn.execute("UPDATE embedding_meta SET value = ? WHERE name = 'next_row'", (row + 1,))
+            return row
+
+        oldest = self._conn.execute(
+            "SELECT row FROM embedding_rows ORDER BY written_at ASC LIMIT 1"
+        ).fetchone()[0]
+        self._conn.execute("DELETE FROM embedding_keys WHERE row = ?", (oldest,))
+        self.evictions += 1
+        return oldest
+
+    def _release_orphans(self, rows):
+        """Put rows that no key points at anymore on the free list"""
+        for row in rows:
+            if self._conn.execute("SELECT 1 FROM embedding_keys WHERE row = ? LIMIT 1", (row,)).fetchone() is None:
+                self._conn.execute("DELETE FROM embedding_rows WHERE row = ?", (row,))
+                self._conn.execute("INSERT OR IGNORE INTO embedding_free (row) VALUES (?)", (row,))
+
+    def alias(self, existing_key, new_keys):
+        """Point extra keys at the row already stored under `existing_key`"""
+        new_keys = [k for k in new_keys if k and k != existing_key]
+        if not new_keys:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT row FROM embedding_keys WHERE key = ?", (existing_key,)).fetchone()
+                if row is not None:
+                    old_rows = self._rows_of(new_keys)
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embedding_keys (key, row) VALUES (?, ?)",
+                        [(key, row[0]) for key in new_keys]
+                    )
+                    self._release_orphans(set(old_rows.values()) - {row[0]})
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM embedding_rows").fetchone()[0]
+            free = self._conn.execute("SELECT COUNT(*) FROM embedding_free").fetchone()[0]
+            keys = self._conn.execute("SELECT COUNT(*) FROM embedding_keys").fetchone()[0]
+        return {
+            "vectors": rows,
+            "free_rows": free,
+            "keys": keys,
+            "capacity": self._capacity,
+            "max_vectors": self.max_vectors,
+            "evictions": self.evictions,
+            "dim": self.dim
+        }
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.flush()
+            self._conn.close()
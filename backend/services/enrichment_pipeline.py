@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict
+import time
+
+from services.metrics import STAGE_SECONDS, stage_timer
+
+
+class EnrichmentPipeline:
+    """
+    Concurrent RSS + Wikipedia enrichment for knowledge graph entities.
+
+    Every (entity, source) pair is an independent task. Each source gets its
+    own bounded thread pool so a slow Wikipedia lookup never occupies a slot
+    that an RSS fetch could use, and the whole stage shares one deadline:
+    whatever has finished by then is merged, the rest is dropped.
+    """
+
+    def __init__(self, rss_fetcher, wikipedia_service, relevance_filter,
+                 rss_concurrency=3, wiki_concurrency=3, deadline=8.0):
+        self.rss_fetcher = rss_fetcher
+        self.wikipedia_service = wikipedia_service
+        self.relevance_filter = relevance_filter
+        self.deadline = deadline
+
+        self._rss_pool = ThreadPoolExecutor(max_workers=max(1, rss_concurrency), thread_name_prefix="enrich-rss")
+        self._wiki_pool = ThreadPoolExecutor(max_workers=max(1, wiki_concurrency), thread_name_prefix="enrich-wiki")
+
+    def shutdown(self):
+        self._rss_pool.shutdown(wait=False, cancel_futures=True)
+        self._wiki_pool.shutdown(wait=False, cancel_futures=True)
+
+    def enrich(self, article_context: Dict, entity_names: List[str], ai_keywords: List[str] = None) -> Dict:
+        """
+        Enrich entities with RSS articles and Wikipedia connections in parallel
+
+        Args:
+            article_context: {"title": ..., "summary": ...} of the source article
+            entity_names: Entities to enrich (already ranked and truncated)
+            ai_keywords: Keywords from the extraction step for relevance filtering
+
+        Returns:
+            {
+                "entities": [...],       # new entities discovered via Wikipedia
+                "relations": [...],      # relations linking them to the source entity
+                "rss_articles": [...],
+                "wikipedia_data": {...},
+                "timed_out": [...]       # "source:entity" tasks that missed the deadline
+            }
+        """
+        start = time.perf_counter()
+
+        rss_futures = {}
+        wiki_futures = {}
+        for entity_name in entity_names:
+            rss_futures[entity_name] = self._rss_pool.submit(
+                self._rss_task, article_context, entity_name, ai_keywords)
+            wiki_futures[entity_name] = self._wiki_pool.submit(
+                self._wiki_task, article_context, entity_name, ai_keywords)
+
+        all_futures = list(rss_futures.values()) + list(wiki_futures.values())
+        wait(all_futures, timeout=self.deadline)
+
+        result = {
+            "entities": [],
+            "relations": [],
+            "rss_articles": [],
+            "wikipedia_data": {},
+            "timed_out": []
+        }
+
+        # Merge in entity order so the output matches the sequential pipeline
+        for entity_name in entity_names:
+            rss_future = rss_futures[entity_name]
+            if rss_future.done():
+                try:
+                    rss_items = rss_future.result()
+                    result["rss_articles"].extend(rss_items)
+                    print(f"      📰 Integrated {len(rss_items)} relevant RSS articles for {entity_name}")
+                except Exception as e:
+                    print(f"      ⚠️ RSS error for {entity_name}: {e}")
+            else:
+                rss_future.cancel()
+                result["timed_out"].append(f"rss:{entity_name}")
+
+            wiki_future = wiki_futures[entity_name]
+            if wiki_future.done():
+                try:
+                    wiki_entry, wiki_entities, wiki_relations = wiki_future.result()
+                    if wiki_entry:
+                        result["wikipedia_data"][entity_name] = wiki_entry
+                    result["entities"].extend(wiki_entities)
+                    result["relations"].extend(wiki_relations)
+                    print(f"      📖 Integrated {len(wiki_entities)} relevant Wiki connections for {entity_name}")
+                except Exception as e:
+                    print(f"      ⚠️ Wiki error for {entity_name}: {e}")
+            else:
+                wiki_future.cancel()
+                result["timed_out"].append(f"wiki:{entity_name}")
+
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage="enrichment")
+        if result["timed_out"]:
+            print(f"   ⏱️ Enrichment deadline ({self.deadline}s) hit, dropped: {', '.join(result['timed_out'])}")
+        print(f"   ⚡ Enrichment finished in {elapsed:.2f}s for {len(entity_names)} entities")
+
+        return result
+
+    def _rss_task(self, article_context: Dict, entity_name: str, ai_keywords: List[str]) -> List[Dict]:
+        """Fetch and filter RSS articles for one entity"""
+        with stage_timer("rss_lookup"):
+            raw_rss = self.rss_fetcher.fetch_news_by_query(entity_name, max_results=10)
+        rss_titles = [r.get("title", "") for r in raw_rss]
+
+        filter_res = self.relevance_filter.batch_filter_enrichment(
+            article_context=article_context,
+            entity_name=entity_name,
+            rss_articles=rss_titles,
+            wikipedia_entities=[],
+            ai_keywords=ai_keywords
+        )
+
+        links_by_title = {}
+        for r in raw_rss:
+            links_by_title.setdefault(r.get("title"), r.get("link", ""))
+
+        return [
+            {
+                "entity": entity_name,
+                "title": title,
+                "link": links_by_title.get(title, "")
+            }
+            for title in filter_res.get("relevant_rss", [])
+        ]
+
+    def _wiki_task(self, article_context: Dict, entity_name: str, ai_keywords: List[str]):
+        """Fetch Wikipedia info for one entity and keep only relevant linked entities"""
+        with stage_timer("wikipedia_lookup"):
+            wiki_info = self.wikipedia_service.get_enriched_entity_info(entity_name)
+        if not wiki_info.get("exists"):
+            return None, [], []
+
+        wiki_entry = {
+            "summary": wiki_info.get("summary", "")[:300],
+            "url": wiki_info.get("url", "")
+        }
+
+        raw_wiki_ents = [w["name"] for w in wiki_info.get("related_entities", [])]
+        filter_res = self.relevance_filter.batch_filter_enrichment(
+            article_context=article_context,
+            entity_name=entity_name,
+            rss_articles=[],
+            wikipedia_entities=raw_wiki_ents,
+            max_wiki_results=3,
+            ai_keywords=ai_keywords
+        )
+
+        entities = []
+        relations = []
+        for wiki_ent_name in filter_res.get("relevant_wikipedia", []):
+            entities.append({
+                "name": wiki_ent_name,
+                "type": "OTHER",
+                "context": f"AI-validated relation to {entity_name}"
+            })
+            relations.append({
+                "source": entity_name,
+                "target": wiki_ent_name,
+                "relationship": "related_to",
+                "context": "Semantic Match"
+            })
+
+        return wiki_entry, entities, relations
@@ -1,16 +1,72 @@
 import json
 import re
+import copy
+import hashlib
+import unicodedata
 from google import genai
 from google.genai import types
-import os
+from services.cache_store import SingleFlight
+from services.metrics import stage_timer, record_gemini_usage
+
+# Bump whenever the extraction prompt or output post-processing changes,
+# so cached results from the old prompt are not reused.
+PROMPT_VERSION = "v1"
+
+def normalize_text(text):
+    """Unicode-normalize, case-fold and collapse whitespace so trivially different inputs share a key"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r"\s+", " ", text).strip().casefold()
 
 class EntityExtractor:
-    def __init__(self, api_key, model_name="gemini-2.5-flash"):
+    def __init__(self, api_key, model_name="gemini-2.5-flash", cache=None):
         # Configure Gemini API
         self.client = genai.Client(api_key=api_key)
         self.model_name = model_name
+        
+        # Content-addressed result cache + de-duplication of concurrent identical calls
+        self.cache = cache
+        self._single_flight = SingleFlight()
+    
+    def cache_key(self, text, title=""):
+        """Hash of normalized title + text (as sent to Gemini) plus prompt/model version"""
+        payload = "\x1f".join([PROMPT_VERSION, self.model_name, normalize_text(title), normalize_text(text[:5000])])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
     
     def extract_entities(self, text, title=""):
+        """Extract entities and relations, served from cache when the same article was seen before"""
+        key = self.cache_key(text, title)
+        
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"⚡ Entity extraction cache hit ({key[:12]})")
+                return copy.deepcopy(cached)
+        
+        # Concurrent identical requests share one in-flight Gemini call
+        result = self._single_flight.do(key, lambda: self._extract_and_cache(key, text, title))
+        # Callers get their own copy (the object is shared with the cache and other waiters)
+        return copy.deepcopy(result)
+    
+    def _extract_and_cache(self, key, text, title):
+        # Another request may have filled the cache while we waited to become leader
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = self._extract_with_gemini(text, title)
+        
+        # Only cache successful extractions; failures should be retried next time
+        if self.cache is not None and result.get("entities"):
+            self.cache.set(key, result)
+        return result
+    
+    def cache_stats(self):
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, "single_flight_shared": self._single_flight.shared, **self.cache.stats()}
+    
+    def _extract_with_gemini(self, text, title=""):
         """Extract relevant entities and relations from article text using Gemini API"""
         
         prompt = f"""
@@ -85,11 +141,13 @@ Return ONLY valid JSON with this EXACT structure (no markdown, no explanation):
                 max_output_tokens=8192
             )
             
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=config
-            )
+            with stage_timer("gemini_extraction"):
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config
+                )
+            record_gemini_usage("extraction", response)
             
             # Access response text correctly for new SDK
             result_text = response.candidates[0].content.parts[0].text if hasattr(response, 'candidates') else response.text
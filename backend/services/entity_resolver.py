@@ -0,0 +1,367 @@
+from collections import OrderedDict
+import re
+import threading
+import unicodedata
+
+# Common surface forms (after normalize_entity_name) -> canonical name.
+# Names not listed here fall through to Wikipedia redirects and fuzzy matching.
+# Acronyms only match in capitals ("US", "U.S."), not as words ("us", "The Who").
+DEFAULT_ALIASES = {
+    "US": "United States",
+    "USA": "United States",
+    "united states of america": "United States",
+    "UK": "United Kingdom",
+    "britain": "United Kingdom",
+    "UN": "United Nations",
+    "EU": "European Union",
+    "UAE": "United Arab Emirates",
+    "USSR": "Soviet Union",
+    "NYC": "New York City",
+    "WHO": "World Health Organization",
+    "IMF": "International Monetary Fund",
+    "FBI": "Federal Bureau of Investigation",
+    "CIA": "Central Intelligence Agency",
+}
+
+_LEADING_WORDS = {"the", "mr", "mrs", "ms", "dr", "prof", "sir"}
+
+# 2-4 capitals/digits once dots are dropped ("U.S.", "NATO", "G20")
+_ACRONYM = re.compile(r"[A-Z][A-Z0-9]{1,3}")
+
+# Generational suffixes: "Donald Trump Jr." is not "Donald Trump"
+_NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Aliases remembered per canonical entity (the rest still resolve, they just aren't listed)
+MAX_ALIASES = 20
+
+
+def normalize_entity_name(name):
+    """
+    Matching key for an entity name: accents stripped, case-folded, dots and
+    apostrophes dropped, other punctuation turned into spaces and a leading
+    article or honorific removed ("The White House" -> "white house").
+
+    Short all-caps acronyms keep their case ("U.S." -> "US", "WHO" -> "WHO"),
+    so they don't share a key with the word ("us", "The Who" -> "who").
+    """
+    words = (name or "").split()
+    while len(words) > 1 and re.sub(r"[.'’]", "", words[0]).casefold() in _LEADING_WORDS:
+        words.pop(0)
+    if len(words) == 1 and _ACRONYM.fullmatch(words[0].replace(".", "")):
+        return words[0].replace(".", "")
+
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = text.replace("&", " and ")
+    text = re.sub(r"['’]s\b", "", text)
+    text = re.sub(r"[.'’]", "", text)
+    words = re.sub(r"[\W_]+", " ", text).split()
+    while len(words) > 1 and words[0] in _LEADING_WORDS:
+        words.pop(0)
+    return " ".join(words)
+
+
+def trigrams(key):
+    """Character trigrams of a normalized name, padded so word boundaries count"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _compatible_types(a, b):
+    return not a or not b or a == b or "OTHER" in (a, b)
+
+
+def _different_people(key_a, key_b):
+    """Similar person names that still differ in a generational suffix or an initial"""
+    words_a, words_b = key_a.split(), key_b.split()
+    if {w for w in words_a if w in _NAME_SUFFIXES} != {w for w in words_b if w in _NAME_SUFFIXES}:
+        return True
+    return {w for w in words_a if len(w) == 1} != {w for w in words_b if len(w) == 1}
+
+
+class EntityResolver:
+    """
+    Maps entity surface forms to canonical entities shared across articles.
+
+    A name is resolved by, in order: its normalized form (already seen), the
+    alias table, the Wikipedia title it redirects to (offline index or the
+    Wikipedia cache only, never the network), and fuzzy matching against known
+    canonical names of a compatible type. Fuzzy candidates come from a
+    character-trigram inverted index (blocking), so only names sharing
+    trigrams are scored (Dice coefficient), not every known entity. Person
+    names differing in a suffix ("Jr.") or an initial are never fuzzy-matched.
+
+    The name -> canonical ID mapping and canonical records live in a
+    CacheBackend, shared between workers with the sqlite backend; the trigram
+    index covers the canonical entities this process has seen, bounded by
+    `max_indexed`.
+    """
+
+    def __init__(self, cache=None, wikipedia_service=None, aliases=None,
+                 fuzzy_threshold=0.85, min_fuzzy_length=5, max_indexed=20000):
+        """
+        Args:
+            cache: Optional CacheBackend for name -> canonical ID and canonical records
+            wikipedia_service: Optional WikipediaService used for redirect titles
+            aliases: Extra {surface form: canonical name} entries on top of DEFAULT_ALIASES
+            fuzzy_threshold: Min trigram Dice similarity for a fuzzy match (1.0 disables it)
+            min_fuzzy_length: Normalized names shorter than this (acronyms) are never fuzzy-matched
+            max_indexed: Max canonical entities kept in the in-memory index
+        """
+        self.cache = cache
+        self.wikipedia_service = wikipedia_service
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_indexed = max_indexed
+        self.aliases = {
+            normalize_entity_name(alias): canonical
+            for alias, canonical in {**DEFAULT_ALIASES, **(aliases or {})}.items()
+        }
+
+        self._lock = threading.Lock()
+        self._batch = threading.local()  # cache writes deferred by resolve_graph
+        self._keys = OrderedDict()  # normalized name -> canonical ID, LRU
+        self._records = OrderedDict()  # canonical ID -> record, LRU
+        self._postings = {}  # trigram -> canonical IDs
+        self._counts = {"memory": 0, "cache": 0, "alias": 0, "wikipedia": 0, "fuzzy": 0, "created": 0}
+
+    # ---------------- index ----------------
+
+    def _index(self, record):
+        with self._lock:
+            if record["id"] in self._records:
+                self._records.move_to_end(record["id"])
+                self._records[record["id"]] = record
+                return
+            self._records[record["id"]] = record
+            for gram in trigrams(record["key"]):
+                self._postings.setdefault(gram, set()).add(record["id"])
+            while len(self._records) > self.max_indexed:
+                old_id, old = self._records.popitem(last=False)
+                for gram in trigrams(old["key"]):
+                    ids = self._postings.get(gram)
+                    if ids is not None:
+                        ids.discard(old_id)
+                        if not ids:
+                            del self._postings[gram]
+
+    def _fuzzy_match(self, key, entity_type):
+        """Best indexed canonical record sharing enough trigrams with `key`, or None"""
+        if len(key) < self.min_fuzzy_length or self.fuzzy_threshold >= 1.0:
+            return None
+        grams = trigrams(key)
+        shared = {}
+        with self._lock:
+            for gram in grams:
+                for canonical_id in self._postings.get(gram, ()):
+                    shared[canonical_id] = shared.get(canonical_id, 0) + 1
+            candidates = [(self._records[cid], count) for cid, count in shared.items()]
+
+        best, best_score = None, self.fuzzy_threshold
+        for record, count in candidates:
+            if not _compatible_types(record.get("type"), entity_type):
+                continue
+            if "PERSON" in (record.get("type"), entity_type) and _different_people(key, record["key"]):
+                continue
+            score = 2 * count / (len(grams) + len(trigrams(record["key"])))
+            if score >= best_score:
+                best, best_score = record, score
+        return best
+
+    # ---------------- persistence ----------------
+
+    def _load_key(self, key):
+        """Canonical record a normalized name is bound to (memory first, then the cache)"""
+        with self._lock:
+            canonical_id = self._keys.get(key)
+            record = self._records.get(canonical_id) if canonical_id else None
+        if record is not None:
+            return record, "memory"
+        if self.cache is None:
+            return None, None
+        canonical_id = self.cache.get(f"k:{key}")
+        record = self.cache.get(f"c:{canonical_id}") if canonical_id else None
+        if record is None:
+            return None, None
+        self._index(record)
+        self._remember_key(key, canonical_id)
+        return record, "cache"
+
+    def _remember_key(self, key, canonical_id):
+        with self._lock:
+            self._keys[key] = canonical_id
+            self._keys.move_to_end(key)
+            # Keys of evicted records simply fall through to the cache
+            while len(self._keys) > 4 * self.max_indexed:
+                self._keys.popitem(last=False)
+
+    def _write(self, key, value):
+        if self.cache is None:
+            return
+        pending = getattr(self._batch, "pending", None)
+        if pending is not None:
+            pending[key] = value
+        else:
+            self.cache.set(key, value)
+
+    def _bind(self, key, record):
+        self._remember_key(key, record["id"])
+        self._write(f"k:{key}", record["id"])
+
+    def _save(self, record):
+        self._index(record)
+        self._write(f"c:{record['id']}", record)
+
+    def _create(self, key, name, entity_type):
+        """New canonical record for normalized `key`, displayed as `name`"""
+        record = {
+            "id": key.replace(" ", "_"),
+            "key": key,
+            "name": name,
+            "type": entity_type or "OTHER",
+            "aliases": []
+        }
+        self._save(record)
+        self._bind(key, record)
+        return record
+
+    def _wikipedia_title(self, name):
+        if self.wikipedia_service is None:
+            return None
+        try:
+            title = self.wikipedia_service.known_title(name)
+        except Exception as e:
+            print(f"⚠️ Wikipedia title lookup failed for {name}: {e}")
+            return None
+        # A disambiguation page doesn't identify the entity
+        if title and "(disambiguation)" in title:
+            return None
+        return title
+
+    # ---------------- public API ----------------
+
+    def resolve(self, name, entity_type=None):
+        """
+        Canonical entity for one surface form
+
+        Returns:
+            {"id", "name", "type"} or None for an empty name
+        """
+        key = normalize_entity_name(name)
+        if not key:
+            return None
+
+        record, source = self._load_key(key)
+        if record is None:
+            # Alias table and Wikipedia redirects name the canonical entity outright
+            title = self.aliases.get(key)
+            source = "alias"
+            if title is None:
+                title = self._wikipedia_title(name)
+                source = "wikipedia"
+            target_key = normalize_entity_name(title) if title else key
+            if target_key != key:
+                record, _ = self._load_key(target_key)
+            if record is None:
+                record = self._fuzzy_match(target_key, entity_type)
+                if record is not None:
+                    source = source if title else "fuzzy"
+                    if target_key != key:
+                        self._bind(target_key, record)
+            if record is None:
+                record = self._create(target_key, title or name.strip(), entity_type)
+                source = source if title else "created"
+            self._bind(key, record)
+
+        changed = False
+        if name != record["name"] and name not in record["aliases"] and len(record["aliases"]) < MAX_ALIASES:
+            record = {**record, "aliases": record["aliases"] + [name]}
+            changed = True
+        if record.get("type") == "OTHER" and entity_type and entity_type != "OTHER":
+            record = {**record, "type": entity_type}
+            changed = True
+        if changed:
+            self._save(record)
+
+        with self._lock:
+            self._counts[source] += 1
+        return {"id": record["id"], "name": record["name"], "type": record["type"]}
+
+    def resolve_graph(self, entities, relations):
+        """
+        Merge entities that resolve to the same canonical entity and point
+        relations at the canonical names
+
+        Each entity gets `canonical_id` and the surface forms it absorbed in
+        `aliases`; the first occurrence keeps its position and context.
+        Relations that become self-loops or duplicates are dropped. Safe to
+        call again on an already resolved graph. New names and aliases are
+        written to the cache in one batch at the end.
+
+        Returns:
+            (entities, relations)
+        """
+        self._batch.pending = {}
+        try:
+            return self._resolve_graph(entities, relations)
+        finally:
+            pending, self._batch.pending = self._batch.pending, None
+            if pending and self.cache is not None:
+                self.cache.set_many(pending.items())
+
+    def _resolve_graph(self, entities, relations):
+        merged = {}
+        names = {}
+        resolved_entities = []
+        for entity in entities:
+            name = entity.get("name", "")
+            record = self.resolve(name, entity.get("type"))
+            if record is None:
+                resolved_entities.append(entity)
+                continue
+            names[name] = record["name"]
+            aliases = [a for a in entity.get("aliases") or [] if a != record["name"]]
+            if name != record["name"] and name not in aliases:
+                aliases.append(name)
+
+            existing = merged.get(record["id"])
+            if existing is None:
+                entity = {**entity, "name": record["name"], "canonical_id": record["id"], "aliases": aliases}
+                if entity.get("type", "OTHER") == "OTHER" and record["type"] != "OTHER":
+                    entity["type"] = record["type"]
+                merged[record["id"]] = entity
+                resolved_entities.append(entity)
+                continue
+            for alias in aliases:
+                if alias != existing["name"] and alias not in existing["aliases"]:
+                    existing["aliases"].append(alias)
+            if existing.get("type", "OTHER") == "OTHER" and entity.get("type"):
+                existing["type"] = entity["type"]
+            if not existing.get("context") and entity.get("context"):
+                existing["context"] = entity["context"]
+
+        resolved_relations = []
+        seen = set()
+        for relation in relations:
+            source, target = relation.get("source", ""), relation.get("target", "")
+            for endpoint in (source, target):
+                if endpoint and endpoint not in names:
+                    record = self.resolve(endpoint)
+                    names[endpoint] = record["name"] if record else endpoint
+            source, target = names.get(source, source), names.get(target, target)
+            triple = (source, relation.get("relationship"), target)
+            if (source == target and relation.get("source") != relation.get("target")) or triple in seen:
+                continue
+            seen.add(triple)
+            resolved_relations.append({**relation, "source": source, "target": target})
+
+        return resolved_entities, resolved_relations
+
+    def stats(self):
+        with self._lock:
+            stats = {"enabled": True, "resolved": dict(self._counts)}
+            stats["indexed_entities"] = len(self._records)
+            stats["indexed_trigrams"] = len(self._postings)
+        stats["fuzzy_threshold"] = self.fuzzy_threshold
+        stats["store"] = self.cache.stats() if self.cache is not None else {"enabled": False}
+        return stats
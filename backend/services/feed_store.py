@@ -0,0 +1,111 @@
+from urllib.parse import urlparse
+import threading
+import time
+
+import feedparser
+
+from services.cache_store import MemoryCache, SingleFlight
+from services.rate_limiter import HostRateLimiter
+from services.metrics import stage_timer
+
+
+def _entry_to_dict(entry):
+    """Keep the feedparser entry fields the app reads, in a JSON-serializable form"""
+    source = entry.get('source') or {}
+    return {
+        'title': entry.get('title', ''),
+        'link': entry.get('link', ''),
+        'published': entry.get('published', ''),
+        'summary': entry.get('summary', entry.get('description', '')),
+        'source': {'title': source.get('title', ''), 'href': source.get('href', '')}
+    }
+
+
+class FeedStore:
+    """
+    Persistent RSS/Atom feed store keyed by feed URL.
+
+    Within `ttl` seconds a feed is served straight from the store. After that
+    it is revalidated with a conditional GET (If-None-Match / If-Modified-Since),
+    so an unchanged feed costs a 304 instead of a download and re-parse. If
+    the origin fails, the last stored copy is served. Requests are spaced per
+    host by a HostRateLimiter, and concurrent requests for one URL share a
+    single fetch.
+    """
+
+    def __init__(self, http_client, cache=None, ttl=900, rate_limiter=None):
+        """
+        Args:
+            http_client: Shared HttpClient
+            cache: CacheBackend holding {"entries", "etag", "last_modified", "fetched_at"}
+                per URL; its own TTL should be longer than `ttl` so validators survive
+            ttl: Seconds a stored feed is served without revalidating
+            rate_limiter: HostRateLimiter applied to every network request
+        """
+        self.http_client = http_client
+        self.cache = cache if cache is not None else MemoryCache(namespace="feeds", max_entries=2000)
+        self.ttl = ttl
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self._flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self._counts = {"fresh": 0, "not_modified": 0, "fetched": 0, "stale": 0, "errors": 0}
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._counts[key] += 1
+
+    def get_entries(self, url):
+        """Return the feed's entries as a list of dicts (title, link, published, summary, source)"""
+        stored = self.cache.get(url)
+        if stored is not None and time.time() - stored["fetched_at"] < self.ttl:
+            self._count("fresh")
+            return stored["entries"]
+        return self._flight.do(url, lambda: self._refresh(url, stored))
+
+    def _refresh(self, url, stored):
+        headers = {}
+        if stored is not None:
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+
+        try:
+            self.rate_limiter.acquire(urlparse(url).netloc)
+            with stage_timer("rss_fetch"):
+                response = self.http_client.get(url, headers=headers)
+
+            if response.status_code == 304 and stored is not None:
+                stored["fetched_at"] = time.time()
+                self.cache.set(url, stored)
+                self._count("not_modified")
+                return stored["entries"]
+
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
+            entries = [_entry_to_dict(entry) for entry in feed.entries]
+            self.cache.set(url, {
+                "entries": entries,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time()
+            })
+            self._count("fetched")
+            return entries
+
+        except Exception:
+            self._count("errors")
+            if stored is not None:
+                self._count("stale")
+                return stored["entries"]
+            raise
+
+    def stats(self):
+        with self._stats_lock:
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "ttl_seconds": self.ttl,
+            "store": self.cache.stats(),
+            "rate_limiter": self.rate_limiter.stats()
+        }
@@ -0,0 +1,194 @@
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def build_graph(entities: List[Dict], relations: List[Dict]):
+    """
+    Build an undirected graph from knowledge graph entities/relations
+
+    Returns:
+        (nodes, edges) where nodes is an ordered list of names and edges is a
+        list of (source, target) name pairs
+    """
+    nodes = []
+    seen = set()
+
+    def add(name):
+        if name and name not in seen:
+            seen.add(name)
+            nodes.append(name)
+
+    # Add entity nodes
+    for entity in entities:
+        add(entity.get('name', ''))
+
+    # Add relation edges
+    edges = []
+    for relation in relations:
+        source = relation.get('source', '')
+        target = relation.get('target', '')
+        if source and target:
+            add(source)
+            add(target)
+            edges.append((source, target))
+
+    return nodes, edges
+
+
+class GraphEmbedder:
+    """Turns a knowledge graph into a single fixed-size vector"""
+
+    name = "base"
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def embed(self, entities: List[Dict], relations: List[Dict]) -> Optional[np.ndarray]:
+        """Return a (dim,) float32 vector, or None when the graph is too small to embed"""
+        raise NotImplementedError
+
+
+class Node2VecEmbedder(GraphEmbedder):
+    """Original path: train a fresh Node2Vec/Word2Vec model per graph and mean-pool node vectors"""
+
+    name = "node2vec"
+
+    def __init__(self, dim: int = 512, walk_length: int = 30, num_walks: int = 100,
+                 window: int = 10, epochs: int = 10, workers: int = 2):
+        super().__init__(dim)
+        self.walk_length = walk_length
+        self.num_walks = num_walks
+        self.window = window
+        self.epochs = epochs
+        self.workers = workers
+
+    def embed(self, entities, relations):
+        import networkx as nx
+        from node2vec import Node2Vec
+
+        # Build NetworkX graph
+        G = nx.Graph()
+        for entity in entities:
+            if entity.get('name', ''):
+                G.add_node(entity['name'], type=entity.get('type', 'UNKNOWN'))
+        for relation in relations:
+            if relation.get('source', '') and relation.get('target', ''):
+                G.add_edge(relation['source'], relation['target'], relationship=relation.get('relationship', 'related'))
+
+        print(f"📊 Graph built: {len(G.nodes())} nodes, {len(G.edges())} edges")
+
+        if len(G.nodes()) < 2:
+            return None
+
+        print("🔄 Running Node2Vec...")
+        node2vec = Node2Vec(
+            G,
+            dimensions=self.dim,
+            walk_length=self.walk_length,
+            num_walks=self.num_walks,
+            workers=self.workers,
+            quiet=True
+        )
+
+        # Train the model
+        model = node2vec.fit(
+            window=self.window,
+            min_count=1,
+            epochs=self.epochs
+        )
+
+        # Aggregate node embeddings (mean pooling)
+        node_embeddings = [model.wv[node] for node in G.nodes() if node in model.wv]
+        if not node_embeddings:
+            return None
+
+        return np.mean(node_embeddings, axis=0).astype(np.float32)
+
+
+class FastRPEmbedder(GraphEmbedder):
+    """
+    Deterministic random-projection graph embedding (FastRP-style).
+
+    Each node gets a fixed pseudo-random base vector derived from a hash of
+    its name, so the same entity always projects to the same direction. Base
+    vectors are propagated over the normalized adjacency matrix for a few
+    hops (the closed-form counterpart of averaging over random walks), node
+    vectors are L2-normalized, and the graph vector is their mean. A ~15 node
+    graph embeds in well under a millisecond.
+    """
+
+    name = "fast"
+
+    def __init__(self, dim: int = 512, hop_weights=(1.0, 1.0, 0.5, 0.25), scale: float = 1.0):
+        """
+        Args:
+            dim: Output size (must match the Keras graph input)
+            hop_weights: Weight of the 0-hop (self), 1-hop, 2-hop, ... propagation terms
+            scale: Multiplier on the final vector, to match the magnitude the
+                downstream model was trained on (see benchmarks/bench_graph_embedding.py)
+        """
+        super().__init__(dim)
+        self.hop_weights = hop_weights
+        self.scale = scale
+        self._base_cache = {}
+
+    def _base_vector(self, name: str) -> np.ndarray:
+        vector = self._base_cache.get(name)
+        if vector is None:
+            seed = int.from_bytes(hashlib.blake2b(name.lower().encode(), digest_size=8).digest(), "little")
+            rng = np.random.default_rng(seed)
+            # Very sparse {-1, 0, +1} projection (Achlioptas / Li et al.)
+            s = 3.0
+            vector = rng.choice(
+                np.array([-1.0, 0.0, 1.0], dtype=np.float32),
+                size=self.dim,
+                p=[1 / (2 * s), 1 - 1 / s, 1 / (2 * s)]
+            ) * np.float32(np.sqrt(s))
+            if len(self._base_cache) < 50000:
+                self._base_cache[name] = vector
+        return vector
+
+    def embed(self, entities, relations):
+        nodes, edges = build_graph(entities, relations)
+        if len(nodes) < 2:
+            return None
+
+        index = {name: i for i, name in enumerate(nodes)}
+        n = len(nodes)
+
+        adjacency = np.zeros((n, n), dtype=np.float32)
+        for source, target in edges:
+            i, j = index[source], index[target]
+            if i != j:
+                adjacency[i, j] = 1.0
+                adjacency[j, i] = 1.0
+
+        # Row-normalized transition matrix (isolated nodes keep a zero row)
+        degree = adjacency.sum(axis=1, keepdims=True)
+        transition = np.divide(adjacency, degree, out=np.zeros_like(adjacency), where=degree > 0)
+
+        current = np.stack([self._base_vector(name) for name in nodes])
+        node_vectors = self.hop_weights[0] * current
+        for weight in self.hop_weights[1:]:
+            current = transition @ current
+            node_vectors = node_vectors + weight * current
+
+        norms = np.linalg.norm(node_vectors, axis=1, keepdims=True)
+        node_vectors = np.divide(node_vectors, norms, out=np.zeros_like(node_vectors), where=norms > 0)
+
+        return (node_vectors.mean(axis=0) * self.scale).astype(np.float32)
+
+
+GRAPH_EMBEDDERS = {
+    Node2VecEmbedder.name: Node2VecEmbedder,
+    FastRPEmbedder.name: FastRPEmbedder,
+}
+
+
+def create_graph_embedder(mode: str = "node2vec", dim: int = 512, **kwargs) -> GraphEmbedder:
+    """Build a graph embedder by mode name ("node2vec" or "fast")"""
+    if mode not in GRAPH_EMBEDDERS:
+        raise ValueError(f"Unknown graph embedding mode: {mode} (choose from {', '.join(GRAPH_EMBEDDERS)})")
+    return GRAPH_EMBEDDERS[mode](dim=dim, **kwargs)
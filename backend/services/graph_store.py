@@ -0,0 +1,171 @@
+from collections import OrderedDict
+import json
+import secrets
+import threading
+import time
+
+
+class KnowledgeGraphSession:
+    """
+    One generated knowledge graph with lookup indexes built once.
+
+    Wraps the `extraction_data` dict returned by /knowledge-graph (entities,
+    relations, rss_articles, wikipedia_data) so node clicks and chat turns
+    are dict lookups instead of scans over the whole payload.
+    """
+
+    def __init__(self, extraction_data):
+        self.entities = extraction_data.get("entities", []) or []
+        self.relations = extraction_data.get("relations", []) or []
+        self.rss_articles = extraction_data.get("rss_articles", []) or []
+        self.wikipedia_data = extraction_data.get("wikipedia_data", {}) or {}
+
+        # First entity with a name wins (same as scanning in order)
+        self.entities_by_name = {}
+        for entity in self.entities:
+            self.entities_by_name.setdefault(entity.get("name"), entity)
+
+        # Surface forms merged into a canonical entity ("U.S." -> "United States")
+        self.canonical_names = {}
+        for entity in self.entities:
+            for alias in entity.get("aliases") or []:
+                if alias not in self.entities_by_name:
+                    self.canonical_names.setdefault(alias, entity.get("name"))
+
+        # Relations touching each node, in original order
+        self.relations_by_node = {}
+        for relation in self.relations:
+            source, target = relation.get("source"), relation.get("target")
+            self.relations_by_node.setdefault(source, []).append(relation)
+            if target != source:
+                self.relations_by_node.setdefault(target, []).append(relation)
+
+        self.rss_by_entity = {}
+        for article in self.rss_articles:
+            self.rss_by_entity.setdefault(article.get("entity"), []).append(article)
+
+        self._memo = {}
+
+    def canonical_name(self, name):
+        """Name the graph uses for `name` (itself unless it is a merged alias)"""
+        return self.canonical_names.get(name, name)
+
+    def node(self, name):
+        """
+        Returns:
+            (entity dict or None, relations, rss articles, wikipedia info) for one node label
+        """
+        name = self.canonical_name(name)
+        return (
+            self.entities_by_name.get(name),
+            self.relations_by_node.get(name, []),
+            self.rss_by_entity.get(name, []),
+            self.wikipedia_data.get(name, {})
+        )
+
+    def cached(self, key, build):
+        """Memoize a value derived from this graph (e.g. the chat prompt context)"""
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = build(self)
+        return value
+
+    def to_dict(self):
+        return {
+            "entities": self.entities,
+            "relations": self.relations,
+            "rss_articles": self.rss_articles,
+            "wikipedia_data": self.wikipedia_data
+        }
+
+
+class GraphStore:
+    """
+    Server-side store of generated knowledge graphs, addressed by graph ID.
+
+    The raw extraction data goes to a CacheBackend (TTL + max_entries, and
+    shared between uvicorn workers with the sqlite backend). Indexed
+    KnowledgeGraphSession objects are kept in an in-process LRU bounded by
+    count and approximate JSON size; a worker that didn't create a graph
+    rebuilds its session from the cache on first use.
+    """
+
+    def __init__(self, cache, ttl=3600, max_sessions=256, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            cache: CacheBackend holding extraction data by graph ID (should use the same ttl)
+            ttl: Seconds a graph stays addressable after it was created
+            max_sessions: Max indexed graphs kept in memory
+            max_bytes: Max total (JSON) size of indexed graphs kept in memory
+        """
+        self.cache = cache
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()  # graph_id -> (session, size, expires_at)
+        self._bytes = 0
+        self._counts = {"created": 0, "memory_hits": 0, "rebuilt": 0, "misses": 0, "evicted": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _remember(self, graph_id, session, size, expires_at):
+        with self._lock:
+            old = self._sessions.pop(graph_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._sessions[graph_id] = (session, size, expires_at)
+            self._bytes += size
+            while self._sessions and (len(self._sessions) > self.max_sessions or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._sessions.popitem(last=False)
+                self._bytes -= evicted_size
+                self._counts["evicted"] += 1
+
+    def put(self, extraction_data):
+        """Store a graph and return its new ID"""
+        graph_id = secrets.token_urlsafe(16)
+        payload = {"data": extraction_data, "expires_at": time.time() + self.ttl}
+        size = len(json.dumps(extraction_data, default=str))
+        self.cache.set(graph_id, payload)
+        self._remember(graph_id, KnowledgeGraphSession(extraction_data), size, payload["expires_at"])
+        self._count("created")
+        return graph_id
+
+    def get(self, graph_id):
+        """Indexed session for `graph_id`, or None if unknown or expired"""
+        if not graph_id:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(graph_id)
+            if entry is not None:
+                if entry[2] > now:
+                    self._sessions.move_to_end(graph_id)
+                    self._counts["memory_hits"] += 1
+                    return entry[0]
+                self._sessions.pop(graph_id)
+                self._bytes -= entry[1]
+
+        payload = self.cache.get(graph_id)
+        if payload is None or payload.get("expires_at", 0) <= now:
+            self._count("misses")
+            return None
+
+        session = KnowledgeGraphSession(payload["data"])
+        self._remember(graph_id, session, len(json.dumps(payload["data"], default=str)), payload["expires_at"])
+        self._count("rebuilt")
+        return session
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts)
+            stats["sessions_in_memory"] = len(self._sessions)
+            stats["memory_bytes"] = self._bytes
+        stats["ttl_seconds"] = self.ttl
+        stats["max_sessions"] = self.max_sessions
+        stats["max_bytes"] = self.max_bytes
+        stats["store"] = self.cache.stats()
+        return stats
@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+
+from services.metrics import stage_timer
+
+
+class GraphWriteBehind:
+    """
+    Background writer that persists generated knowledge graphs to Neo4j.
+
+    /knowledge-graph enqueues and returns immediately; a daemon thread drains
+    the queue and writes up to `batch_size` articles per transaction with
+    Neo4jService.create_knowledge_graphs. Articles stored less than `max_age`
+    seconds ago are skipped, so a graph generated twice (e.g. by two
+    workers) isn't written twice; older ones are rewritten, since the app
+    regenerates graphs past that age. When the queue is full new graphs are dropped (they are
+    simply regenerated next time) rather than blocking requests.
+    """
+
+    def __init__(self, neo4j_service, batch_size=20, max_queue=1000, flush_interval=1.0, max_retries=3,
+                 max_age=0):
+        """
+        Args:
+            neo4j_service: Connected Neo4jService
+            batch_size: Max articles per write transaction
+            max_queue: Pending graphs kept before new ones are dropped
+            flush_interval: Max seconds a graph waits for a batch to fill
+            max_retries: Write attempts per batch before its graphs are dropped
+            max_age: Seconds after which a stored graph is rewritten (0 = never)
+        """
+        self.neo4j_service = neo4j_service
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.max_age = max_age
+
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="graph-writer", daemon=True)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "skipped_existing": 0,
+            "dropped": 0,
+            "batches": 0,
+            "errors": 0,
+            "last_error": None
+        }
+        self._thread.start()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def enqueue(self, article_id, extraction_result, title, url):
+        """Queue one graph for persistence; returns False if it was dropped or already queued"""
+        with self._pending_lock:
+            if article_id in self._pending:
+                return False
+            self._pending.add(article_id)
+        try:
+            self._queue.put_nowait({
+                "article_id": article_id,
+                "extraction_result": extraction_result,
+                "title": title,
+                "url": url
+            })
+        except queue.Full:
+            with self._pending_lock:
+                self._pending.discard(article_id)
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _collect(self):
+        """Block for the first item, then take more until the batch is full or flush_interval passes"""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        ids = [item["article_id"] for item in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with stage_timer("neo4j_write"):
+                    existing = self.neo4j_service.existing_article_ids(ids, max_age=self.max_age)
+                    fresh = [item for item in batch if item["article_id"] not in existing]
+                    if fresh:
+                        self.neo4j_service.create_knowledge_graphs(fresh, batch_size=self.batch_size)
+                self._count("batches")
+                self._count("written", len(fresh))
+                self._count("skipped_existing", len(batch) - len(fresh))
+                return
+            except Exception as e:
+                message = str(e)[:200]
+                print(f"⚠️ Neo4j write failed (attempt {attempt}/{self.max_retries}): {message}")
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = message
+                if attempt < self.max_retries and not self._stop.is_set():
+                    self._stop.wait(2 * attempt)
+        self._count("dropped", len(batch))
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            finally:
+                with self._pending_lock:
+                    self._pending.difference_update(item["article_id"] for item in batch)
+
+    def stop(self, timeout=5.0):
+        """Flush what is queued (up to `timeout` seconds) and stop the thread"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        stats["batch_size"] = self.batch_size
+        stats["max_age"] = self.max_age
+        stats["running"] = self._thread.is_alive()
+        return stats
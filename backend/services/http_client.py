@@ -0,0 +1,139 @@
+from urllib.parse import urlparse
+import os
+import threading
+import time
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.latency import LatencyWindow
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; NewsKGAnalyzer/1.0)"
+
+
+class HttpClient:
+    """
+    Shared outbound HTTP client.
+
+    One requests.Session with keep-alive connection pools per host, a default
+    timeout, retry/backoff for idempotent requests and per-host latency
+    tracking. Every service goes through it so TLS handshakes are paid once
+    per host instead of once per call.
+    """
+
+    def __init__(self, pool_connections=32, pool_maxsize=16, connect_timeout=3.05,
+                 read_timeout=10, retries=2, backoff_factor=0.3, user_agent=DEFAULT_USER_AGENT,
+                 latency_window=500):
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+            respect_retry_after_header=True
+        )
+        # pool_connections = number of per-host pools kept alive, pool_maxsize = sockets per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"User-Agent": user_agent})
+
+        # For probes (retry=False): no retries, so a read timeout surfaces as Timeout right away
+        probe_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.probe_session = requests.Session()
+        self.probe_session.mount("https://", probe_adapter)
+        self.probe_session.mount("http://", probe_adapter)
+        self.probe_session.headers.update({"User-Agent": user_agent})
+
+        self._latency_window = latency_window
+        self._host_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def request(self, method, url, retry=True, **kwargs):
+        """
+        Send a request through the pooled session, recording per-host latency
+
+        Args:
+            retry: False skips retry/backoff (one attempt, bounded by the timeout)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlparse(url).netloc or "unknown"
+        session = self.session if retry else self.probe_session
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except Exception:
+            self._record(host, time.perf_counter() - start, error=True)
+            raise
+        self._record(host, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def fetch_feed(self, url, **kwargs):
+        """Download an RSS/Atom feed over the pooled session and parse it"""
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return feedparser.parse(response.content)
+
+    def _record(self, host, elapsed, error=False):
+        window = self._host_stats.get(host)
+        if window is None:
+            with self._stats_lock:
+                window = self._host_stats.setdefault(host, LatencyWindow(self._latency_window))
+        window.record(elapsed, error=error)
+
+    def host_stats(self):
+        """Per-host request counts and latency (ms) over the recent sample window"""
+        with self._stats_lock:
+            windows = dict(self._host_stats)
+        report = {}
+        for host, window in windows.items():
+            summary = window.summary()
+            report[host] = {
+                "requests": summary["count"],
+                "errors": summary["errors"],
+                "avg_ms": summary["avg_ms"],
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+                "max_ms": summary["max_ms"]
+            }
+        return report
+
+    def close(self):
+        self.session.close()
+        self.probe_session.close()
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Get the process-wide HttpClient, configured from environment variables"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient(
+                    pool_connections=int(os.getenv("HTTP_POOL_HOSTS", "32")),
+                    pool_maxsize=int(os.getenv("HTTP_POOL_SIZE", "16")),
+                    connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05")),
+                    read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "10")),
+                    retries=int(os.getenv("HTTP_RETRIES", "2")),
+                    backoff_factor=float(os.getenv("HTTP_BACKOFF", "0.3"))
+                )
+    return _http_client
@@ -0,0 +1,120 @@
+import os
+import socket
+import threading
+import time
+
+
+class IngestionWorker:
+    """
+    Background thread that keeps the ArticleStore filled ahead of requests.
+
+    Every `interval` seconds it runs each source (NewsAPI pages, RSS topics),
+    upserts the normalized articles into the store (de-duplicated by id), then
+    verifies the newest unverified articles with `verify_fn`, all off the
+    request path. A lease in the store makes sure only one uvicorn worker
+    process ingests at a time.
+    """
+
+    def __init__(self, store, sources, verify_fn, interval=1800, verify_limit=30,
+                 retention_seconds=7 * 24 * 3600):
+        """
+        Args:
+            store: ArticleStore
+            sources: List of (name, origin, fetch_fn); fetch_fn() returns normalized article dicts
+            verify_fn: Callable taking a list of articles and returning {article_id: verification}
+                for the ones it could verify (failures are retried on the next run)
+            interval: Seconds between ingestion runs
+            verify_limit: Max articles verified per run (bounds Gemini usage)
+            retention_seconds: Articles ingested longer ago than this are pruned
+        """
+        self.store = store
+        self.sources = sources
+        self.verify_fn = verify_fn
+        self.interval = interval
+        self.verify_limit = verify_limit
+        self.retention_seconds = retention_seconds
+
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "runs": 0,
+            "skipped_runs": 0,
+            "ingested": 0,
+            "verified": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_run_seconds": None,
+            "last_error": None
+        }
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="ingestion-worker", daemon=True)
+        self._thread.start()
+        print(f"🛰️ Ingestion worker started ({len(self.sources)} sources, every {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            # Hold the lease for a whole interval so other processes skip this round
+            if self.store.try_acquire_lease("ingestion", self._owner, self.interval + 60):
+                self.run_once()
+            else:
+                with self._stats_lock:
+                    self._stats["skipped_runs"] += 1
+            self._stop.wait(self.interval)
+
+    def _error(self, message):
+        print(f"⚠️ Ingestion: {message}")
+        with self._stats_lock:
+            self._stats["errors"] += 1
+            self._stats["last_error"] = message
+
+    def run_once(self):
+        """Ingest every source, then verify pending articles"""
+        started = time.perf_counter()
+        ingested = 0
+
+        for name, origin, fetch in self.sources:
+            try:
+                articles = fetch()
+                ingested += self.store.upsert_many(articles, origin=origin, topic=name)
+            except Exception as e:
+                self._error(f"source {name} failed: {str(e)[:200]}")
+
+        verified = 0
+        pending = self.store.unverified(limit=self.verify_limit)
+        if pending:
+            try:
+                results = self.verify_fn(pending)
+                self.store.set_verifications(results)
+                verified = len(results)
+            except Exception as e:
+                self._error(f"verification failed: {str(e)[:200]}")
+
+        try:
+            self.store.prune(self.retention_seconds)
+        except Exception as e:
+            self._error(f"prune failed: {str(e)[:200]}")
+
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._stats["runs"] += 1
+            self._stats["ingested"] += ingested
+            self._stats["verified"] += verified
+            self._stats["last_run_at"] = time.time()
+            self._stats["last_run_seconds"] = round(elapsed, 2)
+        print(f"🛰️ Ingestion run: {ingested} new articles, {verified} verified in {elapsed:.1f}s")
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["interval_seconds"] = self.interval
+        stats["sources"] = [name for name, _, _ in self.sources]
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
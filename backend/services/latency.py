@@ -0,0 +1,42 @@
+from collections import deque
+import threading
+
+
+class LatencyWindow:
+    """Thread-safe latency recorder: lifetime count/total/max plus a sliding window for percentiles"""
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.count += 1
+            self.errors += 1 if error else 0
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._samples.append(seconds)
+
+    def summary(self):
+        """Counts plus avg/p50/p95/max latency in milliseconds"""
+        with self._lock:
+            samples = sorted(self._samples)
+            count, errors, total, maximum = self.count, self.errors, self.total, self.max
+
+        def percentile(p):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+        return {
+            "count": count,
+            "errors": errors,
+            "avg_ms": round(total / count * 1000, 2) if count else 0.0,
+            "p50_ms": round(percentile(0.50) * 1000, 2),
+            "p95_ms": round(percentile(0.95) * 1000, 2),
+            "max_ms": round(maximum * 1000, 2)
+        }
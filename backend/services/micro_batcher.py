@@ -0,0 +1,154 @@
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+from services.latency import LatencyWindow
+from services.metrics import STAGE_ERRORS, STAGE_SECONDS
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item calls into batched calls.
+
+    Callers `submit()` one item and get a Future back. A background thread
+    takes the first queued item, keeps collecting for up to `max_wait_ms`
+    (or until `max_batch_size` items are queued), runs `batch_fn` once on the
+    whole list and scatters the results back to the callers' futures.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=16, max_wait_ms=10, name="batcher"):
+        """
+        Args:
+            batch_fn: Callable taking a list of items and returning a list of
+                results of the same length and order
+            max_batch_size: Upper bound on items per batch_fn call
+            max_wait_ms: How long to keep collecting after the first item arrives
+            name: Used for the worker thread name and in stats
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._max_seen = 0
+        self.queue_wait = LatencyWindow()
+        self.batch_latency = LatencyWindow()
+
+        self._worker = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue one item; the returned Future resolves to its result"""
+        if self._stop.is_set():
+            raise RuntimeError(f"{self.name} is shut down")
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Submit one item and block for its result"""
+        return self.submit(item).result(timeout=timeout)
+
+    def map(self, items, timeout=None):
+        """Submit several items at once and wait for all results (in order)"""
+        futures = [self.submit(item) for item in items]
+        return [f.result(timeout=timeout) for f in futures]
+
+    def shutdown(self):
+        self._stop.set()
+        self._queue.put(None)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                self._stop.set()
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            live = []
+            for item, future, enqueued_at in batch:
+                if future.set_running_or_notify_cancel():
+                    self.queue_wait.record(started - enqueued_at)
+                    live.append((item, future))
+            batch = live
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise ValueError(f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                self.batch_latency.record(elapsed, error=True)
+                STAGE_SECONDS.observe(elapsed, stage=f"{self.name}_batch")
+                STAGE_ERRORS.inc(stage=f"{self.name}_batch")
+                with self._stats_lock:
+                    self._errors += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.batch_latency.record(elapsed)
+            STAGE_SECONDS.observe(elapsed, stage=f"{self.name}_batch")
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(items)
+                self._max_seen = max(self._max_seen, len(items))
+
+        # Fail anything still queued after shutdown
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                entry[1].set_exception(RuntimeError(f"{self.name} is shut down"))
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size_seen": self._max_seen,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_wait": self.queue_wait.summary(),
+                "batch_latency": self.batch_latency.summary()
+            }
@@ -1,13 +1,16 @@
-from neo4j import GraphDatabase, exceptions as neo4j_exceptions
+from neo4j import GraphDatabase, Query, exceptions as neo4j_exceptions
+import json
 import os
 import time
 import uuid
 
 class Neo4jService:
-    def __init__(self, uri=None, username=None, password=None):
+    def __init__(self, uri=None, username=None, password=None, write_batch_size=None):
         self.uri = uri or os.getenv("NEO4J_URI", "bolt://localhost:7687")
         self.username = username or os.getenv("NEO4J_USERNAME", "neo4j")
         self.password = password or os.getenv("NEO4J_PASSWORD")
+        # Articles written per transaction by create_knowledge_graphs
+        self.write_batch_size = write_batch_size or int(os.getenv("NEO4J_WRITE_BATCH_SIZE", "50"))
         
         if not self.password:
             raise RuntimeError("NEO4J_PASSWORD not configured")
@@ -29,6 +32,8 @@ class Neo4jService:
                     # Create constraints for better performance
                     session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (a:Article) REQUIRE a.id IS UNIQUE")
                     session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE")
+                    session.run("CREATE INDEX IF NOT EXISTS FOR (a:Article) ON (a.created_at)")
+                    session.run("CREATE INDEX IF NOT EXISTS FOR (e:Entity) ON (e.canonical_id)")
                     result = session.run("RETURN 1 as test")
                     result.consume()
                 
@@ -52,146 +57,229 @@ class Neo4jService:
         if hasattr(self, 'driver'):
             self.driver.close()
     
-    def create_knowledge_graph(self, extraction_result, article_title="Untitled", article_url=""):
-        """Create knowledge graph for specific article in Neo4j"""
-        article_id = str(uuid.uuid4())[:8]  # Generate unique ID for article
-        
-        with self.driver.session() as session:
-            # Create Article node with unique ID
-            session.execute_write(self._create_article_node, article_id, article_title, article_url, extraction_result)
-            
-            # Create Entity nodes linked to article
-            for entity in extraction_result.get("entities", []):
-                session.execute_write(self._create_entity_node, entity, article_id, article_title)
-            
-            # Create Relation edges linked to article
-            for relation in extraction_result.get("relations", []):
-                session.execute_write(self._create_relation, relation, article_id, article_title)
-        
-        return article_id
+    ARTICLES_QUERY = """
+    UNWIND $articles AS art
+    MERGE (a:Article {id: art.id})
+    ON CREATE SET a.created_at = datetime()
+    SET a.title = art.title,
+        a.url = art.url,
+        a.entity_count = art.entity_count,
+        a.relation_count = art.relation_count,
+        a.enrichment = art.enrichment,
+        a.processed_at = datetime()
+    """
     
-    @staticmethod
-    def _create_article_node(tx, article_id, title, url, extraction_result):
-        query = """
-        CREATE (a:Article {
-            id: $article_id,
-            title: $title,
-            url: $url,
-            entity_count: $entity_count,
-            relation_count: $relation_count,
-            processed_at: datetime(),
-            created_at: datetime()
-        })
-        RETURN a
-        """
-        tx.run(query, 
-               article_id=article_id,
-               title=title[:200],
-               url=url[:500],
-               entity_count=len(extraction_result.get("entities", [])),
-               relation_count=len(extraction_result.get("relations", [])))
+    # Rewriting an article refreshes its entities and relations. `write_id` is
+    # unique per write: within one write the first occurrence of a repeated
+    # entity/relation keeps its properties (as separate transactions did), a
+    # later write replaces them.
+    ENTITIES_QUERY = """
+    UNWIND $entities AS ent
+    MATCH (a:Article {id: ent.article_id})
+    MERGE (e:Entity {id: ent.id})
+    ON CREATE SET
+        e.name = ent.name,
+        e.type = ent.type,
+        e.context = ent.context,
+        e.rank = ent.rank,
+        e.canonical_id = ent.canonical_id,
+        e.aliases = ent.aliases,
+        e.write_id = ent.write_id,
+        e.first_seen = datetime(),
+        e.last_seen = datetime(),
+        e.article_id = ent.article_id
+    ON MATCH SET
+        e.type = CASE WHEN e.write_id = ent.write_id THEN e.type ELSE ent.type END,
+        e.context = CASE WHEN e.write_id = ent.write_id THEN e.context ELSE ent.context END,
+        e.rank = CASE WHEN e.write_id = ent.write_id THEN e.rank ELSE ent.rank END,
+        e.canonical_id = CASE WHEN e.write_id = ent.write_id THEN e.canonical_id ELSE ent.canonical_id END,
+        e.aliases = CASE WHEN e.write_id = ent.write_id THEN e.aliases ELSE ent.aliases END,
+        e.write_id = ent.write_id,
+        e.last_seen = datetime(),
+        e.article_id = ent.article_id
+    MERGE (e)-[:IN_ARTICLE]->(a)
+    """
     
-    @staticmethod
-    def _create_entity_node(tx, entity, article_id, article_title):
-        """Create entity node in article's subgraph"""
-        # Generate unique entity ID within article context
-        entity_id = f"{article_id}:{entity.get('name', '')[:50]}"
+    # Rows are applied in order, so a relation repeated within an article
+    # bumps its strength exactly like separate transactions did
+    RELATIONS_QUERY = """
+    UNWIND $relations AS rel
+    MATCH (art:Article {id: rel.article_id})
+    MERGE (a:Entity {id: rel.source_id})
+    ON CREATE SET
+        a.name = rel.source_name,
+        a.first_seen = datetime(),
+        a.last_seen = datetime(),
+        a.article_id = rel.article_id
+    ON MATCH SET
+        a.last_seen = datetime(),
+        a.article_id = rel.article_id
+    MERGE (b:Entity {id: rel.target_id})
+    ON CREATE SET
+        b.name = rel.target_name,
+        b.first_seen = datetime(),
+        b.last_seen = datetime(),
+        b.article_id = rel.article_id
+    ON MATCH SET
+        b.last_seen = datetime(),
+        b.article_id = rel.article_id
+    MERGE (a)-[:IN_ARTICLE]->(art)
+    MERGE (b)-[:IN_ARTICLE]->(art)
+    MERGE (a)-[r:RELATED {id: rel.id}]->(b)
+    ON CREATE SET
+        r.type = rel.relationship,
+        r.context = rel.context,
+        r.rank = rel.rank,
+        r.ranks = [rel.rank],
+        r.write_id = rel.write_id,
+        r.strength = 1,
+        r.last_updated = datetime(),
+        r.article_id = rel.article_id,
+        r.source = rel.source_name,
+        r.target = rel.target_name
+    ON MATCH SET
+        r.type = rel.relationship,
+        r.context = CASE WHEN r.write_id = rel.write_id THEN r.context ELSE rel.context END,
+        r.rank = CASE WHEN r.write_id = rel.write_id THEN r.rank ELSE rel.rank END,
+        r.ranks = CASE WHEN r.write_id = rel.write_id THEN coalesce(r.ranks, [r.rank]) + rel.rank ELSE [rel.rank] END,
+        r.write_id = rel.write_id,
+        r.strength = r.strength + 1,
+        r.last_updated = datetime()
+    """
+    
+    # A rewritten article drops the entities/relations its new extraction no longer has
+    PRUNE_RELATIONS_QUERY = """
+    UNWIND $articles AS art
+    MATCH (:Article {id: art.id})<-[:IN_ARTICLE]-(:Entity)-[r:RELATED]->(:Entity)
+    WHERE r.article_id = art.id AND coalesce(r.write_id, '') <> art.write_id
+    DELETE r
+    """
+    
+    PRUNE_ENTITIES_QUERY = """
+    UNWIND $articles AS art
+    MATCH (e:Entity)-[:IN_ARTICLE]->(:Article {id: art.id})
+    WHERE e.id STARTS WITH art.id + ':' AND coalesce(e.write_id, '') <> art.write_id
+    DETACH DELETE e
+    """
+    
+    def create_knowledge_graph(self, extraction_result, article_title="Untitled", article_url="", article_id=None):
+        """
+        Create knowledge graph for specific article in Neo4j
         
-        query = """
-        MERGE (e:Entity {id: $entity_id})
-        ON CREATE SET 
-            e.name = $name,
-            e.type = $type,
-            e.context = $context,
-            e.first_seen = datetime(),
-            e.last_seen = datetime(),
-            e.article_id = $article_id
-        ON MATCH SET 
-            e.last_seen = datetime(),
-            e.article_id = $article_id
+        The article, its entities and its relations are written in one
+        transaction (one UNWIND statement each) instead of one per item.
         
-        WITH e
-        MATCH (a:Article {id: $article_id})
-        MERGE (e)-[:IN_ARTICLE]->(a)
-        
-        RETURN e
+        Returns:
+            The article ID (a new short UUID unless `article_id` is given)
         """
-        return tx.run(query,
-                     entity_id=entity_id,
-                     name=entity.get("name", "")[:100],
-                     type=entity.get("type", "OTHER")[:50],
-                     context=entity.get("context", "")[:500],
-                     article_id=article_id)
+        return self.create_knowledge_graphs([{
+            "extraction_result": extraction_result,
+            "title": article_title,
+            "url": article_url,
+            "article_id": article_id
+        }], batch_size=1)[0]
     
-    @staticmethod
-    def _create_relation(tx, relation, article_id, article_title):
-        """Create relation between entities in article's subgraph"""
-        source = relation.get("source") or relation.get("from", "")
-        target = relation.get("target") or relation.get("to", "")
-        relationship = relation.get("relationship", "related_to")
+    def create_knowledge_graphs(self, articles, batch_size=None):
+        """
+        Bulk-load many article graphs, `batch_size` articles per transaction
         
-        if not source or not target:
-            return None
+        Args:
+            articles: [{"extraction_result": {...}, "title": ..., "url": ..., "article_id": optional}]
+            batch_size: Articles per transaction (default NEO4J_WRITE_BATCH_SIZE)
         
-        # Create unique IDs for entities in this article's context
-        source_id = f"{article_id}:{source[:50]}"
-        target_id = f"{article_id}:{target[:50]}"
-        relation_id = f"{article_id}:{source[:30]}_{relationship[:20]}_{target[:30]}"
+        Returns:
+            Article IDs in input order
+        """
+        batch_size = max(1, batch_size or self.write_batch_size)
+        payloads = [
+            self._article_rows(
+                item.get("article_id") or str(uuid.uuid4())[:8],
+                item.get("title") or "Untitled",
+                item.get("url") or "",
+                item.get("extraction_result") or {}
+            )
+            for item in articles
+        ]
         
-        query = """
-        // Find or create source entity in this article's subgraph
-        MERGE (a:Entity {id: $source_id})
-        ON CREATE SET 
-            a.name = $source_name,
-            a.first_seen = datetime(),
-            a.last_seen = datetime(),
-            a.article_id = $article_id
-        ON MATCH SET 
-            a.last_seen = datetime(),
-            a.article_id = $article_id
+        with self.driver.session() as session:
+            for start in range(0, len(payloads), batch_size):
+                session.execute_write(self._write_batch, payloads[start:start + batch_size])
         
-        // Find or create target entity in this article's subgraph
-        MERGE (b:Entity {id: $target_id})
-        ON CREATE SET 
-            b.name = $target_name,
-            b.first_seen = datetime(),
-            b.last_seen = datetime(),
-            b.article_id = $article_id
-        ON MATCH SET 
-            b.last_seen = datetime(),
-            b.article_id = $article_id
+        return [payload["article"]["id"] for payload in payloads]
+    
+    @staticmethod
+    def _article_rows(article_id, title, url, extraction_result):
+        """Flatten one article's extraction result into UNWIND parameter rows"""
+        entities = extraction_result.get("entities", [])
+        relations = extraction_result.get("relations", [])
+        write_id = uuid.uuid4().hex
         
-        // Link entities to article
-        WITH a, b
-        MATCH (art:Article {id: $article_id})
-        MERGE (a)-[:IN_ARTICLE]->(art)
-        MERGE (b)-[:IN_ARTICLE]->(art)
+        entity_rows = [{
+            "article_id": article_id,
+            "write_id": write_id,
+            "rank": rank,
+            # Unique entity ID within article context
+            "id": f"{article_id}:{entity.get('name', '')[:50]}",
+            "name": entity.get("name", "")[:100],
+            "type": entity.get("type", "OTHER")[:50],
+            "context": entity.get("context", "")[:500],
+            # Shared by every article mentioning the same entity (see EntityResolver)
+            "canonical_id": entity.get("canonical_id"),
+            "aliases": [alias[:100] for alias in entity.get("aliases") or []]
+        } for rank, entity in enumerate(entities)]
         
-        // Create directed relationship with unique ID
-        MERGE (a)-[r:RELATED {id: $relation_id}]->(b)
-        ON CREATE SET 
-            r.type = $relationship,
-            r.context = $context,
-            r.strength = 1,
-            r.last_updated = datetime(),
-            r.article_id = $article_id,
-            r.source = $source_name,
-            r.target = $target_name
-        ON MATCH SET 
-            r.strength = r.strength + 1,
-            r.last_updated = datetime()
+        relation_rows = []
+        for rank, relation in enumerate(relations):
+            source = relation.get("source") or relation.get("from", "")
+            target = relation.get("target") or relation.get("to", "")
+            relationship = relation.get("relationship", "related_to")
+            if not source or not target:
+                continue
+            relation_rows.append({
+                "article_id": article_id,
+                "write_id": write_id,
+                "rank": rank,
+                "id": f"{article_id}:{source[:30]}_{relationship[:20]}_{target[:30]}",
+                "source_id": f"{article_id}:{source[:50]}",
+                "source_name": source[:100],
+                "target_id": f"{article_id}:{target[:50]}",
+                "target_name": target[:100],
+                "relationship": relationship[:50],
+                "context": relation.get("context", "")[:500]
+            })
         
-        RETURN r
-        """
-        return tx.run(query,
-                     source_id=source_id,
-                     source_name=source[:100],
-                     target_id=target_id,
-                     target_name=target[:100],
-                     relationship=relationship[:50],
-                     context=relation.get("context", "")[:500],
-                     article_id=article_id,
-                     relation_id=relation_id)
+        return {
+            "article": {
+                "id": article_id,
+                "write_id": write_id,
+                "title": title[:200],
+                "url": url[:500],
+                "entity_count": len(entities),
+                "relation_count": len(relations),
+                # RSS/Wikipedia enrichment isn't graph-shaped; kept as JSON on the article
+                "enrichment": json.dumps({
+                    "rss_articles": extraction_result.get("rss_articles", []),
+                    "wikipedia_data": extraction_result.get("wikipedia_data", {})
+                }) if "rss_articles" in extraction_result or "wikipedia_data" in extraction_result else None
+            },
+            "entities": entity_rows,
+            "relations": relation_rows
+        }
+    
+    @classmethod
+    def _write_batch(cls, tx, payloads):
+        """Write several articles' rows in the current transaction"""
+        tx.run(cls.ARTICLES_QUERY, articles=[p["article"] for p in payloads]).consume()
+        entities = [row for p in payloads for row in p["entities"]]
+        if entities:
+            tx.run(cls.ENTITIES_QUERY, entities=entities).consume()
+        relations = [row for p in payloads for row in p["relations"]]
+        if relations:
+            tx.run(cls.RELATIONS_QUERY, relations=relations).consume()
+        # No-ops for articles written for the first time
+        articles = [{"id": p["article"]["id"], "write_id": p["article"]["write_id"]} for p in payloads]
+        tx.run(cls.PRUNE_RELATIONS_QUERY, articles=articles).consume()
+        tx.run(cls.PRUNE_ENTITIES_QUERY, articles=articles).consume()
     
     def get_article_knowledge_graph(self, article_id):
         """Get full knowledge graph for a specific article for chatbot"""
@@ -224,6 +312,81 @@ class Neo4jService:
                 "relations": [r for r in record["relations"] if r["source"]]
             }
     
+    def get_article_extraction(self, article_id, timeout=None):
+        """
+        Stored graph in the /knowledge-graph extraction_data shape, in original order
+        
+        Entities and relations are reached from the Article node (indexed by id),
+        not by scanning every RELATED edge. A relation the extraction listed
+        several times is one edge with all its positions in `ranks`, and is
+        returned once per position.
+        
+        Args:
+            article_id: Article ID the graph was written under
+            timeout: Optional transaction timeout in seconds
+        
+        Returns:
+            {"article_id", "title", "url", "processed_at", "entities", "relations",
+             "rss_articles", "wikipedia_data"}, or None if the article isn't stored;
+            `processed_at` is the epoch seconds of the last write
+        """
+        query = """
+        MATCH (a:Article {id: $article_id})
+        CALL {
+            WITH a
+            OPTIONAL MATCH (e:Entity)-[:IN_ARTICLE]->(a)
+            WHERE e.rank IS NOT NULL
+            WITH e ORDER BY e.rank
+            RETURN collect(e {.name, .type, .context, .canonical_id, .aliases}) AS entities
+        }
+        CALL {
+            WITH a
+            OPTIONAL MATCH (s:Entity)-[:IN_ARTICLE]->(a), (s)-[r:RELATED]->(:Entity)
+            WHERE r.article_id = a.id
+            WITH DISTINCT r
+            UNWIND coalesce(r.ranks, [r.rank]) AS rank
+            WITH r, rank ORDER BY rank
+            RETURN collect(r {source: r.source, target: r.target, relationship: r.type, .context}) AS relations
+        }
+        RETURN a.title AS title, a.url AS url, a.enrichment AS enrichment,
+               a.processed_at.epochSeconds AS processed_at, entities, relations
+        """
+        with self.driver.session() as session:
+            record = session.run(Query(query, timeout=timeout), article_id=article_id).single()
+        
+        if not record:
+            return None
+        
+        enrichment = json.loads(record["enrichment"]) if record["enrichment"] else {}
+        return {
+            "article_id": article_id,
+            "title": record["title"],
+            "url": record["url"],
+            "processed_at": record["processed_at"],
+            "entities": record["entities"],
+            "relations": record["relations"],
+            "rss_articles": enrichment.get("rss_articles", []),
+            "wikipedia_data": enrichment.get("wikipedia_data", {})
+        }
+    
+    def existing_article_ids(self, article_ids, max_age=None):
+        """
+        Subset of `article_ids` that already have an Article node
+        
+        Args:
+            article_ids: Article IDs to check
+            max_age: If set, only count articles written less than this many seconds ago
+        """
+        with self.driver.session() as session:
+            result = session.run(
+                "UNWIND $ids AS id MATCH (a:Article {id: id}) "
+                "WHERE $max_age IS NULL OR a.processed_at >= datetime() - duration({seconds: $max_age}) "
+                "RETURN a.id AS id",
+                ids=list(article_ids),
+                max_age=max_age or None
+            )
+            return {record["id"] for record in result}
+    
     def get_article_graph_visualization(self, article_id, min_connections=0):
         """Get data formatted for network visualization for specific article subgraph"""
         with self.driver.session() as session:
@@ -275,6 +438,28 @@ class Neo4jService:
             
             return {"nodes": nodes, "edges": edges}
     
+    def get_articles_page(self, page=1, page_size=20):
+        """
+        One page of stored articles, newest first (uses the created_at index)
+        
+        Returns:
+            {"articles": [...], "total": int}
+        """
+        with self.driver.session() as session:
+            total = session.run("MATCH (a:Article) RETURN count(a) AS total").single()["total"]
+            result = session.run("""
+            MATCH (a:Article)
+            RETURN a.id AS id,
+                   a.title AS title,
+                   a.url AS url,
+                   a.entity_count AS entity_count,
+                   a.relation_count AS relation_count,
+                   toString(a.created_at) AS created_at
+            ORDER BY a.created_at DESC
+            SKIP $skip LIMIT $limit
+            """, skip=(page - 1) * page_size, limit=page_size)
+            return {"articles": [record.data() for record in result], "total": total}
+    
     def get_all_articles(self):
         """Get list of all articles with metadata"""
         with self.driver.session() as session:
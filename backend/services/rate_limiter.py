@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket.
+
+    `acquire(host)` blocks just long enough to keep each host under `rate`
+    requests per second (with bursts of up to `burst`), so callers no longer
+    need fixed sleeps between requests. Different hosts never wait on each other.
+    """
+
+    def __init__(self, rate=5.0, burst=5):
+        self.rate = max(rate, 0.001)
+        self.burst = max(1, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, host):
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            # Take the token now (possibly going negative) so concurrent callers queue up in order
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+            delay = -tokens / self.rate if tokens < 0 else 0.0
+            if delay:
+                self.waits += 1
+                self.waited_seconds += delay
+
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate_per_host": self.rate,
+                "burst": self.burst,
+                "hosts": len(self._buckets),
+                "waits": self.waits,
+                "waited_seconds": round(self.waited_seconds, 3)
+            }
@@ -1,63 +1,220 @@
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import heapq
 from typing import List, Dict
 
+# Joins candidate texts into one buffer; never part of a keyword
+_SEPARATOR = "\x00"
+
+
+class KeywordMatcher:
+    """
+    Finds which keywords occur (as substrings) in many texts at once.
+
+    All candidates are lowercased once and joined into one buffer. Each
+    keyword is first located in the buffer with a C-level `str.find`: absent
+    keywords cost one scan and nothing else, and rare ones jump from hit to
+    hit (skipping to the next candidate after each). Once a keyword turns out
+    to be common, the remaining candidates are checked with a plain
+    `keyword in text` comprehension, which is cheaper per candidate than
+    jumping. Results are identical to checking every (keyword, text) pair.
+    """
+
+    # Switch from jumping to a linear scan once this fraction of candidates seen so far matched
+    DENSE_FRACTION = 0.1
+    DENSE_MIN_HITS = 16
+    # Below this many candidates, building the joined buffer costs more than it saves
+    SMALL_INPUT = 32
+
+    def __init__(self, keywords):
+        self.keywords = sorted(k for k in set(keywords) if k and _SEPARATOR not in k)
+
+    def match(self, texts: List[str]) -> List[List[int]]:
+        """
+        Returns:
+            For each keyword (in self.keywords order), the indexes of the texts containing it
+        """
+        if not texts:
+            return [[] for _ in self.keywords]
+
+        # Lowercase per text so offsets stay aligned even when lower() changes a text's length
+        lowered = [text.lower() for text in texts]
+        if len(lowered) < self.SMALL_INPUT:
+            return [[i for i, text in enumerate(lowered) if keyword in text] for keyword in self.keywords]
+
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        buffer = _SEPARATOR.join(lowered)
+        last = len(lowered)
+
+        hits = [[] for _ in self.keywords]
+        find = buffer.find
+        for keyword, keyword_hits in zip(self.keywords, hits):
+            pos = find(keyword)
+            while pos != -1:
+                index = bisect_right(starts, pos) - 1
+                keyword_hits.append(index)
+                if index + 1 >= last:
+                    break
+                if len(keyword_hits) >= self.DENSE_MIN_HITS and len(keyword_hits) > self.DENSE_FRACTION * (index + 1):
+                    keyword_hits += [i for i, text in enumerate(lowered[index + 1:], index + 1) if keyword in text]
+                    break
+                pos = find(keyword, starts[index + 1])
+        return hits
+
+    def score(self, texts: List[str], weights: Dict[str, int] = None) -> List[int]:
+        """Sum of keyword weights (default 1) present in each text"""
+        scores = [0] * len(texts)
+        for keyword, indexes in zip(self.keywords, self.match(texts)):
+            weight = weights.get(keyword, 1) if weights else 1
+            for index in indexes:
+                scores[index] += weight
+        return scores
+
+
+@lru_cache(maxsize=256)
+def _get_matcher(keywords: frozenset) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def _top_k(candidates: List[str], scores: List[int], k: int):
+    """Best `k` positive-score candidates; ties keep input order (same as a stable sort)"""
+    ranked = heapq.nlargest(k, (i for i, s in enumerate(scores) if s > 0), key=lambda i: scores[i])
+    return [candidates[i] for i in ranked], [scores[i] for i in ranked]
+
+
 class RelevanceFilter:
     """
-    Simple keyword-based relevance filter.
+    Local relevance filter for enrichment candidates.
     NO API calls, completely FREE!
+
+    "keyword" mode (default) scores candidates by shared keywords. "semantic"
+    mode ranks them by cosine similarity of local sentence embeddings to the
+    article context (see SemanticRanker), and falls back to keywords while the
+    encoder is loading or if it fails.
     """
-    
-    def __init__(self, api_key=None, model_name=None):
-        # Keep signature for compatibility, but don't use API
-        pass
-    
-    def batch_filter_enrichment(self, article_context: Dict, entity_name: str, 
-                               rss_articles: List[str], wikipedia_entities: List[str], 
+
+    def __init__(self, api_key=None, model_name=None, mode="keyword", semantic_ranker=None,
+                 min_similarity=0.7):
+        # api_key / model_name kept for signature compatibility, no API is used
+        self.mode = mode if semantic_ranker is not None else "keyword"
+        self.semantic_ranker = semantic_ranker
+        self.min_similarity = min_similarity
+        self.semantic_fallbacks = 0
+
+    def batch_filter_enrichment(self, article_context: Dict, entity_name: str,
+                               rss_articles: List[str], wikipedia_entities: List[str],
                                max_wiki_results: int = 5, ai_keywords: List[str] = None) -> Dict:
         """
-        Filter enrichment data using advanced keyword matching (FREE, no API calls)
+        Filter enrichment data with the configured mode (FREE, no API calls)
+
+        Returns:
+            {'relevant_rss', 'relevant_wikipedia'} best-first, plus their
+            scores in 'rss_scores' / 'wikipedia_scores'
         """
         if not rss_articles and not wikipedia_entities:
-            return {'relevant_rss': [], 'relevant_wikipedia': []}
-        
-        # Use AI keywords if provided, else fallback to context parsing
+            return {'relevant_rss': [], 'relevant_wikipedia': [], 'rss_scores': [], 'wikipedia_scores': []}
+
+        if self.mode == "semantic":
+            if self.semantic_ranker.ready:
+                try:
+                    return self._semantic_filter(article_context, entity_name, rss_articles,
+                                                 wikipedia_entities, max_wiki_results, ai_keywords)
+                except Exception as e:
+                    print(f"⚠️ Semantic ranking failed, using keywords: {e}")
+            else:
+                # Starts the background load on first use
+                self.semantic_ranker.encoder.start_loading()
+            self.semantic_fallbacks += 1
+
+        return self._keyword_filter(article_context, entity_name, rss_articles,
+                                    wikipedia_entities, max_wiki_results, ai_keywords)
+
+    def _semantic_filter(self, article_context: Dict, entity_name: str,
+                         rss_articles: List[str], wikipedia_entities: List[str],
+                         max_wiki_results: int, ai_keywords: List[str] = None) -> Dict:
+        """
+        Rank candidates by embedding similarity to the article context
+
+        The context, RSS titles and Wikipedia names are embedded in one batch
+        (cached by text hash); candidates below `min_similarity` are dropped.
+        """
+        parts = [article_context.get('title', ''), article_context.get('summary', ''), entity_name]
         if ai_keywords:
-            keywords = {k.lower() for k in ai_keywords}
+            parts.append(", ".join(ai_keywords))
+        query = ". ".join(p for p in parts if p)
+
+        ranker = self.semantic_ranker
+        rss_scores, wiki_scores = ranker.similarities(query, [list(rss_articles), list(wikipedia_entities)])
+        rss_top = ranker.top_k(rss_scores, 5, self.min_similarity)
+        wiki_top = ranker.top_k(wiki_scores, max_wiki_results, self.min_similarity)
+
+        return {
+            'relevant_rss': [rss_articles[i] for i in rss_top],
+            'relevant_wikipedia': [wikipedia_entities[i] for i in wiki_top],
+            'rss_scores': [round(float(rss_scores[i]), 4) for i in rss_top],
+            'wikipedia_scores': [round(float(wiki_scores[i]), 4) for i in wiki_top]
+        }
+
+    def _keyword_filter(self, article_context: Dict, entity_name: str,
+                        rss_articles: List[str], wikipedia_entities: List[str],
+                        max_wiki_results: int = 5, ai_keywords: List[str] = None) -> Dict:
+        """
+        Filter enrichment data using advanced keyword matching
+
+        RSS titles and Wikipedia entity names are matched together by one KeywordMatcher.
+        RSS titles score 2 per AI keyword and 1 per other keyword; Wikipedia
+        names score 1 per keyword.
+
+        Returns:
+            {'relevant_rss', 'relevant_wikipedia'} best-first, plus their
+            scores in 'rss_scores' / 'wikipedia_scores'
+        """
+        # Use AI keywords if provided, else fallback to context parsing
+        ai_keyword_set = {k.lower() for k in ai_keywords} if ai_keywords else set()
+        if ai_keyword_set:
+            keywords = set(ai_keyword_set)
         else:
             title = article_context.get('title', '').lower()
             summary = article_context.get('summary', '').lower()
             context_text = f"{title} {summary}"
-            keywords = {word.lower() for word in context_text.split() if len(word) > 4}
-        
+            keywords = {word for word in context_text.split() if len(word) > 4}
+
         # Add entity name keywords
         for word in entity_name.lower().split():
             if len(word) > 3:
                 keywords.add(word)
-        
-        # Filter RSS articles
-        relevant_rss = []
-        for rss_title in rss_articles:
-            rss_lower = rss_title.lower()
-            # Score based on keyword importance
-            score = sum(2 if (ai_keywords and k in ai_keywords) else 1 
-                        for k in keywords if k in rss_lower)
-            if score > 0:
-                relevant_rss.append((rss_title, score))
-        
-        relevant_rss.sort(key=lambda x: x[1], reverse=True)
-        relevant_rss = [title for title, score in relevant_rss[:5]]
-        
-        # Filter Wikipedia entities
-        relevant_wikipedia = []
-        for wiki_entity in wikipedia_entities:
-            wiki_lower = wiki_entity.lower()
-            score = sum(1 for keyword in keywords if keyword in wiki_lower)
-            if score > 0:
-                relevant_wikipedia.append((wiki_entity, score))
-        
-        relevant_wikipedia.sort(key=lambda x: x[1], reverse=True)
-        relevant_wikipedia = [entity for entity, score in relevant_wikipedia[:max_wiki_results]]
-        
+
+        # One matching pass over RSS titles and Wikipedia names together
+        matcher = _get_matcher(frozenset(keywords))
+        rss_count = len(rss_articles)
+        rss_scores = [0] * rss_count
+        wiki_scores = [0] * len(wikipedia_entities)
+        for keyword, indexes in zip(matcher.keywords, matcher.match(list(rss_articles) + list(wikipedia_entities))):
+            # indexes are ascending: RSS titles first, then Wikipedia names
+            split = bisect_left(indexes, rss_count)
+            rss_weight = 2 if keyword in ai_keyword_set else 1
+            for index in indexes[:split]:
+                rss_scores[index] += rss_weight
+            for index in indexes[split:]:
+                wiki_scores[index - rss_count] += 1
+
+        relevant_rss, rss_top_scores = _top_k(rss_articles, rss_scores, 5)
+        relevant_wikipedia, wiki_top_scores = _top_k(wikipedia_entities, wiki_scores, max_wiki_results)
+
         return {
             'relevant_rss': relevant_rss,
-            'relevant_wikipedia': relevant_wikipedia
+            'relevant_wikipedia': relevant_wikipedia,
+            'rss_scores': rss_top_scores,
+            'wikipedia_scores': wiki_top_scores
         }
+
+    def stats(self) -> Dict:
+        stats = {"mode": self.mode, "semantic_fallbacks": self.semantic_fallbacks}
+        if self.semantic_ranker is not None:
+            stats["min_similarity"] = self.min_similarity
+            stats["semantic"] = self.semantic_ranker.stats()
+        return stats
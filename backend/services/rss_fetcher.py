@@ -1,14 +1,14 @@
-import feedparser
-import requests
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-import time
+from datetime import datetime
 from urllib.parse import quote_plus
-import os
+from services.http_client import get_http_client
+from services.feed_store import FeedStore
 
 class RSSFetcher:
-    def __init__(self):
+    def __init__(self, http_client=None, feed_store=None):
         self.base_url = "https://news.google.com/rss/search?"
+        self.http_client = http_client or get_http_client()
+        # Cached, conditional-GET, per-host rate-limited feed downloads
+        self.feed_store = feed_store or FeedStore(self.http_client)
     
     def fetch_news_by_query(self, query, years_back=2, max_results=10):
         """Fetch historical news for a query over multiple years"""
@@ -25,9 +25,9 @@ class RSSFetcher:
             url = f"{self.base_url}q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
             
             try:
-                feed = feedparser.parse(url)
+                entries = self.feed_store.get_entries(url)
                 
-                for entry in feed.entries[:max(1, max_results//years_back)]:
+                for entry in entries[:max(1, max_results//years_back)]:
                     article = {
                         'title': entry.get('title', ''),
                         'link': entry.get('link', ''),
@@ -38,8 +38,6 @@ class RSSFetcher:
                     }
                     all_articles.append(article)
                     
-                    time.sleep(0.1)
-                    
             except Exception as e:
                 print(f"Error fetching news for year {year}: {e}")
                 continue
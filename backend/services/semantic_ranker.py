@@ -0,0 +1,228 @@
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+from services.latency import LatencyWindow
+
+
+class ClipTextEncoder:
+    """
+    CLIP text tower for sentence embeddings (512-d, L2-normalized), on CPU unless CUDA is available.
+
+    Loads in a background thread on first use; `encode` raises until it is
+    ready so callers can fall back instead of blocking a request on a model
+    download. If `shared_clip` returns (clip_model, tokenizer, device) from an
+    already-loaded FakeNewsDetector, that model is reused instead of loading
+    a second copy. After a failed load, `encode` raises the stored error
+    straight away and the load is only retried after `retry_interval` seconds.
+    """
+
+    def __init__(self, model_name="openai/clip-vit-base-patch32", shared_clip=None, max_length=77,
+                 retry_interval=300):
+        self.model_name = model_name
+        self.shared_clip = shared_clip
+        self.max_length = max_length
+        self.retry_interval = retry_interval
+        self.dim = 512
+
+        self._lock = threading.Lock()
+        self._loading = False
+        self._error = None
+        self._failed_at = None
+        self._encode_fn = None
+        self.source = None
+
+    @property
+    def ready(self):
+        return self._encode_fn is not None
+
+    def start_loading(self):
+        """Kick off the background load (no-op if loading, loaded, or failed less than retry_interval ago)"""
+        with self._lock:
+            if self._encode_fn is not None or self._loading:
+                return
+            if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval:
+                return
+            self._loading = True
+        threading.Thread(target=self._load, name="text-encoder-loader", daemon=True).start()
+
+    def _load(self):
+        try:
+            import torch
+
+            shared = self.shared_clip() if self.shared_clip else None
+            if shared is not None:
+                clip_model, tokenizer, device = shared
+                text_features = clip_model.get_text_features
+                self.source = "shared detector CLIP"
+            else:
+                from transformers import CLIPTokenizer, CLIPTextModelWithProjection
+
+                print(f"🔄 Loading CLIP text encoder ({self.model_name})...")
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                tokenizer = CLIPTokenizer.from_pretrained(self.model_name)
+                text_model = CLIPTextModelWithProjection.from_pretrained(self.model_name).to(device)
+                text_model.eval()
+
+                def text_features(**inputs):
+                    return text_model(**inputs).text_embeds
+
+                self.source = self.model_name
+
+            def encode(texts):
+                with torch.no_grad():
+                    inputs = tokenizer(texts, padding=True, truncation=True,
+                                       max_length=self.max_length, return_tensors="pt").to(device)
+                    embeddings = text_features(**inputs)
+                    embeddings = embeddings / embeddings.norm(p=2, dim=-1, keepdim=True)
+                return embeddings.cpu().numpy().astype(np.float32)
+
+            self._encode_fn = encode
+            self._error = None
+            self._failed_at = None
+            print(f"✅ Text encoder ready ({self.source})")
+        except Exception as e:
+            self._error = str(e)
+            self._failed_at = time.monotonic()
+            print(f"❌ Text encoder failed to load (retrying in {self.retry_interval}s): {e}")
+        finally:
+            with self._lock:
+                self._loading = False
+
+    def encode(self, texts):
+        if self._encode_fn is None:
+            self.start_loading()
+            raise RuntimeError(self._error or "Text encoder is still loading")
+        return self._encode_fn(list(texts))
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "loading": self._loading,
+            "source": self.source,
+            "error": self._error
+        }
+
+
+def text_key(text):
+    """Cache key for a text embedding (whitespace/case-normalized content hash)"""
+    normalized = " ".join(text.lower().split())
+    return "txt:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SemanticRanker:
+    """
+    Rank candidate texts against a query by cosine similarity of cached sentence embeddings.
+
+    All texts missing from the EmbeddingStore are encoded in one batch;
+    repeated candidates (and the article context across entities) are
+    served from the store, keyed by text hash.
+    """
+
+    def __init__(self, encoder, store=None, max_batch=128):
+        """
+        Args:
+            encoder: Object with encode(texts) -> (n, dim) normalized float32 array, and `ready`
+            store: Optional EmbeddingStore for persistent caching (same dim as the encoder)
+            max_batch: Max texts per encoder forward pass
+        """
+        self.encoder = encoder
+        self.store = store
+        self.max_batch = max_batch
+        self._memo = {}
+        self._memo_limit = 4096
+        self._stats_lock = threading.Lock()
+        self.cache_hits = 0
+        self.encoded = 0
+        self.encode_latency = LatencyWindow()
+
+    @property
+    def ready(self):
+        return self.encoder.ready
+
+    def _lookup(self, key):
+        vector = self._memo.get(key)
+        if vector is None and self.store is not None:
+            vector = self.store.get(key)
+            if vector is not None:
+                self._remember(key, vector)
+        return vector
+
+    def _remember(self, key, vector):
+        if len(self._memo) >= self._memo_limit:
+            self._memo.pop(next(iter(self._memo)))
+        self._memo[key] = vector
+
+    def embed(self, texts):
+        """(len(texts), dim) matrix of normalized embeddings, encoding only cache misses"""
+        keys = [text_key(t) for t in texts]
+        vectors = [self._lookup(key) for key in keys]
+
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], texts[i])
+
+        if missing:
+            miss_keys = list(missing)
+            started = time.perf_counter()
+            encoded = []
+            for start in range(0, len(miss_keys), self.max_batch):
+                batch = [missing[k] for k in miss_keys[start:start + self.max_batch]]
+                encoded.extend(self.encoder.encode(batch))
+            self.encode_latency.record(time.perf_counter() - started)
+
+            fresh = dict(zip(miss_keys, encoded))
+            for key, vector in fresh.items():
+                self._remember(key, vector)
+            if self.store is not None:
+                self.store.put_many(([key], vector) for key, vector in fresh.items())
+            vectors = [v if v is not None else fresh[k] for k, v in zip(keys, vectors)]
+
+        with self._stats_lock:
+            self.cache_hits += len(texts) - sum(1 for k in keys if k in missing)
+            self.encoded += len(missing)
+
+        return np.vstack(vectors).astype(np.float32) if vectors else np.zeros((0, self.encoder.dim), np.float32)
+
+    @staticmethod
+    def top_k(scores, k, min_score=None):
+        """Indexes of the k best scores (descending), optionally above a threshold"""
+        if len(scores) == 0 or k <= 0:
+            return []
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        if min_score is not None:
+            ordered = ordered[scores[ordered] >= min_score]
+        return ordered.tolist()
+
+    def similarities(self, query, groups):
+        """
+        Cosine similarity of `query` to every text in each candidate group, from one embedding pass
+
+        Returns:
+            One 1-D score array per group
+        """
+        flat = [query] + [text for group in groups for text in group]
+        matrix = self.embed(flat)
+        scores = matrix[1:] @ matrix[0]
+        result = []
+        offset = 0
+        for group in groups:
+            result.append(scores[offset:offset + len(group)])
+            offset += len(group)
+        return result
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "encoder": self.encoder.status(),
+                "cache_hits": self.cache_hits,
+                "encoded": self.encoded,
+                "memo_size": len(self._memo),
+                "store": self.store.stats() if self.store is not None else None,
+                "encode_latency": self.encode_latency.summary()
+            }
@@ -0,0 +1,156 @@
+import json
+from typing import Dict, List, Optional
+
+from services.http_client import get_http_client
+
+# MediaWiki returns intro extracts for at most 20 pages per request
+MAX_EXTRACTS_PER_QUERY = 20
+
+
+class MediaWikiClient:
+    """
+    Batched page lookups against the MediaWiki action API.
+
+    One `fetch_pages` call resolves several titles at once (normalization and
+    redirects included) and returns intro summary, URL, categories and
+    article links for each, instead of one wikipediaapi round-trip per
+    title and per attribute.
+    """
+
+    def __init__(self, lang="en", http_client=None, max_continuations=3):
+        self.lang = lang
+        self.endpoint = f"https://{lang}.wikipedia.org/w/api.php"
+        self.http_client = http_client or get_http_client()
+        self.max_continuations = max_continuations
+
+    def fetch_pages(self, titles: List[str], with_links: bool = True) -> Dict[str, Optional[Dict]]:
+        """
+        Resolve many titles in as few requests as possible
+
+        Returns:
+            {requested_title: page dict or None if the page does not exist}
+            page dict = {"title", "summary", "url", "categories", "links", "exists": True}
+        """
+        titles = [t for t in dict.fromkeys(titles) if t and t.strip()]
+        results = {}
+        for i in range(0, len(titles), MAX_EXTRACTS_PER_QUERY):
+            results.update(self._fetch_chunk(titles[i:i + MAX_EXTRACTS_PER_QUERY], with_links))
+        return results
+
+    def _fetch_chunk(self, titles, with_links):
+        props = ["extracts", "info", "categories"]
+        if with_links:
+            props.append("links")
+
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            "redirects": "1",
+            "titles": "|".join(titles),
+            "prop": "|".join(props),
+            "exintro": "1",
+            "explaintext": "1",
+            "exlimit": "max",
+            "inprop": "url",
+            "cllimit": "max",
+            "clshow": "!hidden",
+        }
+        if with_links:
+            params["pllimit"] = "max"
+            params["plnamespace"] = "0"
+
+        pages = {}
+        aliases = {}
+        continuation = {}
+        for _ in range(self.max_continuations + 1):
+            response = self.http_client.get(self.endpoint, params={**params, **continuation})
+            response.raise_for_status()
+            data = response.json()
+            query = data.get("query", {})
+
+            for entry in query.get("normalized", []) + query.get("redirects", []):
+                aliases[entry["from"]] = entry["to"]
+
+            for page in query.get("pages", []):
+                title = page.get("title")
+                merged = pages.setdefault(title, {"raw": {}, "categories": [], "links": []})
+                merged["raw"].update({k: v for k, v in page.items() if k not in ("categories", "links")})
+                merged["categories"].extend(c["title"] for c in page.get("categories", []))
+                merged["links"].extend(l["title"] for l in page.get("links", []))
+
+            if "continue" not in data:
+                break
+            continuation = data["continue"]
+
+        results = {}
+        for requested in titles:
+            resolved = requested
+            seen = set()
+            while resolved in aliases and resolved not in seen:
+                seen.add(resolved)
+                resolved = aliases[resolved]
+
+            page = pages.get(resolved)
+            if page is None or page["raw"].get("missing") or page["raw"].get("invalid"):
+                results[requested] = None
+                continue
+
+            raw = page["raw"]
+            results[requested] = {
+                "title": raw.get("title", resolved),
+                "summary": raw.get("extract", "") or "",
+                "url": raw.get("fullurl") or f"https://{self.lang}.wikipedia.org/wiki/{resolved.replace(' ', '_')}",
+                "categories": page["categories"],
+                "links": page["links"],
+                "exists": True
+            }
+        return results
+
+
+class FixtureWikipediaClient:
+    """
+    Offline stand-in for MediaWikiClient backed by a JSON fixture file.
+
+    Fixture format:
+        {
+            "pages": {"Title": {"summary": "...", "url": "...", "categories": [...], "links": [...]}},
+            "redirects": {"Alias": "Title"}
+        }
+
+    Titles are matched exactly, then case-insensitively, as MediaWiki would
+    for the first letter. Use it in tests or local development by setting
+    WIKIPEDIA_FIXTURES to the file path.
+    """
+
+    def __init__(self, fixture_path=None, pages=None, redirects=None, lang="en"):
+        if fixture_path:
+            with open(fixture_path, encoding="utf-8") as f:
+                data = json.load(f)
+            pages = data.get("pages", {})
+            redirects = data.get("redirects", {})
+        self.lang = lang
+        self.pages = pages or {}
+        self.redirects = redirects or {}
+        self._by_lower = {title.lower(): title for title in self.pages}
+        self.requests = 0
+
+    def fetch_pages(self, titles, with_links=True):
+        self.requests += 1
+        results = {}
+        for requested in titles:
+            title = self.redirects.get(requested, requested)
+            title = title if title in self.pages else self._by_lower.get(title.lower())
+            if title is None:
+                results[requested] = None
+                continue
+            page = self.pages[title]
+            results[requested] = {
+                "title": title,
+                "summary": page.get("summary", ""),
+                "url": page.get("url") or f"https://{self.lang}.wikipedia.org/wiki/{title.replace(' ', '_')}",
+                "categories": list(page.get("categories", [])),
+                "links": list(page.get("links", [])) if with_links else [],
+                "exists": True
+            }
+        return results
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+def normalize_title(title):
+    """MediaWiki-style title normalization: underscores to spaces, trimmed, first letter uppercased"""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:] if title else title
+
+
+class WikipediaIndex:
+    """
+    Read-only local Wikipedia index built by tools/build_wiki_index.py.
+
+    A SQLite file with a `pages` table (title -> summary, url, categories,
+    outlinks) and a `redirects` table. Exposes the same `fetch_pages`
+    interface as MediaWikiClient, except that titles not in the index map to
+    None so the caller can fall back to the network.
+    """
+
+    def __init__(self, path, lang="en"):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Wikipedia index not found: {path}")
+        self.path = path
+        self.lang = lang
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        conn = self._conn()
+        self.page_count = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        self.redirect_count = conn.execute("SELECT COUNT(*) FROM redirects").fetchone()[0]
+
+    def _conn(self):
+        # One read-only connection per thread: no lock contention between enrichment workers
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only=ON")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, title, with_links=True):
+        """Resolve one title (following a redirect) to a page dict, or None if not indexed"""
+        conn = self._conn()
+        normalized = normalize_title(title)
+        if not normalized:
+            return None
+
+        columns = "title, summary, url, categories, links" if with_links else "title, summary, url, categories"
+        row = conn.execute(f"SELECT {columns} FROM pages WHERE title = ?", (normalized,)).fetchone()
+        if row is None:
+            target = conn.execute("SELECT target FROM redirects WHERE source = ?", (normalized,)).fetchone()
+            if target is not None:
+                row = conn.execute(f"SELECT {columns} FROM pages WHERE title = ?", (target[0],)).fetchone()
+        if row is None:
+            return None
+
+        return {
+            "title": row[0],
+            "summary": row[1] or "",
+            "url": row[2] or f"https://{self.lang}.wikipedia.org/wiki/{row[0].replace(' ', '_')}",
+            "categories": json.loads(row[3]) if row[3] else [],
+            "links": json.loads(row[4]) if with_links and row[4] else [],
+            "exists": True
+        }
+
+    def fetch_pages(self, titles, with_links=True):
+        results = {title: self.lookup(title, with_links) for title in titles}
+        found = sum(1 for page in results.values() if page is not None)
+        with self._stats_lock:
+            self.hits += found
+            self.misses += len(results) - found
+        return results
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "pages": self.page_count,
+            "redirects": self.redirect_count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
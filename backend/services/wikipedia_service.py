@@ -1,54 +1,137 @@
-import wikipediaapi
 import os
 
+from services.wikipedia_client import MediaWikiClient, FixtureWikipediaClient
+from services.metrics import stage_timer
+
+
 class WikipediaService:
-    def __init__(self, lang='en'):
-        # Updated for Wikipedia-API 0.6.0+ compatibility
-        self.wiki = wikipediaapi.Wikipedia(
-            user_agent='NewsKGAnalyzer/1.0 (https://github.com/yourproject)',
-            language=lang,
-            extract_format=wikipediaapi.ExtractFormat.WIKI
-        )
-    
+    def __init__(self, lang='en', client=None, cache=None, index=None):
+        """
+        Args:
+            lang: Wikipedia language edition
+            client: Page lookup client (defaults to FixtureWikipediaClient when
+                WIKIPEDIA_FIXTURES is set, otherwise the live MediaWiki API)
+            cache: Optional CacheBackend for resolved pages (redirects, summaries,
+                categories and links), including negative results
+            index: Optional WikipediaIndex consulted before the cache and the
+                network; only titles it doesn't know fall through
+        """
+        self.lang = lang
+        if client is None:
+            fixtures = os.getenv("WIKIPEDIA_FIXTURES")
+            client = FixtureWikipediaClient(fixtures, lang=lang) if fixtures else MediaWikiClient(lang)
+        self.client = client
+        self.cache = cache
+        self.index = index
+
+    def _cache_key(self, title):
+        return f"{self.lang}:{title}"
+
+    def _fetch_pages(self, titles, with_links=True):
+        """
+        Look up several titles with one batched request for whatever isn't cached
+
+        Returns:
+            {title: page dict or None}
+        """
+        titles = [t for t in dict.fromkeys(titles) if t and t.strip()]
+        results = {}
+        if self.index is not None:
+            for title, page in self.index.fetch_pages(titles, with_links=with_links).items():
+                if page is not None:
+                    results[title] = page
+            titles = [t for t in titles if t not in results]
+
+        missing = []
+        for title in titles:
+            cached = self.cache.get(self._cache_key(title)) if self.cache is not None else None
+            # Pages cached without links don't satisfy a lookup that needs them
+            if cached is not None and (not with_links or not cached.get("exists") or "links" in cached):
+                results[title] = cached if cached.get("exists") else None
+            else:
+                missing.append(title)
+
+        if missing:
+            with stage_timer("wikipedia_fetch"):
+                fetched = self.client.fetch_pages(missing, with_links=with_links)
+            for title in missing:
+                page = fetched.get(title)
+                results[title] = page
+                if self.cache is None:
+                    continue
+                if page is None:
+                    self.cache.set(self._cache_key(title), {"exists": False})
+                    continue
+                if not with_links:
+                    page = {k: v for k, v in page.items() if k != "links"}
+                self.cache.set(self._cache_key(title), page)
+                # Cache under the resolved title too, so redirects and variations share an entry
+                if page["title"] != title:
+                    self.cache.set(self._cache_key(page["title"]), page)
+
+        return results
+
+    def _resolve(self, entity_name, variations, with_links=True):
+        """Resolve the entity name and its variations in one round-trip; first existing page wins"""
+        candidates = [entity_name] + [v for v in variations if v != entity_name]
+        pages = self._fetch_pages(candidates, with_links=with_links)
+        for candidate in candidates:
+            page = pages.get(candidate)
+            if page is not None:
+                return candidate, page
+        return None, None
+
+    def known_title(self, entity_name):
+        """
+        Page title `entity_name` resolves to (following redirects) if the
+        offline index or the cache already knows it; never hits the network
+
+        Returns:
+            Title string, or None if unknown or known not to exist
+        """
+        if self.index is not None:
+            page = self.index.lookup(entity_name, with_links=False)
+            if page is not None:
+                return page["title"]
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(entity_name))
+            if cached is not None and cached.get("exists"):
+                return cached["title"]
+        return None
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
+    def index_stats(self):
+        return self.index.stats() if self.index is not None else {"enabled": False}
+
     def get_entity_info(self, entity_name):
         """Get Wikipedia information for an entity"""
         try:
-            page = self.wiki.page(entity_name)
-            
-            if page.exists():
-                return {
-                    'title': page.title,
-                    'summary': page.summary if page.summary else "No summary available",
-                    'url': page.fullurl,
-                    'categories': list(page.categories.keys())[:10] if page.categories else [],
+            variations = [
+                entity_name.title(),
+                entity_name.lower(),
+                entity_name.upper(),
+                entity_name.replace('_', ' '),
+                entity_name.replace('-', ' ')
+            ]
+            matched, page = self._resolve(entity_name, variations, with_links=False)
+
+            if page is not None:
+                info = {
+                    'title': page['title'],
+                    'summary': page['summary'] if page['summary'] else "No summary available",
+                    'url': page['url'],
+                    'categories': page['categories'][:10],
                     'exists': True
                 }
-            else:
-                # Try common variations
-                variations = [
-                    entity_name.title(),
-                    entity_name.lower(),
-                    entity_name.upper(),
-                    entity_name.replace('_', ' '),
-                    entity_name.replace('-', ' ')
-                ]
-                
-                for variation in variations:
-                    if variation != entity_name:
-                        page = self.wiki.page(variation)
-                        if page.exists():
-                            return {
-                                'title': page.title,
-                                'summary': page.summary if page.summary else "No summary available",
-                                'url': page.fullurl,
-                                'categories': list(page.categories.keys())[:10] if page.categories else [],
-                                'exists': True,
-                                'searched': True
-                            }
-                
+                if matched != entity_name:
+                    info['searched'] = True
+                return info
+
         except Exception as e:
             print(f"Error fetching Wikipedia info for {entity_name}: {e}")
-        
+
         return {
             'title': entity_name,
             'summary': 'No Wikipedia information found.',
@@ -56,102 +139,91 @@ class WikipediaService:
             'categories': [],
             'exists': False
         }
-    
+
     def get_related_entities(self, entity_name, limit=10):
         """Get related entities from Wikipedia"""
         try:
-            page = self.wiki.page(entity_name)
-            
-            if page.exists():
-                # Get links from the page
-                links = list(page.links.keys())[:limit]
-                
+            page = self._fetch_pages([entity_name]).get(entity_name)
+
+            if page is not None:
+                # Get links from the page, then resolve them all in one batched lookup
+                links = page['links'][:limit]
+                linked_pages = self._fetch_pages(links, with_links=False)
+
                 related = []
                 for link in links:
-                    related_page = self.wiki.page(link)
-                    if related_page.exists():
+                    related_page = linked_pages.get(link)
+                    if related_page is not None:
                         related.append({
                             'name': link,
-                            'summary': related_page.summary[:200] if related_page.summary else "",
-                            'url': related_page.fullurl
+                            'summary': related_page['summary'][:200] if related_page['summary'] else "",
+                            'url': related_page['url']
                         })
-                
+
                 return related
-            
+
         except Exception as e:
             print(f"Error fetching related entities: {e}")
-        
+
         return []
-    
+
     def get_enriched_entity_info(self, entity_name):
         """Get comprehensive Wikipedia information with entities extracted from summary"""
         try:
             print(f"      📖 Fetching Wikipedia page for: {entity_name}")
-            page = self.wiki.page(entity_name)
-            
-            if not page.exists():
-                # Try variations
-                variations = [
-                    entity_name.title(),
-                    entity_name.lower(),
-                    entity_name.replace('_', ' '),
-                    entity_name.replace('-', ' ')
-                ]
-                
-                for variation in variations:
-                    if variation != entity_name:
-                        page = self.wiki.page(variation)
-                        if page.exists():
-                            print(f"      ✅ Found Wikipedia page using variation: {variation}")
-                            break
-            
-            if page.exists():
+            variations = [
+                entity_name.title(),
+                entity_name.lower(),
+                entity_name.replace('_', ' '),
+                entity_name.replace('-', ' ')
+            ]
+            matched, page = self._resolve(entity_name, variations)
+
+            if page is not None:
+                if matched != entity_name:
+                    print(f"      ✅ Found Wikipedia page using variation: {matched}")
+
                 # Extract entities mentioned in the summary
-                summary = page.summary if hasattr(page, 'summary') and page.summary else ""
+                summary = page['summary'] or ""
                 print(f"      ✅ Wikipedia page found, summary length: {len(summary)}")
-                
+
                 # Get links that are mentioned in the summary
                 related_entities = []
-                try:
-                    # Check if page has links attribute
-                    if hasattr(page, 'links') and page.links:
-                        print(f"      🔗 Processing {len(page.links)} Wikipedia links...")
-                        links_dict = page.links if isinstance(page.links, dict) else {}
-                        
-                        for link_title in list(links_dict.keys())[:50]:
-                            if summary and link_title.lower() in summary.lower():
-                                # Build URL manually since fullurl might not be available
-                                wiki_url = f"https://en.wikipedia.org/wiki/{link_title.replace(' ', '_')}"
-                                related_entities.append({
-                                    'name': link_title,
-                                    'url': wiki_url
-                                })
-                                
-                                if len(related_entities) >= 15:
-                                    break
-                        
-                        print(f"      ✅ Found {len(related_entities)} related Wikipedia entities")
-                    else:
-                        print(f"      ⚠️  No links attribute found on Wikipedia page")
-                except Exception as links_error:
-                    print(f"      ⚠️  Error processing Wikipedia links: {links_error}")
-                
+                links = page.get('links', [])
+                if links:
+                    print(f"      🔗 Processing {len(links)} Wikipedia links...")
+                    summary_lower = summary.lower()
+
+                    for link_title in links[:50]:
+                        if summary and link_title.lower() in summary_lower:
+                            related_entities.append({
+                                'name': link_title,
+                                'url': f"https://{self.lang}.wikipedia.org/wiki/{link_title.replace(' ', '_')}"
+                            })
+
+                            if len(related_entities) >= 15:
+                                break
+
+                    print(f"      ✅ Found {len(related_entities)} related Wikipedia entities")
+                else:
+                    print(f"      ⚠️  No links found on Wikipedia page")
+
                 return {
-                    'title': page.title if hasattr(page, 'title') else entity_name,
+                    'title': page['title'],
                     'summary': summary,
-                    'url': page.fullurl if hasattr(page, 'fullurl') else f"https://en.wikipedia.org/wiki/{entity_name.replace(' ', '_')}",
-                    'categories': list(page.categories.keys())[:15] if hasattr(page, 'categories') and page.categories else [],
+                    'url': page['url'],
+                    'categories': page['categories'][:15],
                     'related_entities': related_entities,
                     'exists': True
                 }
             else:
                 print(f"      ❌ No Wikipedia page found for: {entity_name}")
-            
+
         except Exception as e:
             print(f"      ❌ Error fetching enriched Wikipedia info for {entity_name}: {e}")
             import traceback
             traceback.print_exc()
-        
+
         return {
             'title': entity_name,
             'summary': 'No Wikipedia information found.',
@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Tests import the backend packages the way app.py does (`from services...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """Stands in for time.time() so TTLs can be crossed without sleeping"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, "time", fake)
+    return fake
@@ -0,0 +1,57 @@
+import pytest
+
+from services.article_store import ArticleStore
+
+
+def _article(article_id, title, description="", image="https://example.com/a.jpg", published="2026-01-01T00:00:00Z"):
+    return {
+        "id": article_id,
+        "title": title,
+        "description": description,
+        "content": "",
+        "url": f"https://example.com/{article_id}",
+        "image": image,
+        "source": "Example",
+        "publishedAt": published
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    if not store.fts_enabled:
+        pytest.skip("SQLite build without FTS5")
+    store.upsert_many([
+        _article("summit", "Climate summit opens in Paris", "Leaders meet on emissions"),
+        _article("fashion", "Paris fashion week", "Designers show spring collections"),
+        _article("report", "New climate report warns of heat", "Scientists publish findings"),
+        _article("noimage", "Climate protest in Paris", image=None),
+    ], origin="test")
+    yield store
+    store.close()
+
+
+def test_search_requires_all_terms_when_some_article_has_them(store):
+    results = store.search("climate Paris")
+
+    assert [a["id"] for a in results] == ["summit"]
+
+
+def test_search_falls_back_to_any_term(store):
+    results = store.search("climate Berlin")
+
+    assert {a["id"] for a in results} == {"summit", "report"}
+
+
+def test_search_fallback_is_kept_on_every_page(store):
+    first = store.search("climate Berlin", page=1, page_size=1)
+    second = store.search("climate Berlin", page=2, page_size=1)
+
+    assert len(first) == len(second) == 1
+    assert {first[0]["id"], second[0]["id"]} == {"summit", "report"}
+
+
+def test_search_treats_operators_as_terms(store):
+    assert store.search('"') == []
+    # "OR"/"NOT" are quoted terms, not FTS5 operators; no article has them all, so any term matches
+    assert [a["id"] for a in store.search("fashion OR NOT")] == ["fashion"]
@@ -0,0 +1,77 @@
+from services.cache_store import MemoryCache, SQLiteCache, TieredCache, create_cache
+
+
+def test_sqlite_entry_expires_after_ttl(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="t", ttl=60)
+    cache.set("a", {"x": 1})
+
+    clock.advance(59)
+    assert cache.get("a") == {"x": 1}
+
+    clock.advance(2)
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_evicts_least_recently_used(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="t", max_entries=3, touch_interval=0)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        clock.advance(1)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == "a"
+    clock.advance(1)
+
+    cache.set("d", "d")
+
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+
+
+def test_sqlite_namespaces_share_a_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SQLiteCache(path, namespace="first")
+    second = SQLiteCache(path, namespace="second")
+    first.set("k", 1)
+    second.set_many([("k", 2), ("j", 3)])
+
+    first.clear()
+
+    assert first.get("k") is None
+    assert second.get("k") == 2
+    assert len(second) == 2
+
+
+def test_tiered_promotion_keeps_persistent_expiry(tmp_path, clock):
+    persistent = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="t", ttl=60)
+    cache = TieredCache(MemoryCache(namespace="t", max_entries=10, ttl=60), persistent)
+    persistent.set("a", "value")
+
+    clock.advance(50)
+    assert cache.get("a") == "value"  # promoted into the memory tier
+
+    clock.advance(11)
+    assert cache.get("a") is None
+
+
+def test_tiered_memory_tier_is_bounded(tmp_path):
+    cache = create_cache(namespace="t", path=str(tmp_path / "cache.sqlite3"), memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    assert len(cache.memory_tier) == 2
+    assert cache.get("a") == "a"  # still served by the persistent tier
+
+
+def test_tiered_clear_reaches_other_workers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = TieredCache(MemoryCache(namespace="t"), SQLiteCache(path, namespace="t"), generation_check_interval=0)
+    worker_b = TieredCache(MemoryCache(namespace="t"), SQLiteCache(path, namespace="t"), generation_check_interval=0)
+    worker_a.set("a", 1)
+    assert worker_b.get("a") == 1  # now also in worker B's memory tier
+
+    worker_a.clear()
+
+    assert worker_b.get("a") is None
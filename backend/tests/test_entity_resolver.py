@@ -0,0 +1,103 @@
+import pytest
+
+from services.cache_store import SQLiteCache, create_cache
+from services.entity_resolver import EntityResolver, normalize_entity_name
+
+
+class CountingCache(SQLiteCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes = 0
+
+    def set(self, key, value):
+        self.writes += 1
+        super().set(key, value)
+
+    def set_many(self, items):
+        self.writes += 1
+        super().set_many(items)
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    cache = create_cache(namespace="entities", path=str(tmp_path / "entities.sqlite3"), memory_entries=64)
+    return EntityResolver(cache=cache)
+
+
+@pytest.mark.parametrize("name, key", [
+    ("U.S.", "US"),
+    ("US", "US"),
+    ("us", "us"),
+    ("WHO", "WHO"),
+    ("The Who", "who"),
+    ("The White House", "white house"),
+    ("Donald Trump Jr.", "donald trump jr"),
+])
+def test_normalize_entity_name(name, key):
+    assert normalize_entity_name(name) == key
+
+
+def test_acronym_forms_merge(resolver):
+    ids = {resolver.resolve(name, "LOCATION")["id"] for name in ("US", "U.S.", "USA", "United States")}
+
+    assert ids == {"united_states"}
+
+
+def test_the_who_is_not_the_world_health_organization(resolver):
+    who = resolver.resolve("WHO", "ORGANIZATION")
+    band = resolver.resolve("The Who", "ORGANIZATION")
+
+    assert who["name"] == "World Health Organization"
+    assert band["id"] != who["id"]
+    assert band["name"] == "The Who"
+
+
+def test_lowercase_word_is_not_an_acronym(resolver):
+    assert resolver.resolve("us")["id"] != resolver.resolve("U.S.")["id"]
+
+
+def test_person_suffix_and_initials_stay_separate(resolver):
+    trump = resolver.resolve("Donald Trump", "PERSON")
+
+    assert resolver.resolve("Donald Trump Jr.", "PERSON")["id"] != trump["id"]
+    assert resolver.resolve("Donald J. Trump", "PERSON")["id"] != trump["id"]
+
+
+def test_fuzzy_merges_spelling_variants(resolver):
+    original = resolver.resolve("Volodymyr Zelensky", "PERSON")
+
+    assert resolver.resolve("Volodymyr Zelenskyy", "PERSON")["id"] == original["id"]
+
+
+def test_resolve_graph_merges_entities_and_relations(resolver):
+    entities = [
+        {"name": "U.S.", "type": "LOCATION", "context": "country"},
+        {"name": "United States", "type": "LOCATION"},
+        {"name": "Joe Biden", "type": "PERSON"},
+    ]
+    relations = [
+        {"source": "Joe Biden", "target": "U.S.", "relationship": "leads"},
+        {"source": "Joe Biden", "target": "United States", "relationship": "leads"},
+        {"source": "U.S.", "target": "United States", "relationship": "part_of"},
+    ]
+
+    resolved_entities, resolved_relations = resolver.resolve_graph(entities, relations)
+
+    assert [e["name"] for e in resolved_entities] == ["United States", "Joe Biden"]
+    assert resolved_entities[0]["aliases"] == ["U.S."]
+    assert resolved_entities[0]["context"] == "country"
+    assert resolved_relations == [{"source": "Joe Biden", "target": "United States", "relationship": "leads"}]
+
+
+def test_resolve_graph_writes_cache_once(tmp_path):
+    cache = CountingCache(str(tmp_path / "entities.sqlite3"), namespace="entities")
+    resolver = EntityResolver(cache=cache)
+
+    resolver.resolve_graph(
+        [{"name": name, "type": "LOCATION"} for name in ("U.S.", "UK", "Paris", "Berlin")],
+        [{"source": "Paris", "target": "Berlin", "relationship": "near"}]
+    )
+
+    assert cache.writes == 1
+    # A fresh resolver (another worker) sees the batched bindings
+    assert EntityResolver(cache=cache).resolve("U.S.")["id"] == "united_states"
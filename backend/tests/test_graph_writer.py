@@ -0,0 +1,55 @@
+import time
+
+from services.graph_writer import GraphWriteBehind
+
+DAY = 86400
+
+
+class FakeNeo4jService:
+    """Keeps {article_id: written_at} in memory in place of a Neo4j database"""
+
+    def __init__(self, stored=None):
+        self.stored = dict(stored or {})
+        self.writes = []
+
+    def existing_article_ids(self, article_ids, max_age=None):
+        now = time.time()
+        return {
+            article_id for article_id in article_ids
+            if article_id in self.stored and (not max_age or now - self.stored[article_id] < max_age)
+        }
+
+    def create_knowledge_graphs(self, articles, batch_size=None):
+        for article in articles:
+            self.stored[article["article_id"]] = time.time()
+            self.writes.append(article["article_id"])
+        return [article["article_id"] for article in articles]
+
+
+def _flush(writer, *article_ids):
+    for article_id in article_ids:
+        writer.enqueue(article_id, {"entities": [{"name": "X"}], "relations": []}, article_id, "")
+    writer.stop()
+    return writer.stats()
+
+
+def test_expired_graph_is_rewritten():
+    service = FakeNeo4jService({"old": time.time() - 2 * DAY, "recent": time.time() - 60})
+    writer = GraphWriteBehind(service, flush_interval=0.01, max_age=DAY)
+
+    stats = _flush(writer, "old", "recent", "new")
+
+    assert sorted(service.writes) == ["new", "old"]
+    assert service.stored["old"] > time.time() - 60
+    assert stats["written"] == 2
+    assert stats["skipped_existing"] == 1
+
+
+def test_stored_graphs_are_kept_without_max_age():
+    service = FakeNeo4jService({"old": time.time() - 30 * DAY})
+    writer = GraphWriteBehind(service, flush_interval=0.01)
+
+    stats = _flush(writer, "old")
+
+    assert service.writes == []
+    assert stats["skipped_existing"] == 1
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from services.relevance_filter import KeywordMatcher
+
+
+def naive_match(keywords, texts):
+    return [[i for i, text in enumerate(texts) if keyword in text.lower()] for keyword in sorted(set(keywords))]
+
+
+WORDS = ["trade", "tariff", "china", "election", "vote", "climate", "heat", "market", "stock", "ai"]
+
+
+def _random_texts(rng, count):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 8))).title() for _ in range(count)]
+
+
+@pytest.mark.parametrize("count", [0, 5, KeywordMatcher.SMALL_INPUT, 500])
+def test_match_equals_naive(count):
+    rng = random.Random(count)
+    texts = _random_texts(rng, count)
+    # Common, rare, absent and overlapping keywords cover the jumping and the dense paths
+    keywords = ["trade", "ai", "tar", "heat", "missing", "stock market", "e"]
+
+    assert KeywordMatcher(keywords).match(texts) == naive_match(keywords, texts)
+
+
+def test_keyword_never_spans_two_texts():
+    texts = ["ends with tra"] + ["de starts here"] + ["filler"] * KeywordMatcher.SMALL_INPUT
+
+    assert KeywordMatcher(["trade"]).match(texts) == [[]]
+
+
+def test_match_with_case_changing_lowercase():
+    # "İ".lower() is two characters; offsets must still map to the right text
+    texts = ["İstanbul"] * 10 + ["ankara trade"] + ["x"] * KeywordMatcher.SMALL_INPUT
+
+    assert KeywordMatcher(["trade"]).match(texts) == [[10]]
+
+
+def test_score_sums_weights():
+    matcher = KeywordMatcher(["china", "trade", "vote"])
+    scores = matcher.score(["China trade war", "vote count", "weather"], weights={"china": 3})
+
+    assert scores == [4, 1, 0]
@@ -0,0 +1,109 @@
+import pytest
+
+pytest.importorskip("requests")  # services.http_client, imported by the Wikipedia client module
+
+from services.cache_store import MemoryCache
+from services.wikipedia_client import MAX_EXTRACTS_PER_QUERY, FixtureWikipediaClient, MediaWikiClient
+from services.wikipedia_service import WikipediaService
+
+
+PAGES = {
+    "United States": {"summary": "Country in North America.", "categories": ["Countries"], "links": ["Washington, D.C."]},
+    "Washington, D.C.": {"summary": "Capital of the United States.", "links": []},
+    "Joe Biden": {"summary": "46th president.", "links": ["United States", "Delaware", "Nowhere Land"]},
+    "Delaware": {"summary": "U.S. state.", "links": []},
+}
+REDIRECTS = {"USA": "United States"}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeHttpClient:
+    """Answers MediaWiki query requests from PAGES/REDIRECTS and records the titles of each"""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params=None):
+        titles = params["titles"].split("|")
+        self.requested.append(titles)
+        redirects = [{"from": t, "to": REDIRECTS[t]} for t in titles if t in REDIRECTS]
+        pages = []
+        for title in {REDIRECTS.get(t, t) for t in titles}:
+            page = PAGES.get(title)
+            if page is None:
+                pages.append({"title": title, "missing": True})
+            else:
+                pages.append({
+                    "title": title,
+                    "extract": page["summary"],
+                    "fullurl": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
+                    "categories": [{"title": c} for c in page.get("categories", [])],
+                    "links": [{"title": l} for l in page.get("links", [])]
+                })
+        return FakeResponse({"query": {"redirects": redirects, "pages": pages}})
+
+
+@pytest.fixture
+def client():
+    return FixtureWikipediaClient(pages=PAGES, redirects=REDIRECTS)
+
+
+@pytest.fixture
+def service(client):
+    return WikipediaService(client=client, cache=MemoryCache(namespace="wikipedia"))
+
+
+def test_mediawiki_client_sends_one_request_per_20_titles():
+    http = FakeHttpClient()
+    client = MediaWikiClient(http_client=http)
+    titles = [f"Missing {i}" for i in range(2 * MAX_EXTRACTS_PER_QUERY + 5)] + ["USA"]
+
+    results = client.fetch_pages(titles)
+
+    assert [len(chunk) for chunk in http.requested] == [20, 20, 6]
+    assert results["USA"]["title"] == "United States"
+    assert results["Missing 0"] is None
+
+
+def test_variations_resolve_in_one_request(service, client):
+    info = service.get_entity_info("joe biden")
+
+    assert info["title"] == "Joe Biden"
+    assert client.requests == 1
+
+
+def test_related_entities_batch_the_links(service, client):
+    related = service.get_related_entities("Joe Biden")
+
+    assert [r["name"] for r in related] == ["United States", "Delaware"]
+    assert client.requests == 2  # the page, then all its links at once
+
+
+def test_redirect_shares_the_resolved_cache_entry(service, client):
+    assert service.get_entity_info("USA")["title"] == "United States"
+    requests_before = client.requests
+
+    assert service.known_title("United States") == "United States"
+    assert service._fetch_pages(["United States", "USA"], with_links=False)["United States"]["title"] == "United States"
+    assert client.requests == requests_before
+    assert service.cache.get("en:USA") == service.cache.get("en:United States")
+
+
+def test_missing_pages_are_cached(service, client):
+    assert service.get_related_entities("Nowhere Land") == []
+    requests_before = client.requests
+
+    assert service.get_related_entities("Nowhere Land") == []
+    assert client.requests == requests_before
+    assert service.cache.get("en:Nowhere Land") == {"exists": False}
+    assert service.known_title("Nowhere Land") is None
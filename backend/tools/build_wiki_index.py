@@ -0,0 +1,327 @@
+"""
+Build the offline Wikipedia index served by services/wikipedia_index.py.
+
+Usage (from backend/):
+    python tools/build_wiki_index.py --output ./cache/wikipedia_index.sqlite3 \\
+        --abstracts enwiki-latest-abstract.xml.gz \\
+        --page-sql enwiki-latest-page.sql.gz \\
+        --redirect-sql enwiki-latest-redirect.sql.gz \\
+        --categorylinks-sql enwiki-latest-categorylinks.sql.gz \\
+        --pagelinks-sql enwiki-latest-pagelinks.sql.gz \\
+        --linktarget-sql enwiki-latest-linktarget.sql.gz
+
+Page summaries come from the abstracts XML dump, or from `--pages-jsonl`
+(one {"title", "summary", "url"?, "categories"?, "links"?} object per line)
+for editions or extracts without an abstracts dump. Redirects, categories
+and outlinks come from the MySQL table dumps, which reference pages by id,
+so they require `--page-sql`. Both the classic pagelinks/categorylinks
+layout (target title inline) and the newer one (target id into
+linktarget) are understood. Every input may be plain or gzip-compressed.
+
+Only article-namespace pages are indexed. The index is written to a
+temporary file and moved into place when complete, so a running server
+never sees a half-built index.
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.wikipedia_index import normalize_title
+
+SQL_TOKEN = re.compile(r"\(|\)|'(?:[^'\\]|\\.)*'|NULL|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?", re.S)
+SQL_ESCAPE = re.compile(r"\\(.)", re.S)
+SQL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0", "Z": "\x1a"}
+BATCH = 50000
+
+
+def open_dump(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def iter_sql_rows(path):
+    """Yield each row tuple of the INSERT statements in a MySQL dump"""
+    with open_dump(path) as f:
+        for line in f:
+            if not line.startswith("INSERT INTO"):
+                continue
+            values = line[line.index(" VALUES ") + 8:]
+            row = None
+            for token in SQL_TOKEN.findall(values):
+                if token == "(":
+                    row = []
+                elif token == ")":
+                    if row is not None:
+                        yield row
+                    row = None
+                elif row is not None:
+                    if token.startswith("'"):
+                        row.append(SQL_ESCAPE.sub(lambda m: SQL_ESCAPES.get(m.group(1), m.group(1)), token[1:-1]))
+                    elif token == "NULL":
+                        row.append(None)
+                    else:
+                        row.append(float(token) if "." in token or "e" in token.lower() else int(token))
+
+
+def create_schema(conn):
+    conn.executescript("""
+        PRAGMA journal_mode=OFF;
+        PRAGMA synchronous=OFF;
+        CREATE TABLE pages (
+            title TEXT PRIMARY KEY,
+            summary TEXT,
+            url TEXT,
+            categories TEXT,
+            links TEXT
+        );
+        CREATE TABLE redirects (
+            source TEXT PRIMARY KEY,
+            target TEXT NOT NULL
+        );
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE staging_page_ids (id INTEGER PRIMARY KEY, title TEXT NOT NULL, is_redirect INTEGER);
+        CREATE TABLE staging_linktargets (id INTEGER PRIMARY KEY, namespace INTEGER, title TEXT NOT NULL);
+        CREATE TABLE staging_edges (kind TEXT NOT NULL, from_id INTEGER NOT NULL, target TEXT NOT NULL);
+    """)
+
+
+def insert_batches(conn, sql, rows):
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.executemany(sql, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        total += len(batch)
+    conn.commit()
+    return total
+
+
+def load_abstracts(conn, path, summary_chars):
+    def rows():
+        with open_dump(path) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag != "doc":
+                    continue
+                title = elem.findtext("title") or ""
+                if title.startswith("Wikipedia: "):
+                    title = title[len("Wikipedia: "):]
+                summary = (elem.findtext("abstract") or "").strip()
+                if title:
+                    yield normalize_title(title), summary[:summary_chars], elem.findtext("url")
+                elem.clear()
+
+    return insert_batches(conn, "INSERT OR REPLACE INTO pages (title, summary, url) VALUES (?, ?, ?)", rows())
+
+
+def load_pages_jsonl(conn, path, summary_chars):
+    def rows():
+        with open_dump(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                page = json.loads(line)
+                yield (
+                    normalize_title(page["title"]),
+                    (page.get("summary") or "")[:summary_chars],
+                    page.get("url"),
+                    json.dumps(page["categories"]) if page.get("categories") else None,
+                    json.dumps(page["links"]) if page.get("links") else None
+                )
+
+    return insert_batches(
+        conn, "INSERT OR REPLACE INTO pages (title, summary, url, categories, links) VALUES (?, ?, ?, ?, ?)", rows()
+    )
+
+
+def load_page_ids(conn, path):
+    # page: (page_id, page_namespace, page_title, page_is_redirect, ...)
+    rows = ((r[0], normalize_title(r[2]), r[3]) for r in iter_sql_rows(path) if r[1] == 0)
+    return insert_batches(conn, "INSERT OR REPLACE INTO staging_page_ids VALUES (?, ?, ?)", rows)
+
+
+def load_linktargets(conn, path):
+    # linktarget: (lt_id, lt_namespace, lt_title); keep articles (0) and categories (14)
+    rows = ((r[0], r[1], normalize_title(r[2])) for r in iter_sql_rows(path) if r[1] in (0, 14))
+    return insert_batches(conn, "INSERT OR REPLACE INTO staging_linktargets VALUES (?, ?, ?)", rows)
+
+
+def load_redirects(conn, path):
+    # redirect: (rd_from, rd_namespace, rd_title, rd_interwiki, rd_fragment)
+    rows = ((r[0], normalize_title(r[2])) for r in iter_sql_rows(path) if r[1] == 0 and not r[3])
+    conn.execute("CREATE TEMP TABLE staging_redirects (from_id INTEGER PRIMARY KEY, target TEXT)")
+    insert_batches(conn, "INSERT OR REPLACE INTO staging_redirects VALUES (?, ?)", rows)
+    conn.execute("""
+        INSERT OR REPLACE INTO redirects (source, target)
+        SELECT p.title, r.target FROM staging_redirects r
+        JOIN staging_page_ids p ON p.id = r.from_id
+        WHERE r.target IN (SELECT title FROM pages)
+    """)
+    conn.execute("DROP TABLE staging_redirects")
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM redirects").fetchone()[0]
+
+
+def indexed_page_ids(conn):
+    return {
+        row[0] for row in conn.execute(
+            "SELECT p.id FROM staging_page_ids p JOIN pages ON pages.title = p.title WHERE p.is_redirect = 0"
+        )
+    }
+
+
+def load_edges(conn, path, kind, page_ids, limit):
+    """
+    Stage (page id, target) edges, capped at `limit` per page.
+
+    Dumps are ordered by source page id, so the cap only needs a running counter.
+    """
+    def rows():
+        current, count = None, 0
+        for r in iter_sql_rows(path):
+            from_id = r[0]
+            if from_id not in page_ids:
+                continue
+            if kind == "link":
+                # classic: (pl_from, pl_namespace, pl_title, pl_from_namespace)
+                # current: (pl_from, pl_from_namespace, pl_target_id)
+                if isinstance(r[2], str):
+                    if r[1] != 0:
+                        continue
+                    target = normalize_title(r[2])
+                else:
+                    target = f"#{r[2]}"
+            else:
+                # classic: (cl_from, cl_to, ..., cl_type); current: (cl_from, cl_sortkey, ..., cl_target_id)
+                target = f"#{r[-1]}" if isinstance(r[-1], int) else normalize_title(r[1])
+            if from_id != current:
+                current, count = from_id, 0
+            if count >= limit:
+                continue
+            count += 1
+            yield kind, from_id, target
+
+    return insert_batches(conn, "INSERT INTO staging_edges VALUES (?, ?, ?)", rows())
+
+
+def aggregate_edges(conn, kind, column, namespace, prefix=""):
+    """Collapse staged edges into a JSON list per page, resolving linktarget ids to titles"""
+    cursor = conn.execute("""
+        SELECT p.title, COALESCE(lt.title, e.target)
+        FROM staging_edges e
+        JOIN staging_page_ids p ON p.id = e.from_id
+        LEFT JOIN staging_linktargets lt
+            ON e.target LIKE '#%' AND lt.id = CAST(SUBSTR(e.target, 2) AS INTEGER) AND lt.namespace = ?
+        WHERE e.kind = ?
+        ORDER BY e.from_id, e.rowid
+    """, (namespace, kind))
+
+    updates = []
+    current, values = None, []
+    for title, target in cursor:
+        if title != current:
+            if current is not None:
+                updates.append((json.dumps(values), current))
+            current, values = title, []
+        if not target.startswith("#"):
+            values.append(prefix + target)
+    if current is not None:
+        updates.append((json.dumps(values), current))
+
+    insert_batches(conn, f"UPDATE pages SET {column} = ? WHERE title = ?", iter(updates))
+    return len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline Wikipedia index from dump files")
+    parser.add_argument("--output", default="./cache/wikipedia_index.sqlite3")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--abstracts", help="<wiki>-abstract.xml(.gz)")
+    parser.add_argument("--pages-jsonl", help="JSON lines with title/summary[/url/categories/links]")
+    parser.add_argument("--page-sql", help="<wiki>-page.sql(.gz), needed for the table dumps below")
+    parser.add_argument("--redirect-sql")
+    parser.add_argument("--categorylinks-sql")
+    parser.add_argument("--pagelinks-sql")
+    parser.add_argument("--linktarget-sql", help="Needed for pagelinks/categorylinks dumps that reference link targets by id")
+    parser.add_argument("--summary-chars", type=int, default=2000)
+    parser.add_argument("--max-links", type=int, default=200)
+    parser.add_argument("--max-categories", type=int, default=30)
+    args = parser.parse_args()
+
+    if not args.abstracts and not args.pages_jsonl:
+        parser.error("one of --abstracts or --pages-jsonl is required")
+    if (args.redirect_sql or args.categorylinks_sql or args.pagelinks_sql) and not args.page_sql:
+        parser.error("--redirect-sql, --categorylinks-sql and --pagelinks-sql require --page-sql")
+
+    output = os.path.abspath(args.output)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp_path = output + ".building"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(tmp_path)
+    create_schema(conn)
+
+    def step(label, fn, *fn_args):
+        t0 = time.perf_counter()
+        count = fn(*fn_args)
+        print(f"  {label}: {count:,} rows in {time.perf_counter() - t0:.1f}s")
+
+    print(f"Building Wikipedia index -> {output}")
+    if args.abstracts:
+        step("abstracts", load_abstracts, conn, args.abstracts, args.summary_chars)
+    if args.pages_jsonl:
+        step("pages (jsonl)", load_pages_jsonl, conn, args.pages_jsonl, args.summary_chars)
+
+    if args.page_sql:
+        step("page ids", load_page_ids, conn, args.page_sql)
+        if args.linktarget_sql:
+            step("link targets", load_linktargets, conn, args.linktarget_sql)
+        if args.redirect_sql:
+            step("redirects", load_redirects, conn, args.redirect_sql)
+
+        page_ids = indexed_page_ids(conn)
+        if args.categorylinks_sql:
+            step("category edges", load_edges, conn, args.categorylinks_sql, "category", page_ids, args.max_categories)
+            step("pages with categories", aggregate_edges, conn, "category", "categories", 14, "Category:")
+        if args.pagelinks_sql:
+            step("link edges", load_edges, conn, args.pagelinks_sql, "link", page_ids, args.max_links)
+            step("pages with links", aggregate_edges, conn, "link", "links", 0)
+
+    conn.executescript("""
+        DROP TABLE staging_edges;
+        DROP TABLE staging_linktargets;
+        DROP TABLE staging_page_ids;
+    """)
+    conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+        ("lang", args.lang),
+        ("built_at", str(int(time.time()))),
+        ("sources", json.dumps({k: v for k, v in vars(args).items() if k.endswith(("_sql", "_jsonl")) or k == "abstracts"}))
+    ])
+    conn.commit()
+    conn.execute("VACUUM")
+    pages = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+    redirects = conn.execute("SELECT COUNT(*) FROM redirects").fetchone()[0]
+    conn.close()
+
+    os.replace(tmp_path, output)
+    print(f"✅ {pages:,} pages, {redirects:,} redirects in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import {
 } from 'lucide-react';
 import clsx from 'clsx';
 import { twMerge } from 'tailwind-merge';
+import { postGraphRequest, extractionDataLoader } from './api';
 
 // --- UTILS ---
 const cn = (...inputs) => twMerge(clsx(inputs));
@@ -326,7 +327,7 @@ const KnowledgeGraphView = ({ data, onNodeClick }) => {
 };
 
 
-const ChatInterface = ({ articleTitle, extractionData }) => {
+const ChatInterface = ({ articleTitle, graphId, extractionData, loadExtractionData }) => {
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState('');
   const [isTyping, setIsTyping] = useState(false);
@@ -346,15 +347,10 @@ const ChatInterface = ({ articleTitle, extractionData }) => {
     setIsTyping(true);
 
     try {
-      const res = await fetch(`${API_BASE}/chat`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          question: userMsg,
-          extraction_data: extractionData,
-          article_title: articleTitle
-        })
-      });
+      const res = await postGraphRequest(`${API_BASE}/chat`, {
+        question: userMsg,
+        article_title: articleTitle
+      }, { graphId, extractionData, loadExtractionData });
       const data = await res.json();
       setMessages(prev => [...prev, { role: 'assistant', content: data.answer || "I couldn't process that connection." }]);
     } catch (e) {
@@ -426,6 +422,9 @@ export default function App() {
   const [article, setArticle] = useState(null);
   const [graphData, setGraphData] = useState(null);
   const [extractionData, setExtractionData] = useState(null);
+  const [graphId, setGraphId] = useState(null);
+  const [graphCounts, setGraphCounts] = useState({ entities: 0, relations: 0 });
+  const [loadExtractionData, setLoadExtractionData] = useState(null);
   const [selectedNode, setSelectedNode] = useState(null);
   const [analysisResult, setAnalysisResult] = useState(null);
   const [isAnalyzing, setIsAnalyzing] = useState(false);
@@ -434,7 +433,7 @@ export default function App() {
 
   // Gemini request estimator tracking
   // 1 verification (batch) + 1 KG generation (now only 1 request) + X chats
-  const geminiEstimate = 1 + (extractionData ? 1 : 0);
+  const geminiEstimate = 1 + (graphId || extractionData ? 1 : 0);
 
   // Browser History Support
   useEffect(() => {
@@ -459,11 +458,7 @@ export default function App() {
   const handleNodeClick = async (nodeLabel) => {
     setSelectedNode({ name: nodeLabel, loading: true });
     try {
-      const res = await fetch(`${API_BASE}/node-details`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ node_label: nodeLabel, extraction_data: extractionData })
-      });
+      const res = await postGraphRequest(`${API_BASE}/node-details`, { node_label: nodeLabel }, { graphId, extractionData, loadExtractionData });
       const data = await res.json();
       setSelectedNode(data);
     } catch (e) {
@@ -473,18 +468,14 @@ export default function App() {
   };
 
   const runImageAnalysis = async () => {
-    if (!article || !extractionData) return;
+    if (!article || !(graphId || extractionData)) return;
     setIsAnalyzing(true);
     setAnalysisResult(null);
     try {
-      const res = await fetch(`${API_BASE}/detect-fake`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          image_url: article.image,
-          entities: extractionData.entities,
-          relations: extractionData.relations
-        })
+      const res = await postGraphRequest(`${API_BASE}/detect-fake`, { image_url: article.image }, {
+        graphId,
+        extractionData,
+        loadExtractionData
       });
       const result = await res.json();
       setAnalysisResult(result);
@@ -500,21 +491,24 @@ export default function App() {
     navigateTo('detail', art);
     setGraphData(null);
     setExtractionData(null);
+    setGraphId(null);
+    setGraphCounts({ entities: 0, relations: 0 });
     setAnalysisResult(null);
 
+    const graphRequest = { topic: art.title, description: art.summary, url: art.url };
+    // Full extraction_data is only fetched if the server forgets the graph_id
+    setLoadExtractionData(() => extractionDataLoader(`${API_BASE}/knowledge-graph`, graphRequest));
     try {
       const res = await fetch(`${API_BASE}/knowledge-graph`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          topic: art.title,
-          description: art.summary,
-          url: art.url
-        })
+        body: JSON.stringify(graphRequest)
       });
       const data = await res.json();
       setGraphData({ nodes: data.nodes, edges: data.edges });
-      setExtractionData(data.extraction_data);
+      setExtractionData(data.extraction_data || null);
+      setGraphId(data.graph_id || null);
+      setGraphCounts({ entities: data.entity_count || 0, relations: data.relation_count || 0 });
     } catch (e) {
       console.error(e);
       setGraphData({
@@ -853,11 +847,11 @@ export default function App() {
                             </div>
                             <div className="bg-white/5 p-2 rounded-lg border border-white/5">
                               <p className="text-[8px] text-neutral-500 uppercase">Entities</p>
-                              <p className="text-xs font-mono font-bold text-white">{extractionData?.entities?.length || 0}</p>
+                              <p className="text-xs font-mono font-bold text-white">{graphCounts.entities}</p>
                             </div>
                             <div className="bg-white/5 p-2 rounded-lg border border-white/5">
                               <p className="text-[8px] text-neutral-500 uppercase">Relations</p>
-                              <p className="text-xs font-mono font-bold text-white">{extractionData?.relations?.length || 0}</p>
+                              <p className="text-xs font-mono font-bold text-white">{graphCounts.relations}</p>
                             </div>
                           </div>
 
@@ -1028,7 +1022,9 @@ export default function App() {
                 {/* Chat */}
                 <ChatInterface
                   articleTitle={article.title}
+                  graphId={graphId}
                   extractionData={extractionData}
+                  loadExtractionData={loadExtractionData}
                 />
               </div>
 
@@ -16,16 +16,51 @@ export async function fetchNews({ page, category, query }) {
   return res.json();
 }
 
-export async function detectFakeNews({ image_url, entities, relations }) {
+export async function streamNews({ page, query, onArticles, onVerification }) {
+  const url = new URL(`${BASE_URL}/news/stream`);
+  url.searchParams.set("page", page);
+  if (query) url.searchParams.set("q", query);
+
+  const res = await fetch(url);
+
+  if (!res.ok || !res.body) {
+    console.error("Failed to stream news, falling back to /news");
+    return fetchNews({ page, query });
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let final = null;
+
+  const handleLine = (line) => {
+    if (!line.trim()) return;
+    const event = JSON.parse(line);
+    if (event.type === "articles" && onArticles) onArticles(event.articles);
+    else if (event.type === "verification" && onVerification) onVerification(event.updates);
+    else if (event.type === "done") final = event;
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer);
+
+  return final || { articles: [], stats: { real_count: 0, fake_count: 0, unverified_count: 0 }, fake_news_detected: [] };
+}
+
+// Image check for a knowledge graph: sent by graph_id like /node-details and /chat
+export async function detectFakeNews({ image_url, graphId, extractionData, loadExtractionData }) {
   try {
-    const res = await fetch(`${BASE_URL}/detect-fake`, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        image_url,
-        entities,
-        relations
-      })
+    const res = await postGraphRequest(`${BASE_URL}/detect-fake`, { image_url }, {
+      graphId,
+      extractionData,
+      loadExtractionData
     });
 
     if (!res.ok) {
@@ -40,15 +75,52 @@ export async function detectFakeNews({ image_url, entities, relations }) {
   }
 }
 
-export async function fetchNodeDetails({ node_label, extraction_data }) {
-  try {
-    const res = await fetch(`${BASE_URL}/node-details`, {
+// POST to a knowledge graph endpoint by graph_id; the full extraction_data is
+// only uploaded when there is no graph_id or the server no longer has the graph (404).
+// /knowledge-graph doesn't return extraction_data by default, so on a 404 it is
+// fetched through `loadExtractionData` (see extractionDataLoader) unless already known.
+export async function postGraphRequest(url, body, { graphId, extractionData, loadExtractionData }) {
+  const post = (graphFields) => fetch(url, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ...body, ...graphFields })
+  });
+
+  let res = null;
+  if (graphId) {
+    res = await post({ graph_id: graphId });
+    if (res.status !== 404) return res;
+  }
+  const data = extractionData || (loadExtractionData ? await loadExtractionData() : null);
+  if (!data && res) return res;
+  return post({ extraction_data: data });
+}
+
+// Re-requests a knowledge graph with its full extraction_data (for an expired graph_id)
+export function extractionDataLoader(url, graphRequest) {
+  let pending = null;
+  return () => {
+    pending = pending || fetch(url, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        node_label,
-        extraction_data
-      })
+      body: JSON.stringify({ ...graphRequest, include_extraction_data: true })
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((graph) => graph?.extraction_data || null)
+      .catch(() => null)
+      .then((data) => {
+        if (!data) pending = null;  // retry next time
+        return data;
+      });
+    return pending;
+  };
+}
+
+export async function fetchNodeDetails({ node_label, graph_id, extraction_data }) {
+  try {
+    const res = await postGraphRequest(`${BASE_URL}/node-details`, { node_label }, {
+      graphId: graph_id,
+      extractionData: extraction_data
     });
 
     if (!res.ok) {
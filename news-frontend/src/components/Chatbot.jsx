@@ -1,7 +1,8 @@
 import { useState, useRef, useEffect } from "react";
 import Spinner from "./Spinner";
+import { postGraphRequest } from "../api";
 
-export default function Chatbot({ extractionData, articleTitle }) {
+export default function Chatbot({ graphId, extractionData, loadExtractionData, articleTitle }) {
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState("");
   const [loading, setLoading] = useState(false);
@@ -38,15 +39,10 @@ export default function Chatbot({ extractionData, articleTitle }) {
     setLoading(true);
     
     try {
-      const response = await fetch("http://127.0.0.1:8000/chat", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          extraction_data: extractionData,
-          question: userMessage,
-          article_title: articleTitle
-        })
-      });
+      const response = await postGraphRequest("http://127.0.0.1:8000/chat", {
+        question: userMessage,
+        article_title: articleTitle
+      }, { graphId, extractionData, loadExtractionData });
       
       if (response.ok) {
         const data = await response.json();
@@ -113,12 +109,12 @@ export default function Chatbot({ extractionData, articleTitle }) {
           placeholder="Ask a question about this article..."
           value={input}
           onChange={(e) => setInput(e.target.value)}
-          disabled={loading || !extractionData}
+          disabled={loading || !(graphId || extractionData)}
         />
         <button 
           type="submit" 
           className="chatbot-send-button"
-          disabled={loading || !input.trim() || !extractionData}
+          disabled={loading || !input.trim() || !(graphId || extractionData)}
         >
           {loading ? "..." : "Send"}
         </button>
@@ -4,6 +4,9 @@ export default function NewsCard({ article }) {
   const navigate = useNavigate();
 
   const getVerificationBadge = () => {
+    if (article.pending) {
+      return <span className="badge pending">… Checking</span>;
+    }
     if (!article.verification) return null;
     
     const { conclusion } = article.verification;
@@ -23,7 +26,7 @@ export default function NewsCard({ article }) {
   };
 
   return (
-    <div className="news-card" onClick={handleClick}>
+    <div className="news-card" onClick={handleClick} style={article.pending ? { opacity: 0.6 } : undefined}>
       <img
         src={article.image || "https://via.placeholder.com/400x225"}
         alt=""
@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react";
 import Spinner from "./Spinner";
+import { postGraphRequest } from "../api";
 
 export default function NodeDetailsPanel({ selectedNode, graphData, onClose }) {
   const [nodeDetails, setNodeDetails] = useState(null);
@@ -15,7 +16,7 @@ export default function NodeDetailsPanel({ selectedNode, graphData, onClose }) {
   }, [selectedNode]);
 
   async function fetchNodeDetails() {
-    if (!graphData || !graphData.extraction_data) {
+    if (!graphData || !(graphData.graph_id || graphData.extraction_data)) {
       setError("No extraction data available");
       return;
     }
@@ -26,13 +27,12 @@ export default function NodeDetailsPanel({ selectedNode, graphData, onClose }) {
     try {
       console.log("📊 Fetching details for:", selectedNode.label);
       
-      const response = await fetch("http://127.0.0.1:8000/node-details", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          node_label: selectedNode.label,
-          extraction_data: graphData.extraction_data
-        })
+      const response = await postGraphRequest("http://127.0.0.1:8000/node-details", {
+        node_label: selectedNode.label
+      }, {
+        graphId: graphData.graph_id,
+        extractionData: graphData.extraction_data,
+        loadExtractionData: graphData.loadExtractionData
       });
       
       if (response.ok) {
@@ -3,7 +3,7 @@ import { useParams, useNavigate } from "react-router-dom";
 import Spinner from "../components/Spinner";
 import KnowledgeGraph from "../components/KnowledgeGraph";
 import Chatbot from "../components/Chatbot";
-import { detectFakeNews } from "../api";
+import { detectFakeNews, extractionDataLoader } from "../api";
 
 
 export default function ArticleDetail() {
@@ -81,19 +81,22 @@ export default function ArticleDetail() {
     if (!article || knowledgeGraph) return;
 
     setLoadingGraph(true);
+    const graphRequest = {
+      topic: article.title,
+      description: article.description,
+      url: article.url
+    };
     try {
       const response = await fetch("http://127.0.0.1:8000/knowledge-graph", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          topic: article.title,
-          description: article.description,
-          url: article.url
-        })
+        body: JSON.stringify(graphRequest)
       });
 
       if (response.ok) {
         const graph = await response.json();
+        // Full extraction_data is only fetched if the server forgets the graph_id
+        graph.loadExtractionData = extractionDataLoader("http://127.0.0.1:8000/knowledge-graph", graphRequest);
         setKnowledgeGraph(graph);
       }
     } catch (error) {
@@ -127,7 +130,7 @@ export default function ArticleDetail() {
     }
 
     // Ensure knowledge graph is loaded
-    if (!knowledgeGraph || !knowledgeGraph.extraction_data) {
+    if (!knowledgeGraph || !(knowledgeGraph.graph_id || knowledgeGraph.extraction_data)) {
       setImageCheckError("Please generate the knowledge graph first");
       return;
     }
@@ -141,8 +144,9 @@ export default function ArticleDetail() {
 
       const result = await detectFakeNews({
         image_url: article.image,
-        entities: knowledgeGraph.extraction_data.entities || [],
-        relations: knowledgeGraph.extraction_data.relations || []
+        graphId: knowledgeGraph.graph_id,
+        extractionData: knowledgeGraph.extraction_data,
+        loadExtractionData: knowledgeGraph.loadExtractionData
       });
 
       console.log("✅ Image check result:", result);
@@ -377,9 +381,11 @@ export default function ArticleDetail() {
                   <Spinner />
                   <p>Initializing chatbot and generating enriched knowledge graph...</p>
                 </div>
-              ) : knowledgeGraph && knowledgeGraph.extraction_data ? (
+              ) : knowledgeGraph && (knowledgeGraph.graph_id || knowledgeGraph.extraction_data) ? (
                 <Chatbot
+                  graphId={knowledgeGraph.graph_id}
                   extractionData={knowledgeGraph.extraction_data}
+                  loadExtractionData={knowledgeGraph.loadExtractionData}
                   articleTitle={article.title}
                 />
               ) : (
@@ -1,5 +1,5 @@
 import { useEffect, useState, useRef } from "react";
-import { fetchNews } from "../api";
+import { streamNews } from "../api";
 import NewsCard from "../components/NewsCard";
 import Spinner from "../components/Spinner";
 
@@ -14,7 +14,22 @@ export default function Home() {
     if (hasFetched.current) return;
     hasFetched.current = true;
     
-    fetchNews({ page: 1, query: "" })
+    streamNews({
+      page: 1,
+      query: "",
+      // Show cleaned articles as soon as NewsAPI responds (pending ones marked),
+      // then patch in verdicts and drop anything that comes back FAKE
+      onArticles: (items) => {
+        setArticles(items);
+        setLoading(false);
+      },
+      onVerification: (updates) => {
+        const byId = Object.fromEntries(updates.map(u => [u.id, u.verification]));
+        setArticles(prev => prev
+          .filter(a => byId[a.id]?.conclusion !== "FAKE")
+          .map(a => byId[a.id] ? { ...a, verification: byId[a.id], pending: false } : a));
+      }
+    })
       .then(data => {
         setArticles(data.articles || []);
         setFakeArticles(data.fake_news_detected || []);